@@ -0,0 +1,107 @@
+"""Compares the NumPy cohort classifier with the per-file batch path on the same synthetic CNVs.
+
+Run from the repository root (requires numpy):
+    python benchmarks/cohort.py --cnvs 500 --scale small
+
+Reported per path: wall time and CNVs per second of
+- per-file: runner.classify_many with one worker, loading and classifying every annotation file,
+- per-cnv: MarCNVClassifier.classify on the loaded annotations,
+- cohort: cohort.classify_cohort on the loaded annotations (options, scores and severities),
+- cohort+render: the same and CohortResult.predictions, rendering every reason.
+The loaded paths are given the annotations already in memory, the time of loading them is reported as load.
+The predictions of all paths are checked against the per-file ones.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import tempfile
+import time
+from typing import Any, Callable
+
+import numpy  # noqa: F401 imported before the measurements, cohort imports it on first use
+import synthetic
+
+from marcnv.src.acmg import cohort
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.batch import cache, runner
+from marcnv.src.io import loader
+
+
+def write_inputs(directory: str, count: int, scale: str, seed: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        # every third CNV contains established dosage sensitive genes and regions, so section 2 stops at 2A
+        document = synthetic.generate(
+            synthetic.SCALES[scale], duplication=i % 2 == 0, seed=seed + i, established_inside=i % 3 == 0
+        )
+        path = os.path.join(directory, f"cnv{i:05d}.json.gz")
+        with gzip.open(path, "wt") as f:
+            json.dump(document, f)
+        paths.append(path)
+    return paths
+
+
+def timed(run: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def run(count: int, scale: str, seed: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_inputs(tmp, count, scale, seed)
+        per_file, results = timed(lambda: list(runner.classify_many(paths, workers=1)))
+        expected = [result.prediction for result in results]
+        load, annots = timed(lambda: [loader.load(path) for path in paths])
+
+    per_cnv, per_cnv_predictions = timed(lambda: [MarCNVClassifier(annot).classify() for annot in annots])
+    columnar, cohort_result = timed(lambda: cohort.classify_cohort(annots))
+    render, cohort_predictions = timed(cohort_result.predictions)
+    if per_cnv_predictions != expected or cohort_predictions != expected:
+        raise RuntimeError("The paths gave other predictions.")
+    if cohort_result.scores.tolist() != [prediction.score for prediction in expected]:
+        raise RuntimeError("The cohort scores differ from the per-file ones.")
+
+    seconds = {
+        "load": load,
+        "per-file": per_file,
+        "per-cnv": per_cnv,
+        "cohort": columnar,
+        "cohort+render": columnar + render,
+    }
+    results_by_path = {}
+    for path, elapsed in seconds.items():
+        results_by_path[path] = {"seconds": round(elapsed, 3), "cnvs_per_second": round(count / elapsed, 1)}
+        print(f"{path:14} {elapsed:8.3f} s {count / elapsed:10.1f} CNVs/s")
+    print(f"section 2 decided on columns for {count - len(cohort_result.section2)}/{count} CNVs")
+    return {
+        "meta": {
+            "marcnv": cache.marcnv_version(),
+            "python": platform.python_version(),
+            "cnvs": count,
+            "scale": scale,
+            "section2_columnar": count - len(cohort_result.section2),
+        },
+        "results": results_by_path,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the cohort classifier with the per-file batch path.")
+    parser.add_argument("--cnvs", type=int, default=300, help="Number of synthetic CNVs")
+    parser.add_argument("--scale", choices=list(synthetic.SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic annotations")
+    parser.add_argument("--output", default=None, help="Store the results as JSON")
+    args = parser.parse_args()
+
+    current = run(args.cnvs, args.scale, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
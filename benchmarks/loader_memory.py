@@ -0,0 +1,43 @@
+"""Compares memory and time of the full annotation loader and the projection loader.
+
+Run from the repository root: python benchmarks/loader_memory.py [annotation.json.gz ...]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable
+
+import annotation
+
+from marcnv.src.io import loader
+
+
+def measure(load: Callable[[str], annotation.Annotation], path: str) -> tuple[float, int, int]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    annot = load(path)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del annot
+    return elapsed, retained, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory benchmark of annotation loaders.")
+    parser.add_argument("inputs", nargs="*", default=["tests/annotation_test.json.gz"], help="Annotation JSON files")
+    args = parser.parse_args()
+
+    loaders = {"full": annotation.Annotation.load_from_json, "projected": loader.load_projected}
+    print(f"{'input':40} {'loader':10} {'time [ms]':>10} {'retained [MiB]':>15} {'peak [MiB]':>11}")
+    for path in args.inputs:
+        for name, load in loaders.items():
+            elapsed, retained, peak = measure(load, path)
+            print(f"{path[-40:]:40} {name:10} {elapsed * 1000:10.1f} {retained / 2**20:15.2f} {peak / 2**20:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmarks classification of synthetic CNVs of increasing complexity and compares them with a baseline.
+
+Run from the repository root:
+    python benchmarks/suite.py --output results.json                 # measure
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json   # exits with 1 on regressions
+
+Measured per scale and CNV type:
+- classify_ms: median time of MarCNVClassifier.classify on a loaded annotation,
+- peak_mib: peak Python memory of loading the annotation file and classifying it,
+- cli_ms and cli_maxrss_mib: median wall time and maximal RSS of `marcnv-classify` in a fresh process.
+"""
+
+import argparse
+import gc
+import gzip
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import synthetic
+
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.batch import cache
+from marcnv.src.io import loader
+
+# metrics compared with the baseline, all of them lower is better
+METRICS = ("classify_ms", "peak_mib", "cli_ms", "cli_maxrss_mib")
+
+
+def measure_classify(document: dict[str, Any], repeat: int) -> float:
+    annot = loader.annotation_from_dict(json.loads(json.dumps(document)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        MarCNVClassifier(annot).classify()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def measure_peak_memory(path: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    MarCNVClassifier(loader.load(path)).classify()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def measure_cli(path: str, output: str, repeat: int) -> tuple[float, float]:
+    times, rss = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-m", "marcnv.main", path, "--output", output])
+        _, status, usage = os.wait4(process.pid, 0)
+        times.append(time.perf_counter() - start)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            raise RuntimeError(f"marcnv-classify failed on {path} with exit code {process.returncode}")
+        rss.append(usage.ru_maxrss / 2**10)  # KiB on Linux
+    return statistics.median(times) * 1e3, max(rss)
+
+
+def run(scales: list[str], repeat: int, cli_repeat: int, seed: int) -> dict[str, Any]:
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale_name in scales:
+            for duplication in (True, False):
+                case = f"{scale_name}-{'gain' if duplication else 'loss'}"
+                document = synthetic.generate(synthetic.SCALES[scale_name], duplication, seed)
+                path = os.path.join(tmp, f"{case}.json.gz")
+                with gzip.open(path, "wt") as f:
+                    json.dump(document, f)
+
+                metrics = {"classify_ms": measure_classify(document, repeat), "peak_mib": measure_peak_memory(path)}
+                if cli_repeat > 0:
+                    cli_ms, cli_maxrss_mib = measure_cli(path, os.path.join(tmp, f"{case}.out.json"), cli_repeat)
+                    metrics.update(cli_ms=cli_ms, cli_maxrss_mib=cli_maxrss_mib)
+                results[case] = {name: round(value, 3) for name, value in metrics.items()}
+                print(f"{case:15} " + " ".join(f"{name} {value:10.2f}" for name, value in results[case].items()))
+    return {
+        "meta": {
+            "marcnv": cache.marcnv_version(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Returns descriptions of metrics worse than the baseline by more than `threshold` (relative)."""
+    regressions = []
+    for case, metrics in current["results"].items():
+        for name in METRICS:
+            reference = baseline["results"].get(case, {}).get(name)
+            if reference is None or name not in metrics or reference <= 0:
+                continue
+            change = metrics[name] / reference - 1
+            if change > threshold:
+                regressions.append(f"{case} {name}: {reference:.2f} -> {metrics[name]:.2f} (+{change:.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark classification of synthetic CNVs.")
+    parser.add_argument("--scales", nargs="+", choices=list(synthetic.SCALES), default=["small", "medium", "large"])
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of in-process classification")
+    parser.add_argument("--cli-repeat", type=int, default=3, help="Repetitions of the CLI run, 0 to skip it")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic annotations")
+    parser.add_argument("--output", default=None, help="Store the results as JSON")
+    parser.add_argument("--save-baseline", default=None, help="Store the results as the new baseline")
+    parser.add_argument("--baseline", default=None, help="Compare the results with this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown reported as regression")
+    args = parser.parse_args()
+
+    current = run(args.scales, args.repeat, args.cli_repeat, args.seed)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
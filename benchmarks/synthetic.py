@@ -0,0 +1,275 @@
+"""Synthetic annotation documents (the JSON stored by the annotation package) of controllable complexity."""
+
+import random
+from dataclasses import dataclass
+from typing import Any
+
+POPULATIONS = ("afr", "amr", "eas", "fin", "nfe", "sas")
+CONSERVANCY_PREDICTORS = ("Huang", "HIPred", "GHIS", "gnomeAD", "ExAC")
+ESTABLISHED_SCORES = ("3", "30")
+OTHER_SCORES = ("0", "1", "2", "40")
+
+
+@dataclass(frozen=True)
+class Scale:
+    cnv_length: int
+    genes: int
+    hi_genes: int
+    transcripts_per_hi_gene: int
+    hi_regions: int
+    benign_cnvs: int
+    enhancers: int
+    gnomad: int
+    exons_per_transcript: int = 8
+
+
+SCALES = {
+    "small": Scale(cnv_length=200_000, genes=10, hi_genes=2, transcripts_per_hi_gene=2, hi_regions=1, benign_cnvs=20,
+                   enhancers=10, gnomad=100),
+    "medium": Scale(cnv_length=2_000_000, genes=100, hi_genes=10, transcripts_per_hi_gene=5, hi_regions=5,
+                    benign_cnvs=200, enhancers=100, gnomad=1_000),
+    "large": Scale(cnv_length=10_000_000, genes=500, hi_genes=50, transcripts_per_hi_gene=10, hi_regions=20,
+                   benign_cnvs=1_000, enhancers=1_000, gnomad=5_000),
+    "xlarge": Scale(cnv_length=40_000_000, genes=2_000, hi_genes=200, transcripts_per_hi_gene=20, hi_regions=50,
+                    benign_cnvs=5_000, enhancers=5_000, gnomad=20_000),
+}  # fmt: skip
+
+
+class _Generator:
+    def __init__(self, scale: Scale, duplication: bool, seed: int, established_inside: bool) -> None:
+        self.scale = scale
+        self.duplication = duplication
+        self.established_inside = established_inside
+        self.random = random.Random(seed)
+        self.chromosome = "chr1"
+        self.start = 10_000_000
+        self.end = self.start + scale.cnv_length
+        # features are placed up to 10% of the CNV length around it, so some of them lie on the breakpoints
+        self.margin = scale.cnv_length // 10
+
+    def interval(self, max_length: int) -> tuple[int, int]:
+        start = self.random.randint(self.start - self.margin, self.end + self.margin)
+        return start, start + self.random.randint(1, max(1, max_length))
+
+    def dosage_score(self, start: int, end: int) -> str:
+        if self.start <= start and end <= self.end and not self.established_inside:
+            return self.random.choice(OTHER_SCORES)
+        return self.random.choice(ESTABLISHED_SCORES + OTHER_SCORES)
+
+    def feature(self, kind: str, transcript_id: str, start: int, end: int, strand: str, number: int) -> dict[str, Any]:
+        return {
+            "start": start,
+            "end": end,
+            "strand": strand,
+            "phase": "0" if kind == "CDS" else "",
+            "ID": f"{kind}:{transcript_id}:{number}",
+            "Parent": transcript_id,
+            "exon_number": str(number),
+        }
+
+    def transcript(self, gene: dict[str, Any], index: int) -> dict[str, Any]:
+        gene_start, gene_end = gene["start"], gene["end"]
+        start = self.random.randint(gene_start, gene_start + (gene_end - gene_start) // 4)
+        end = self.random.randint(gene_end - (gene_end - gene_start) // 4, gene_end)
+        transcript_id = f"ENST{gene['gene_id'][4:-2]}{index:02d}.1"
+        strand = gene["strand"]
+        exons = self.scale.exons_per_transcript
+        step = max(2, (end - start) // exons)
+        exon_bounds = [(start + i * step, start + i * step + step // 2) for i in range(exons)]
+
+        features: dict[str, list[dict[str, Any]]] = {
+            key: [] for key in ("exon", "CDS", "five_prime_UTR", "three_prime_UTR")
+        }
+        for number, (exon_start, exon_end) in enumerate(exon_bounds, start=1):
+            features["exon"].append(self.feature("exon", transcript_id, exon_start, exon_end, strand, number))
+            if number == 1:
+                utr = "five_prime_UTR" if strand == "+" else "three_prime_UTR"
+                features[utr].append(self.feature(utr, transcript_id, exon_start, exon_end, strand, number))
+            elif number == exons:
+                utr = "three_prime_UTR" if strand == "+" else "five_prime_UTR"
+                features[utr].append(self.feature(utr, transcript_id, exon_start, exon_end, strand, number))
+            else:
+                features["CDS"].append(self.feature("CDS", transcript_id, exon_start, exon_end, strand, number))
+
+        return {
+            "start": start,
+            "end": end,
+            "strand": strand,
+            "phase": "",
+            "ID": transcript_id,
+            "Parent": gene["gene_id"],
+            "gene_id": gene["gene_id"],
+            "transcript_id": transcript_id,
+            "gene_type": gene["gene_type"],
+            "gene_name": gene["gene_name"],
+            "transcript_type": gene["gene_type"],
+            "transcript_name": f"{gene['gene_name']}-{index:03d}",
+            "level": "2",
+            **features,
+        }
+
+    def conservancy(self) -> dict[str, Any]:
+        return {
+            predictor: {"score": {"loss": self.random.random()}, "risk": {"loss": self.random.choice(["high", "low"])}}
+            for predictor in CONSERVANCY_PREDICTORS
+        }
+
+    def genes(self) -> list[dict[str, Any]]:
+        genes = []
+        for i in range(self.scale.genes):
+            start, end = self.interval(max_length=200_000)
+            protein_coding = i < self.scale.hi_genes or self.random.random() < 0.6
+            gene_id = f"ENSG{i:09d}.1"
+            gene = {
+                "chromosome": self.chromosome,
+                "source": "HAVANA",
+                "start": start,
+                "end": end,
+                "strand": self.random.choice("+-"),
+                "phase": "",
+                "ID": gene_id,
+                "gene_id": gene_id,
+                "gene_type": "protein_coding" if protein_coding else "lncRNA",
+                "gene_name": f"GENE{i}",
+                "level": "2",
+                "name": f"GENE{i}",
+                "full_name": f"synthetic gene {i}",
+                "alternative_names": [],
+                "conservancy": self.conservancy(),
+            }
+            transcripts = self.scale.transcripts_per_hi_gene if i < self.scale.hi_genes else self.random.randint(1, 2)
+            gene["transcript"] = [self.transcript(gene, index) for index in range(transcripts)]
+            genes.append(gene)
+        return genes
+
+    def dosage_genes(self, genes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
+            {
+                "Gene Symbol": gene["gene_name"],
+                "chromosome": self.chromosome,
+                "start": gene["start"],
+                "end": gene["end"],
+                "Haploinsufficiency Score": self.dosage_score(gene["start"], gene["end"]),
+                "Triplosensitivity Score": self.dosage_score(gene["start"], gene["end"]),
+            }
+            for gene in genes[: self.scale.hi_genes]
+        ]
+
+    def dosage_regions(self) -> list[dict[str, Any]]:
+        regions = []
+        for i in range(self.scale.hi_regions):
+            start, end = self.interval(max_length=self.scale.cnv_length // 2)
+            regions.append(
+                {
+                    "ISCA ID": f"ISCA-{i:05d}",
+                    "ISCA Region Name": f"synthetic region {i}",
+                    "chromosome": self.chromosome,
+                    "start": start,
+                    "end": end,
+                    "Haploinsufficiency Score": self.dosage_score(start, end),
+                    "Triplosensitivity Score": self.dosage_score(start, end),
+                }
+            )
+        return regions
+
+    def benign_cnvs(self, genes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        cnvs = []
+        for i in range(self.scale.benign_cnvs):
+            shape = self.random.random()
+            if shape < 0.1:  # spans the whole CNV
+                start, end = self.start - self.random.randint(1, 10_000), self.end + self.random.randint(1, 10_000)
+            elif shape < 0.2:  # inside the CNV
+                start = self.random.randint(self.start, self.end - 2)
+                end = self.random.randint(start + 1, self.end)
+            else:
+                start, end = self.interval(max_length=self.scale.cnv_length // 4)
+            cnv_type = self.random.choice(["gain", "loss"])
+            cnvs.append(
+                {
+                    "chromosome": self.chromosome,
+                    "start": start,
+                    "end": end,
+                    "cnv_type": cnv_type,
+                    "length": end - start,
+                    "variantaccession": f"gssv{'G' if cnv_type == 'gain' else 'L'}{i}",
+                    "reference": "synthetic",
+                    "frequency": self.random.choice([0.001, 0.005, 0.01, 0.02, 0.1]),
+                    "number_of_unique_samples_tested": 1000,
+                    "genes": [
+                        {"gene_name": gene["gene_name"], "start": gene["start"], "end": gene["end"]}
+                        for gene in genes
+                        if gene["start"] <= end and gene["end"] >= start
+                    ],
+                }
+            )
+        return cnvs
+
+    def regulatory(self) -> list[dict[str, Any]]:
+        elements = []
+        for i in range(self.scale.enhancers * 2):
+            start, end = self.interval(max_length=2_000)
+            if i < self.scale.enhancers:
+                element_type = "enhancer"
+            else:
+                element_type = self.random.choice(["promoter", "CTCF_binding_site"])
+            elements.append(
+                {"id": f"ENSR{i:011d}", "type": element_type, "chromosome": self.chromosome, "start": start, "end": end}
+            )
+        return elements
+
+    def gnomad(self) -> list[dict[str, Any]]:
+        records = []
+        for _ in range(self.scale.gnomad):
+            start, end = self.interval(max_length=self.scale.cnv_length)
+            frequency = self.random.choice([0.0, 0.001, 0.02, 0.5])
+            records.append(
+                {
+                    "chromosome": self.chromosome,
+                    "start": start,
+                    "end": end,
+                    "svtype": self.random.choice(["duplication", "deletion"]),
+                    "population": self.random.choice(POPULATIONS),
+                    "count": 10_000,
+                    "frequencies": {
+                        "all": {
+                            "HET": {"count": int(frequency * 10_000), "freq": frequency},
+                            "HOMALT": {"count": 0, "freq": 0.0},
+                            "HOMREF": {"count": 10_000 - int(frequency * 10_000), "freq": 1.0 - frequency},
+                        }
+                    },
+                }
+            )
+        return records
+
+    def document(self) -> dict[str, Any]:
+        cnv_type = "gain" if self.duplication else "loss"
+        genes = self.genes()
+        outer = self.benign_cnvs(genes)
+        return {
+            "cnv": {
+                "chr": self.chromosome,
+                "start": self.start,
+                "end": self.end,
+                "cnv_type": cnv_type,
+                "length": self.end - self.start,
+                "name": f"{self.chromosome}_{self.start}_{self.end}_{cnv_type}",
+                "cytogenetic_position": "p36.11",
+            },
+            "_benign_cnv": [],
+            "_benign_cnv_gs_inner": [cnv for cnv in outer if self.start <= cnv["start"] and cnv["end"] <= self.end],
+            "_benign_cnv_gs_outer": outer,
+            "_regulatory": self.regulatory(),
+            "_gnomad": self.gnomad(),
+            "_hi_gene": self.dosage_genes(genes),
+            "_hi_region": self.dosage_regions(),
+            "_genes": genes,
+        }
+
+
+def generate(scale: Scale, duplication: bool, seed: int = 0, established_inside: bool = False) -> dict[str, Any]:
+    """Returns an annotation document of the given scale, deterministic for the seed.
+
+    Unless `established_inside`, genes and regions inside the CNV get no established dosage sensitivity, so the
+    classifier does not stop at rule 2A and evaluates breakpoints, transcripts and benign CNVs.
+    """
+    return _Generator(scale, duplication, seed, established_inside).document()
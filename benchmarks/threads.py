@@ -0,0 +1,91 @@
+"""Compares the scaling of batch classification in a thread pool and in a process pool.
+
+Run from the repository root, preferably with a free-threaded build (e.g. python3.13t), where the threads run the
+classifications in parallel; with the GIL, the thread pool does not scale beyond one worker:
+    python benchmarks/threads.py --workers 1 2 4 8 --cnvs 200
+
+Reported per pool and number of workers: wall time of the batch, CNVs per second and the speedup over one worker of
+the same pool. The predictions of both pools are checked against the serial ones.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any
+
+import synthetic
+
+from marcnv.src.batch import cache, runner
+
+
+def write_inputs(directory: str, count: int, scale: str, seed: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        document = synthetic.generate(synthetic.SCALES[scale], duplication=i % 2 == 0, seed=seed + i)
+        path = os.path.join(directory, f"cnv{i:05d}.json.gz")
+        with gzip.open(path, "wt") as f:
+            json.dump(document, f)
+        paths.append(path)
+    return paths
+
+
+def measure(paths: list[str], workers: int, threads: bool, options: runner.ClassifyOptions) -> tuple[float, list[Any]]:
+    start = time.perf_counter()
+    results = list(runner.classify_many(paths, workers=workers, options=options, threads=threads))
+    return time.perf_counter() - start, [result.prediction for result in results]
+
+
+def run(workers: list[int], count: int, scale: str, projected: bool, seed: int) -> dict[str, Any]:
+    options = runner.ClassifyOptions(projected=projected)
+    results: dict[str, dict[str, dict[str, float]]] = {"thread": {}, "process": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_inputs(tmp, count, scale, seed)
+        _, expected = measure(paths, 1, False, options)
+        for pool in ("thread", "process"):
+            for worker_count in workers:
+                seconds, predictions = measure(paths, worker_count, pool == "thread", options)
+                if predictions != expected:
+                    raise RuntimeError(f"The {pool} pool of {worker_count} workers gave other predictions.")
+                single = results[pool].get("1", {}).get("seconds", seconds)
+                metrics = {"seconds": seconds, "cnvs_per_second": count / seconds, "speedup": single / seconds}
+                results[pool][str(worker_count)] = {name: round(value, 3) for name, value in metrics.items()}
+                print(f"{pool:8} {worker_count:3d} workers " + " ".join(f"{k} {v:8.2f}" for k, v in metrics.items()))
+    return {
+        "meta": {
+            "marcnv": cache.marcnv_version(),
+            "python": platform.python_version(),
+            # sys._is_gil_enabled exists since Python 3.13
+            "gil": getattr(sys, "_is_gil_enabled", lambda: True)(),
+            "cpus": os.cpu_count(),
+            "cnvs": count,
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare thread and process pools of batch classification.")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4], help="Numbers of workers, always with 1")
+    parser.add_argument("--cnvs", type=int, default=100, help="Number of synthetic CNVs")
+    parser.add_argument("--scale", choices=list(synthetic.SCALES), default="small")
+    parser.add_argument("--projected", action="store_true", help="Load the annotations projected")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic annotations")
+    parser.add_argument("--output", default=None, help="Store the results as JSON")
+    args = parser.parse_args()
+
+    current = run(sorted(set(args.workers) | {1}), args.cnvs, args.scale, args.projected, args.seed)
+    if not current["meta"]["gil"]:
+        print("Free-threaded build: the thread pool runs in parallel.")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,689 @@
 import argparse
+import contextlib
 import json
 import os
 import sys
-from dataclasses import asdict
+from typing import Any, Iterable, Iterator
 
-import annotation
+from marcnv.src.acmg import classification, profiling, trace
+from marcnv.src.batch import cache, runner
+from marcnv.src.io import reference, writers
 
-from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+# The other modules are imported by the entry points using them, so that one-off runs of marcnv-classify do not pay
+# for importing the batch, sweep and service machinery (e.g. asyncio, concurrent.futures); see tests/test_startup.py.
+
+
+def _write_prediction(
+    prediction: classification.Prediction,
+    output: str,
+    timings: profiling.Timings | None = None,
+    compact: bool = False,
+    dependencies: dict[str, list[str]] | None = None,
+) -> None:
+    path = os.path.abspath(output)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(writers.dumps(prediction, timings, compact=compact, dependencies=dependencies))
+
+
+def _add_format_argument(parser: argparse.ArgumentParser, help: str) -> None:
+    parser.add_argument("--format", help=help, choices=writers.FORMATS, default="json")
+
+
+def _add_trace_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--trace",
+        help="Level of the evaluation trace printed to stderr. Default: warning.",
+        choices=list(trace.LEVELS),
+        default="warning",
+    )
+    parser.add_argument(
+        "--trace-sections",
+        help="Trace only these sections (e.g. 2 3). Default: all sections.",
+        nargs="+",
+        choices=["1", "2", "3", "4", "5"],
+        default=None,
+    )
+
+
+def _add_classify_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        help="Add timings of sections and section 2 rules and the number of annotation queries to the output.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--projected",
+        help="Load only the annotation fields used by the classifier, which needs much less memory.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--cache",
+        help="Path of a prediction cache (SQLite). Already classified annotations are read from it.",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        help=f"Maximal number of predictions kept in the cache. Default: {cache.DEFAULT_MAX_ENTRIES}.",
+        type=int,
+        default=cache.DEFAULT_MAX_ENTRIES,
+    )
+    parser.add_argument(
+        "--reference",
+        help="Directory of a reference store (marcnv-build-reference), to classify CNVs given as "
+        "chr:start-end:gain|loss.",
+        default=None,
+    )
+    parser.add_argument(
+        "--dependencies",
+        help="Add the knowledge sources and criteria rows each section depends on to the output, for "
+        "marcnv-reclassify. Cannot be used with --cache.",
+        action="store_true",
+    )
+
+
+def _classify_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> runner.ClassifyOptions:
+    if args.dependencies and args.cache:
+        parser.error("--dependencies cannot be used with --cache")
+    return runner.ClassifyOptions(
+        profile=args.profile,
+        projected=args.projected,
+        cache_path=args.cache,
+        cache_max_entries=args.cache_max_entries,
+        dependencies=args.dependencies,
+        reference=args.reference,
+    )
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Classify annotated CNV.")
-    parser.add_argument("input", help="Annotated CNV stored as json")
+    parser.add_argument(
+        "input",
+        help="Annotated CNV stored as json, or CNV coordinates chr:start-end:gain|loss with --reference; "
+        "with --stream, a file or pipe of annotations, - for stdin",
+    )
     parser.add_argument("--output", help="Path to store the prediction JSON. Else prints to stdout.", default=None)
+    parser.add_argument(
+        "--stream",
+        help="Classify annotation documents, one per line or concatenated and optionally gzipped, as they are read "
+        "from the input; the predictions are written as JSON lines in the input order. Implied by the input -.",
+        action="store_true",
+    )
+    _add_format_argument(
+        parser, "Output format: indented JSON (default), compact JSON, JSON line or columnar (requires --output)."
+    )
+    _add_trace_arguments(parser)
+    _add_classify_arguments(parser)
     args = parser.parse_args()
+    if args.format == "columnar" and not args.output:
+        parser.error("--format columnar requires --output")
+    if args.stream or args.input == "-":
+        _main_stream(parser, args)
+        return
+    if reference.is_region(args.input) and not args.reference and not os.path.exists(args.input):
+        parser.error("CNV coordinates require --reference")
+    options = _classify_options(parser, args)
+    trace.configure(args.trace, args.trace_sections)
 
-    whole_cnv_annotation = annotation.Annotation.load_from_json(args.input)
-    classifier = MarCNVClassifier(whole_cnv_annotation)
-    prediction = classifier.classify()
+    result = runner.classify_file(args.input, options)
+    if result.prediction is None:
+        print(f"FAILED {result.input}: {result.error}", file=sys.stderr)
+        sys.exit(1)
 
-    if args.output:
-        path = os.path.abspath(args.output)
-        if not os.path.exists(os.path.dirname(path)):
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(asdict(prediction), f, indent=2)
+    if args.format in ("jsonl", "columnar"):
+        with _open_writer(args.format, args.output) as writer:
+            writer.write(result.input, result.prediction, result.timings, result.dependencies)
+    elif args.output:
+        _write_prediction(result.prediction, args.output, result.timings, args.format == "compact", result.dependencies)
     else:
-        print(json.dumps(asdict(prediction), indent=2), file=sys.stdout)
+        output = writers.dumps(result.prediction, result.timings, args.format == "compact", result.dependencies)
+        print(output, file=sys.stdout)
+
+
+def _main_stream(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    from marcnv.src.io import stream
+
+    if args.format not in ("json", "jsonl"):
+        parser.error("--stream writes JSON lines, --format cannot be changed")
+    if args.profile or args.cache or args.dependencies or args.reference:
+        parser.error("--stream cannot be used with --profile, --cache, --dependencies or --reference")
+    trace.configure(args.trace, args.trace_sections)
+
+    failed = 0
+
+    def report(result: stream.StreamResult) -> None:
+        nonlocal failed
+        if result.prediction is None:
+            failed += 1
+            print(f"FAILED {result.input}: {result.error}", file=sys.stderr)
+
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin.buffer if args.input == "-" else stack.enter_context(open(args.input, "rb"))
+        writer = stack.enter_context(writers.JSONLinesWriter(args.output))
+        try:
+            count = stream.classify_stream(source, writer, projected=args.projected, on_result=report)
+        except stream.StreamError as e:
+            print(f"FAILED {args.input}: {e}", file=sys.stderr)
+            sys.exit(1)
+    print(f"Classified {count - failed}/{count} CNVs.", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+def _open_writer(format: str, output: str | None) -> writers.JSONLinesWriter | writers.ColumnarWriter:
+    if format == "columnar":
+        assert output is not None
+        return writers.ColumnarWriter(output)
+    return writers.JSONLinesWriter(output)
+
+
+# seconds between the rewrites of the metrics file of a batch run
+METRICS_INTERVAL = 15.0
+
+
+def main_batch() -> None:
+    import dataclasses
+    import time
+
+    from marcnv.src.acmg import metrics
+    from marcnv.src.batch import dedup, shards, store
+
+    parser = argparse.ArgumentParser(description="Classify many annotated CNVs.")
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Annotated CNVs stored as json: files, directories, glob patterns or manifests with one path per line; "
+        "or CNV coordinates chr:start-end:gain|loss with --reference",
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Directory to store one prediction JSON per input, or predictions.jsonl or predictions.columnar.",
+        required=True,
+    )
+    _add_format_argument(
+        parser,
+        "Output format: one indented (default) or compact JSON per input, all predictions as JSON lines written as "
+        "they are classified, or in one columnar file.",
+    )
+    parser.add_argument(
+        "--workers", help="Number of worker processes. Default: number of CPUs.", type=int, default=None
+    )
+    parser.add_argument(
+        "--threads",
+        help="Classify in --workers threads of one process instead of worker processes (for free-threaded Python).",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--dedup",
+        help="Classify CNVs of identical coordinates and type once and reuse the prediction for the others.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--shard",
+        help="Classify only the INDEX-th (from 0) of COUNT contiguous parts of the inputs, e.g. 0/4; the JSON lines or "
+        "columnar output is named predictions.shard-INDEX-of-COUNT.",
+        metavar="INDEX/COUNT",
+        default=None,
+    )
+    parser.add_argument(
+        "--journal",
+        help="With --format jsonl, journal the completed inputs next to the output and, when the journal exists, "
+        "resume the interrupted run.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--max-worker-memory",
+        help="Replace the worker processes once one of them exceeds this peak memory, in MiB.",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Path of a file to keep the metrics of the run in, in the Prometheus text format (e.g. for a textfile "
+        "collector), rewritten during the run and at its end.",
+        default=None,
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        help=f"Seconds between the rewrites of --metrics. Default: {METRICS_INTERVAL}.",
+        type=float,
+        default=METRICS_INTERVAL,
+    )
+    parser.add_argument("--metrics-summary", help="Path to store a JSON summary of the metrics of the run.")
+    parser.add_argument(
+        "--store",
+        help="Path of a cohort store (SQLite) to add the predictions to, queried by marcnv-query.",
+        default=None,
+    )
+    parser.add_argument(
+        "--sample",
+        help="Sample of the CNVs added to --store; CNVs of the same coordinates are stored per input. "
+        "Default: none (empty).",
+        default="",
+    )
+    _add_trace_arguments(parser)
+    _add_classify_arguments(parser)
+    args = parser.parse_args()
+    options = _classify_options(parser, args)
+    if args.journal and args.format != "jsonl":
+        parser.error("--journal requires --format jsonl")
+    if args.dedup and (args.journal or args.max_worker_memory is not None):
+        parser.error("--dedup cannot be used with --journal or --max-worker-memory")
+    if args.threads and args.max_worker_memory is not None:
+        parser.error("--max-worker-memory cannot be used with --threads")
+    try:
+        shard = shards.parse_shard(args.shard) if args.shard is not None else None
+    except ValueError as e:
+        parser.error(str(e))
+    registry = None
+    if args.metrics or args.metrics_summary:
+        registry = metrics.Registry()
+        options = dataclasses.replace(options, metrics=True)
+    trace.configure(args.trace, args.trace_sections)
+
+    inputs = [path for source in args.inputs for path in runner.collect_inputs(source)]
+    if shard is not None:
+        inputs = shards.shard(inputs, *shard)
+
+    if args.format in ("json", "compact") and (conflicts := runner.output_name_conflicts(inputs)):
+        name, paths = next(iter(conflicts.items()))
+        parser.error(
+            f"Different inputs share prediction file names, e.g. {name} of {', '.join(paths)}; "
+            "rename the inputs or use --format jsonl"
+        )
+
+    writer = journal = None
+    if args.format in ("jsonl", "columnar"):
+        os.makedirs(args.output_dir, exist_ok=True)
+        output = os.path.join(args.output_dir, f"predictions.{args.format}")
+        if shard is not None:
+            output = shards.shard_path(output, *shard)
+        if args.journal:
+            journal = shards.JournaledWriter(output, inputs)
+            if journal.completed:
+                print(f"Resuming after {journal.completed} journaled inputs.", file=sys.stderr)
+            inputs = inputs[journal.completed :]
+        else:
+            writer = _open_writer(args.format, output)
+
+    try:
+        cohort = store.CohortStore(args.store) if args.store else None
+    except ValueError as e:
+        parser.error(str(e))
+    stats = None
+    if args.dedup:
+        deduplicated, stats = dedup.classify_deduplicated(inputs, args.workers, options, threads=args.threads)
+        results: Iterable[runner.BatchResult] = deduplicated
+    else:
+        max_worker_memory = args.max_worker_memory * 2**20 if args.max_worker_memory is not None else None
+        results = runner.classify_many(
+            inputs, workers=args.workers, options=options, max_worker_memory=max_worker_memory, threads=args.threads
+        )
+
+    failed = cached = 0
+    metrics_written = time.monotonic()
+    for result in results:
+        cached += result.cached
+        if registry is not None:
+            registry.observe(result.prediction, result.observation, result.cached if args.cache else None)
+            if args.metrics and time.monotonic() - metrics_written >= args.metrics_interval:
+                registry.write_prometheus(args.metrics)
+                metrics_written = time.monotonic()
+        if journal is not None:
+            journal.write(result)
+        if result.prediction is None:
+            failed += 1
+            print(f"FAILED {result.input}: {result.error}", file=sys.stderr)
+            continue
+        if cohort is not None:
+            cohort.add(result.input, result.prediction, args.sample)
+        if writer is not None:
+            writer.write(result.input, result.prediction, result.timings, result.dependencies)
+        elif journal is None:
+            output = os.path.join(args.output_dir, runner.output_name(result.input))
+            _write_prediction(result.prediction, output, result.timings, args.format == "compact", result.dependencies)
+    if writer is not None:
+        writer.close()
+    if journal is not None:
+        journal.close()
+    if cohort is not None:
+        cohort.close()
+        if cohort.replaced:
+            print(
+                f"Replaced {cohort.replaced} stored predictions of the same sample, CNV and input in {args.store}.",
+                file=sys.stderr,
+            )
+    if args.metrics:
+        assert registry is not None
+        registry.write_prometheus(args.metrics)
+    if args.metrics_summary:
+        assert registry is not None
+        with open(args.metrics_summary, "w") as f:
+            json.dump(registry.summary(), f, indent=2)
+
+    print(f"Classified {len(inputs) - failed}/{len(inputs)} CNVs.", file=sys.stderr)
+    if args.cache:
+        print(f"Cache: {cached} hits, {len(inputs) - failed - cached} misses.", file=sys.stderr)
+    if stats is not None:
+        print(stats.summary(), file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+def main_merge_shards() -> None:
+    from marcnv.src.batch import shards
+
+    parser = argparse.ArgumentParser(description="Merge the JSON lines outputs of a sharded, journaled batch run.")
+    parser.add_argument("output_dir", help="Output directory of the shards (marcnv-classify-batch --output-dir).")
+    parser.add_argument("--shards", help="Number of shards of the run.", type=int, required=True)
+    parser.add_argument(
+        "--output", help="Path of the merged JSON lines. Default: predictions.jsonl in the output directory."
+    )
+    args = parser.parse_args()
+
+    output = os.path.join(args.output_dir, "predictions.jsonl")
+    paths = [shards.shard_path(output, index, args.shards) for index in range(args.shards)]
+    try:
+        predictions = shards.merge(paths, args.output or output)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    print(f"Merged {predictions} predictions of {args.shards} shards.", file=sys.stderr)
+
+
+def _read_json_lines(path: str) -> Iterator[dict[str, Any]]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main_reclassify() -> None:
+    from marcnv.src.acmg import annotation_view, criterion
+    from marcnv.src.batch import reclassify
+
+    parser = argparse.ArgumentParser(
+        description="Update stored predictions after a change of the knowledge sources or the ACMG criteria, "
+        "recomputing only the sections depending on the change."
+    )
+    parser.add_argument(
+        "predictions",
+        help="Predictions as JSON lines with their dependencies (marcnv-classify-batch --format jsonl --dependencies)",
+    )
+    parser.add_argument(
+        "--changed",
+        help=f"Changed knowledge sources ({', '.join(annotation_view.SOURCES)}), criteria files "
+        f"({', '.join(reclassify.CRITERIA_FILES)}) or criteria rows (e.g. {reclassify.CRITERIA_FILES[0]}:2A).",
+        nargs="+",
+        default=[],
+    )
+    parser.add_argument(
+        "--previous-criteria",
+        help="Previous versions of the ACMG criteria TSVs of gains and losses; their rows that differ from the "
+        "current ones are added to the changes.",
+        nargs=2,
+        metavar=("GAIN_TSV", "LOSS_TSV"),
+        default=None,
+    )
+    parser.add_argument("--output", help="Path to store the updated JSON lines. Else prints to stdout.", default=None)
+    parser.add_argument(
+        "--projected",
+        help="Load only the annotation fields used by the classifier, which needs much less memory.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--reference",
+        help="Directory of the reference store the predictions of CNVs given as chr:start-end:gain|loss were "
+        "classified with.",
+        default=None,
+    )
+    _add_trace_arguments(parser)
+    args = parser.parse_args()
+    trace.configure(args.trace, args.trace_sections)
+
+    changeset = set(args.changed)
+    if args.previous_criteria:
+        for previous, duplication in zip(args.previous_criteria, (True, False)):
+            changeset.update(criterion.changed_criteria(previous, duplication))
+    try:
+        reclassify.validate_changeset(changeset)
+    except ValueError as e:
+        parser.error(str(e))
+
+    total = failed = evaluated = rescored = 0
+    with writers.JSONLinesWriter(args.output) as writer:
+        records = _read_json_lines(args.predictions)
+        for result in reclassify.reclassify_many(records, changeset, args.projected, args.reference):
+            total += 1
+            if result.prediction is None:
+                failed += 1
+                print(f"FAILED {result.input}: {result.error}", file=sys.stderr)
+                continue
+            evaluated += len(result.evaluated)
+            rescored += len(result.rescored)
+            writer.write(result.input, result.prediction, dependencies=result.dependencies)
+
+    print(
+        f"Updated {total - failed}/{total} predictions: {evaluated} sections evaluated again, {rescored} rescored.",
+        file=sys.stderr,
+    )
+    if failed:
+        sys.exit(1)
+
+
+def _numbers(text: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(number) for number in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma separated integers, got {text!r}")
+
+
+def main_sweep() -> None:
+    from marcnv.src.acmg import core
+    from marcnv.src.batch import sweep
+
+    defaults = core.Parameters()
+    parser = argparse.ArgumentParser(
+        description="Classify annotated CNVs under every combination of the given values of the ACMG criteria "
+        "constants, into a table of options, scores and severities."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Annotated CNVs stored as json: files, directories, glob patterns or manifests with one path per line",
+    )
+    parser.add_argument("--output", help="Path to store the table (TSV). Else prints to stdout.", default=None)
+    parser.add_argument(
+        "--hi-ts-scores",
+        help=f"Sets of established HI/TS scores, e.g. 3 2,3. Default: {sweep.format_value(defaults.hi_ts_scores)}.",
+        type=_numbers,
+        nargs="+",
+        default=[defaults.hi_ts_scores],
+    )
+    parser.add_argument(
+        "--min-frequency-benign",
+        help=f"Minimal frequencies of benign CNVs. Default: {defaults.min_frequency_benign}.",
+        type=float,
+        nargs="+",
+        default=[defaults.min_frequency_benign],
+    )
+    for name in ("duplication_genes_thresholds", "deletion_genes_thresholds"):
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            help=f"Pairs of gene count thresholds of section 3, e.g. 25,35 30,40. "
+            f"Default: {sweep.format_value(getattr(defaults, name))}.",
+            type=_numbers,
+            nargs="+",
+            default=[getattr(defaults, name)],
+        )
+    parser.add_argument(
+        "--workers", help="Number of worker processes. Default: number of CPUs.", type=int, default=None
+    )
+    parser.add_argument(
+        "--projected",
+        help="Load only the annotation fields used by the classifier, which needs much less memory.",
+        action="store_true",
+    )
+    _add_trace_arguments(parser)
+    args = parser.parse_args()
+    trace.configure(args.trace, args.trace_sections)
+
+    try:
+        configurations = sweep.grid(**{name: getattr(args, name) for name in sweep.PARAMETERS})
+    except ValueError as e:
+        parser.error(str(e))
+    inputs = [path for source in args.inputs for path in runner.collect_inputs(source)]
+
+    failed = 0
+    with open(args.output, "w", newline="") if args.output else contextlib.nullcontext(sys.stdout) as table:
+        writer = sweep.TableWriter(table, configurations)
+        for result in sweep.sweep_many(inputs, configurations, workers=args.workers, projected=args.projected):
+            if result.results is None:
+                failed += 1
+                print(f"FAILED {result.input}: {result.error}", file=sys.stderr)
+                continue
+            writer.write(result)
+
+    print(
+        f"Swept {len(inputs) - failed}/{len(inputs)} CNVs over {len(configurations)} configurations.", file=sys.stderr
+    )
+    if failed:
+        sys.exit(1)
+
+
+def main_query() -> None:
+    from marcnv.src.batch import store
+
+    parser = argparse.ArgumentParser(
+        description="Query a cohort store (marcnv-classify-batch --store): export the matching predictions as JSON "
+        "lines, or count them."
+    )
+    parser.add_argument("store", help="Path of the cohort store")
+    parser.add_argument("--sample", help="Samples of the CNVs.", nargs="+", default=[])
+    parser.add_argument(
+        "--severity", help="Severities of the CNVs.", nargs="+", choices=list(classification.Severity), default=[]
+    )
+    parser.add_argument("--option", help="Options of the sections, e.g. 2A 3C.", nargs="+", default=[])
+    parser.add_argument(
+        "--reason",
+        help="Text the reason of a section contains (case-insensitive), e.g. --reason 2 'TS region'.",
+        nargs=2,
+        metavar=("SECTION", "TEXT"),
+        action="append",
+        default=[],
+    )
+    parser.add_argument("--region", help="Interval chr:start-end the CNVs overlap.", default=None)
+    parser.add_argument("--cnv-type", help="Type of the CNVs.", choices=["gain", "loss"], default=None)
+    parser.add_argument("--min-score", help="Minimal score of the CNVs.", type=float, default=None)
+    parser.add_argument("--max-score", help="Maximal score of the CNVs.", type=float, default=None)
+    parser.add_argument(
+        "--count",
+        help="Print the number of matching CNVs per severity, sample, chromosome, CNV type or option of a section "
+        "as JSON instead of the predictions.",
+        choices=store.COUNTED,
+        default=None,
+    )
+    parser.add_argument(
+        "--scores",
+        help="Print the count and the minimal, mean and maximal score of the matching CNVs per severity as JSON.",
+        action="store_true",
+    )
+    parser.add_argument("--output", help="Path to store the output. Else prints to stdout.", default=None)
+    args = parser.parse_args()
+    if not os.path.exists(args.store):
+        parser.error(f"Cohort store not found: {args.store}")
+    if args.count and args.scores:
+        parser.error("--count and --scores cannot be used together")
+    try:
+        query = store.Query(
+            samples=tuple(args.sample),
+            severities=tuple(args.severity),
+            options=tuple(args.option),
+            reasons=tuple((section, text) for section, text in args.reason),
+            region=store.parse_interval(args.region) if args.region else None,
+            cnv_type=args.cnv_type,
+            min_score=args.min_score,
+            max_score=args.max_score,
+        )
+        cohort = store.CohortStore(args.store)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with cohort:
+        if args.count or args.scores:
+            summary = cohort.count(args.count, query) if args.count else cohort.score_distribution(query)
+            with open(args.output, "w") if args.output else contextlib.nullcontext(sys.stdout) as output:
+                print(json.dumps(summary, indent=2), file=output)
+            return
+        with writers.JSONLinesWriter(args.output) as writer:
+            count = cohort.export(writer, query)
+    print(f"Exported {count} predictions.", file=sys.stderr)
+
+
+def main_build_reference() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the reference store annotating CNVs given by their coordinates, from JSON lines tables "
+        "(optionally gzipped) with the records of the annotation JSON. Missing tables are stored empty."
+    )
+    parser.add_argument("output_dir", help="Directory of the store")
+    for source, key in reference.SOURCE_KEYS.items():
+        parser.add_argument(
+            f"--{source.replace('_', '-')}", help=f"Table of the {key} records of the annotation JSON", default=None
+        )
+    args = parser.parse_args()
+
+    reference.build(args.output_dir, {source: getattr(args, source) for source in reference.SOURCE_KEYS})
+
+
+def main_serve() -> None:
+    import asyncio
+
+    from marcnv.src.service import server
+
+    defaults = server.ServerConfig()
+    parser = argparse.ArgumentParser(description="Serve CNV classification over HTTP.")
+    parser.add_argument("--host", help="Host to listen on. Default: 127.0.0.1.", default="127.0.0.1")
+    parser.add_argument("--port", help="Port to listen on. Default: 8000.", type=int, default=8000)
+    parser.add_argument("--socket", help="Listen on this unix socket instead of host and port.", default=None)
+    parser.add_argument(
+        "--workers", help="Number of worker processes. Default: number of CPUs.", type=int, default=defaults.workers
+    )
+    parser.add_argument(
+        "--max-inflight",
+        help="Maximal number of classifications running at once. Default: twice the number of CPUs.",
+        type=int,
+        default=defaults.max_inflight,
+    )
+    parser.add_argument(
+        "--max-pending",
+        help=f"Maximal number of waiting classifications, then requests are rejected. Default: {defaults.max_pending}.",
+        type=int,
+        default=defaults.max_pending,
+    )
+    parser.add_argument(
+        "--max-request-bytes",
+        help=f"Maximal size of a request body. Default: {defaults.max_request_bytes}.",
+        type=int,
+        default=defaults.max_request_bytes,
+    )
+    parser.add_argument(
+        "--full-annotation",
+        help="Keep the full annotation in memory instead of only the fields used by the classifier.",
+        action="store_true",
+    )
+    _add_trace_arguments(parser)
+    args = parser.parse_args()
+    trace.configure(args.trace, args.trace_sections)
+
+    config = server.ServerConfig(
+        workers=args.workers,
+        max_inflight=args.max_inflight,
+        max_pending=args.max_pending,
+        max_request_bytes=args.max_request_bytes,
+        projected=not args.full_annotation,
+    )
+    asyncio.run(server.serve(config, host=args.host, port=args.port, unix_socket=args.socket))
 
 
 if __name__ == "__main__":
@@ -1,434 +1,847 @@
-import sys
+import functools
+import operator
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, Iterable
 
 import annotation
 
-from marcnv.src.acmg import classification, core, criterion
+from marcnv.src.acmg import annotation_view, classification, core, criterion, profiling, trace
 
+SECTIONS = ("1", "2", "3", "4", "5")
 
-def evaluate_transcript(transcript: annotation.TranscriptRegion) -> tuple[str | None, str | None]:
-    # If transcript's 5' is in CNV
+# transcript options from the most severe
+TRANSCRIPT_SEVERITY = ["2C-1", "2D-4", "2D-3", "2C-2", "2E", "2D-2", "2D-1", ""]
+TRANSCRIPT_RANK = {option: rank for rank, option in enumerate(TRANSCRIPT_SEVERITY)}
+
+
+@dataclass(frozen=True, slots=True)
+class Reason:
+    """Reason of an option kept as the data it is rendered from, rendered to text only by `str()`."""
+
+    render: Callable[..., str]
+    args: tuple[Any, ...] = ()
+
+    @classmethod
+    def of(cls, text: str) -> "Reason":
+        return cls(str, (text,))
+
+    def __str__(self) -> str:
+        return self.render(*self.args)
+
+
+def transcript_option(transcript: annotation.TranscriptRegion) -> str | None:
+    # If transcript's 5' is in CNV, count the number overlapping CDS
     if transcript["flag_five_inside"]:
+        return "2C-2" if len(transcript["cds_overlaps"]) == 0 else "2C-1"
+
+    # If transcript's 3' is in CNV, count the number overlapping CDS
+    if transcript["flag_three_inside"]:
+        if len(transcript["cds_overlaps"]) == 0:
+            return "2D-1"
+        return "2D-3" if len(transcript["cds_overlaps"]) == 1 else "2D-4"
+
+    # If CNV is in the gene (not very likely)
+    if transcript["flag_contained"]:
+        return "2E"
+
+    # TODO ?
+    # print(f'WARNING: transcript {transcript["ID"]} is not evaluated - it is wholly inside the CNV, although the gene is not.')
+    return None
+
+
+def render_transcript_reason(transcript: annotation.TranscriptRegion, option: str) -> str:
+    if option.startswith("2C"):
         if len(transcript["five_prime_utr_overlaps"]) > 0:
             text_5p = f'Overlaps {len(transcript["five_prime_utr_overlaps"])} start (5\') regions with a total length of {sum(transcript["five_prime_utr_overlaps"])}bp.'
         else:
             text_5p = "Overlaps no start (5') regions."
+        if option == "2C-2":
+            return f"{text_5p}\nOverlaps no CDS regions."
+        return f'{text_5p}\nOverlaps {len(transcript["cds_overlaps"])} CDS regions with a total length of {sum(transcript["cds_overlaps"])}bp.'
 
-        # Count the number overlapping CDS
-        if len(transcript["cds_overlaps"]) == 0:
-            return "2C-2", f"{text_5p}\nOverlaps no CDS regions."
-        else:
-            return (
-                "2C-1",
-                f'{text_5p}\nOverlaps {len(transcript["cds_overlaps"])} CDS regions with a total length of {sum(transcript["cds_overlaps"])}bp.',
-            )
-
-    # If transcript's 3' is in CNV
-    if transcript["flag_three_inside"]:
+    if option.startswith("2D"):
         if len(transcript["three_prime_utr_overlaps"]) > 0:
             text_3p = f'Overlaps {len(transcript["three_prime_utr_overlaps"])} end (3\') regions with total length of {sum(transcript["three_prime_utr_overlaps"])}bp.'
         else:
             text_3p = "Overlaps no end (3') regions."
+        if option == "2D-1":
+            return f"{text_3p}\nOverlaps no CDS regions."
+        if option == "2D-3":
+            return f'{text_3p}\nOnly last CDS is involved with overlap of {transcript["cds_overlaps"][0]}bp.'
+        return f'{text_3p}\nOverlaps {len(transcript["cds_overlaps"])} CDS regions with a total length of {sum(transcript["cds_overlaps"])}bp.'
+
+    return (
+        f'A transcript completely contains the target CNV.\n'
+        f'Overlaps {len(transcript["cds_overlaps"])} CDS regions with a total length of {sum(transcript["cds_overlaps"])}bp.'
+    )
 
-        # Count the number overlapping CDS
-        if len(transcript["cds_overlaps"]) == 0:
-            return "2D-1", f"{text_3p}\nOverlaps no CDS regions."
-        elif len(transcript["cds_overlaps"]) == 1:
-            return "2D-3", f'{text_3p}\nOnly last CDS is involved with overlap of {transcript["cds_overlaps"][0]}bp.'
-        else:
-            return (
-                "2D-4",
-                f'{text_3p}\nOverlaps {len(transcript["cds_overlaps"])} CDS regions with a total length of {sum(transcript["cds_overlaps"])}bp.',
-            )
-
-    # If CNV is in the gene (not very likely)
-    if transcript["flag_contained"]:
-        return (
-            "2E",
-            f'A transcript completely contains the target CNV.\n'
-            f'Overlaps {len(transcript["cds_overlaps"])} CDS regions with a total length of {sum(transcript["cds_overlaps"])}bp.',
-        )
 
-    # TODO ?
-    # print(f'WARNING: transcript {transcript["ID"]} is not evaluated - it is wholly inside the CNV, although the gene is not.')
-    return None, None
+def evaluate_transcript(transcript: annotation.TranscriptRegion) -> tuple[str | None, str | None]:
+    option = transcript_option(transcript)
+    if option is None:
+        return None, None
+    return option, render_transcript_reason(transcript, option)
+
+
+def most_severe_transcript(
+    transcript_regions: list[annotation.TranscriptRegion],
+) -> tuple[str, annotation.TranscriptRegion | None]:
+    # Evaluate all transcripts from the longest and keep the first most severe, only by their options.
+    # Nothing is more severe than the first option, so the scan stops at the first such transcript.
+    best_rank = TRANSCRIPT_RANK[""]
+    most_severe: annotation.TranscriptRegion | None = None
+    for transcript in sorted(transcript_regions, key=operator.itemgetter("length"), reverse=True):
+        option = transcript_option(transcript)
+        if option is not None and (rank := TRANSCRIPT_RANK[option]) < best_rank:
+            best_rank = rank
+            most_severe = transcript
+            if rank == 0:
+                break
+    return TRANSCRIPT_SEVERITY[best_rank], most_severe
 
 
 def evaluate_gene(transcript_regions: list[annotation.TranscriptRegion]) -> tuple[str, str, str]:
-    # Evaluate all transcripts and pick the most severe (evaluate from the longest)
-    most_severe_transcript_name = "UNKNOWN"
-    most_severe_transcript_reason = ""
-    most_severe_transcript_option = ""
-    severity_seq = ["2C-1", "2D-4", "2D-3", "2C-2", "2E", "2D-2", "2D-1", ""]
-    for transcript in sorted(transcript_regions, key=lambda x: x["length"], reverse=True):
-        option, reason = evaluate_transcript(transcript)
-        if option and reason:
-            rev_severity = severity_seq.index(option)
-            if rev_severity < severity_seq.index(most_severe_transcript_option):
-                most_severe_transcript_name = transcript["identifier"]
-                most_severe_transcript_reason = reason
-                most_severe_transcript_option = option
-
-    return most_severe_transcript_option, most_severe_transcript_reason, most_severe_transcript_name
+    option, transcript = most_severe_transcript(transcript_regions)
+    if transcript is None:
+        return "", "", "UNKNOWN"
+    return option, render_transcript_reason(transcript, option), transcript["identifier"]
 
 
 def get_reason_from_benigncnvs(cnv: annotation.CNVRegionAnnotation, benign_cnvs: list[Any]) -> str:
     reasons: list[str] = []
-    for benign_cnv in benign_cnvs:
+    # only the first 5 benign CNVs are displayed
+    for benign_cnv in benign_cnvs[:5]:
         overlap = cnv.get_overlap_with_region(benign_cnv["start"], benign_cnv["end"])
         reasons.append(
             f'Accession number: {benign_cnv["variantaccession"]}, pubmedid: {benign_cnv.get("pubmedid", "UNKNOWN")}. '
             f'Overlap: {overlap}bp ({overlap / float(cnv.length) * 100.0:.1f}%).'
         )
     reason = f"Overlaps {len(benign_cnvs)} established benign CNV, but contains additional protein coding genes."
-    reason += " Benign CNVs: (displaying only first 5)\n" if len(reasons) > 5 else " Benign CNVs:\n"
-    reason += "\n".join(reasons[:5])
+    reason += " Benign CNVs: (displaying only first 5)\n" if len(benign_cnvs) > 5 else " Benign CNVs:\n"
+    reason += "\n".join(reasons)
     return reason
 
 
-def evaluate_section2_duplication(annot: annotation.Annotation) -> tuple[str, str]:
-    cont_eval: tuple[str, str] | None = None
-
-    inside_only_regions = annot.get_triplosensitivity_regions(
-        annotation.enums.Overlap.CONTAINED_INSIDE, core.HI_TS_SCORES
+@dataclass(frozen=True, slots=True)
+class BenignCNVMatches:
+    # first benign CNV with identical gene content, if the breakpoints do not interrupt protein coding genes (2C)
+    identical: dict[str, Any] | None
+    # first benign CNV spanning the entire CNV (2D/2E)
+    spanning: dict[str, Any] | None
+    # first benign CNV inside the CNV, that does not add protein coding genes (2F)
+    contained: dict[str, Any] | None
+
+
+def match_benign_cnvs_duplication(
+    cnv: annotation.CNVRegionAnnotation,
+    benign_cnvs: list[Any],
+    gene_names: list[str],
+    protein_genes: list[Any],
+    protein_genes_on_breakpoints: bool,
+) -> BenignCNVMatches:
+    # A protein coding gene is "additional" to a benign CNV inside the CNV unless it spans the whole benign CNV,
+    # so no gene is additional iff the last gene start is before the benign CNV and the first gene end after it.
+    gene_bounds = (
+        (max(g["start"] for g in protein_genes), min(g["end"] for g in protein_genes)) if protein_genes else None
     )
-    print(f"Evaluating section 2: {inside_only_regions=}", file=sys.stderr)
-    if (count := len(inside_only_regions)) > 0:
-        scores = [int(r["Triplosensitivity Score"]) for r in inside_only_regions]
-        names = [r["ISCA Region Name"] for r in inside_only_regions]
-        if len(set(scores)) == 1:
-            detail = f'Found {count} such regions: {', '.join(names)}; all with TS score {scores[0]}.'
-        else:
-            detail = f'Found {count} such regions: {', '.join(names)} with TS scores: {scores}, respectively.'
-        return "2A", "Completely contains at least one established TS region. " + detail
-
-    inside_only_genes = annot.get_triplosensitivity_genes(annotation.enums.Overlap.CONTAINED_INSIDE, core.HI_TS_SCORES)
-    print(f"Evaluating section 2: {inside_only_genes=}", file=sys.stderr)
-    if (count := len(inside_only_genes)) > 0:
-        scores = [int(g["Triplosensitivity Score"]) for g in inside_only_genes]
-        names = [g["Gene Symbol"] for g in inside_only_genes]
-        if len(set(scores)) == 1:
-            detail = f'Found {count} such genes: {', '.join(names)}; all with TS score {scores[0]}.'
-        else:
-            detail = f'Found {count} such genes: {', '.join(names)} with TS scores: {scores}, respectively.'
-        return "2A", "Completely contains at least one established TS gene. " + detail
-
-    all_ts_regions = annot.get_triplosensitivity_regions(annotation.enums.Overlap.ANY, core.HI_TS_SCORES)
-    print(f"Evaluating section 2: {all_ts_regions=}", file=sys.stderr)
-    if len(all_ts_regions) > 0:
-        max_overlap = max([annot.cnv.get_overlap_with_region(r["start"], r["end"]) for r in all_ts_regions])
-        names = [r["ISCA Region Name"] for r in all_ts_regions]
-        names_str = (", ".join(names[:10]) + ", ...") if len(names) > 10 else ", ".join(names)
-        reason = (
-            f"Partially overlaps established TS region(s) ({len(names)} - {names_str}, max. overlap {max_overlap}bp)."
+    gene_content = tuple(gene_names)
+
+    spanning = contained = None
+    for benign_cnv in benign_cnvs:
+        # here we assume that benign CNV start and end in between genes
+        if (
+            not protein_genes_on_breakpoints
+            and len(benign_cnv["genes"]) == len(gene_content)
+            and tuple(sorted(gene["gene_name"] for gene in benign_cnv["genes"])) == gene_content
+        ):
+            return BenignCNVMatches(identical=benign_cnv, spanning=None, contained=None)
+        if spanning is None and cnv.is_overlapping(
+            benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.SPAN_ENTIRE
+        ):
+            spanning = benign_cnv
+        if (
+            contained is None
+            and (gene_bounds is None or (gene_bounds[0] < benign_cnv["start"] and gene_bounds[1] > benign_cnv["end"]))
+            and cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.CONTAINED_INSIDE)
+        ):
+            contained = benign_cnv
+    return BenignCNVMatches(identical=None, spanning=spanning, contained=contained)
+
+
+@dataclass(frozen=True, slots=True)
+class Outcome:
+    option: str
+    reason: Reason
+    # False for "continue evaluation" outcomes, used only when no later rule stops the evaluation
+    stop: bool = True
+
+
+class Section2Facts:
+    """Predicates of the section 2 rules for one CNV, each computed on first use and at most once."""
+
+    def __init__(self, annot: annotation_view.AnnotationView, parameters: core.Parameters | None = None) -> None:
+        self.annot = annot
+        self.cnv = annot.cnv
+        self.parameters = parameters if parameters is not None else core.Parameters()
+        self.hi_ts_scores = self.parameters.hi_ts_scores
+        # rule being evaluated, predicates are traced under the rule that computes them
+        self.rule = ""
+
+    def _trace(self, message: str, *args: Any) -> None:
+        trace.trace("2", self.rule, message, *args)
+
+    @functools.cached_property
+    def ts_regions_inside(self) -> list[dict[str, Any]]:
+        regions = self.annot.get_triplosensitivity_regions(annotation.enums.Overlap.CONTAINED_INSIDE, self.hi_ts_scores)
+        self._trace("ts_regions_inside=%r", regions)
+        return regions
+
+    @functools.cached_property
+    def ts_genes_inside(self) -> list[dict[str, Any]]:
+        genes = self.annot.get_triplosensitivity_genes(annotation.enums.Overlap.CONTAINED_INSIDE, self.hi_ts_scores)
+        self._trace("ts_genes_inside=%r", genes)
+        return genes
+
+    @functools.cached_property
+    def ts_regions_any(self) -> list[dict[str, Any]]:
+        regions = self.annot.get_triplosensitivity_regions(annotation.enums.Overlap.ANY, self.hi_ts_scores)
+        self._trace("ts_regions_any=%r", regions)
+        return regions
+
+    @functools.cached_property
+    def hi_regions_inside(self) -> list[dict[str, Any]]:
+        regions = self.annot.get_haploinsufficient_regions(annotation.enums.Overlap.CONTAINED_INSIDE, self.hi_ts_scores)
+        self._trace("hi_regions_inside=%r", regions)
+        return regions
+
+    @functools.cached_property
+    def hi_regions_any(self) -> list[dict[str, Any]]:
+        regions = self.annot.get_haploinsufficient_regions(annotation.enums.Overlap.ANY, self.hi_ts_scores)
+        self._trace("hi_regions_any=%r", regions)
+        return regions
+
+    @functools.cached_property
+    def hi_genes_inside(self) -> list[dict[str, Any]]:
+        genes = self.annot.get_haploinsufficient_genes(annotation.enums.Overlap.CONTAINED_INSIDE, self.hi_ts_scores)
+        self._trace("hi_genes_inside=%r", genes)
+        return genes
+
+    @functools.cached_property
+    def hi_genes_any(self) -> list[dict[str, Any]]:
+        return self.annot.get_haploinsufficient_genes(annotation.enums.Overlap.ANY, self.hi_ts_scores)
+
+    @functools.cached_property
+    def hi_genes_spanning(self) -> list[dict[str, Any]]:
+        genes = self.annot.get_haploinsufficient_genes(annotation.enums.Overlap.SPAN_ENTIRE, self.hi_ts_scores)
+        self._trace("hi_genes_spanning=%r", genes)
+        return genes
+
+    @functools.cached_property
+    def hi_genes_on_breakpoints(self) -> list[dict[str, Any]]:
+        genes = self.annot.get_haploinsufficient_genes(annotation.enums.Overlap.START_OR_END, self.hi_ts_scores)
+        self._trace("hi_genes_on_breakpoints=%r", genes)
+        return genes
+
+    @functools.cached_property
+    def gene_names(self) -> list[str]:
+        gene_names = sorted([gene["gene_name"] for gene in self.annot.get_genes(overlap=annotation.enums.Overlap.ANY)])
+        self._trace("gene_names=%r", gene_names)
+        return gene_names
+
+    @functools.cached_property
+    def genes_on_breakpoints(self) -> list[dict[str, Any]]:
+        return self.annot.get_genes(overlap=annotation.enums.Overlap.START_OR_END)
+
+    @functools.cached_property
+    def protein_genes(self) -> list[dict[str, Any]]:
+        return self.annot.get_genes(gene_type="protein_coding")
+
+    @functools.cached_property
+    def protein_genes_on_breakpoints(self) -> list[dict[str, Any]]:
+        genes = self.annot.get_genes(gene_type="protein_coding", overlap=annotation.enums.Overlap.START_OR_END)
+        self._trace("protein_genes_on_breakpoints=%r", genes)
+        return genes
+
+    @functools.cached_property
+    def benign_cnvs(self) -> list[dict[str, Any]]:
+        benign_cnvs = self.annot.get_benign_cnvs_gs_outer(frequency_threshold=self.parameters.min_frequency_benign)
+        self._trace("benign_cnvs=%r", benign_cnvs)
+        return benign_cnvs
+
+    @functools.cached_property
+    def benign_matches(self) -> BenignCNVMatches:
+        # Compare benign CNVs with the CNV in a single pass, keeping the first benign CNV matching each rule
+        return match_benign_cnvs_duplication(
+            self.cnv, self.benign_cnvs, self.gene_names, self.protein_genes, len(self.protein_genes_on_breakpoints) > 0
         )
-        return "2B", reason
 
-    # Load (protein) coding genes and genes on breakpoints
-    gene_names = sorted([gene["gene_name"] for gene in annot.get_genes(overlap=annotation.enums.Overlap.ANY)])
-    protein_genes_on_breakpoints = annot.get_genes(
-        gene_type="protein_coding", overlap=annotation.enums.Overlap.START_OR_END
+    @functools.cached_property
+    def high_risk_genes(self) -> list[dict[str, Any]]:
+        genes = self.annot.get_high_risk_loss_genes()
+        self._trace("high_risk_genes=%r", genes)
+        return genes
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    # profiling marker of the rule, the options it returns may be more specific (e.g. "2C-1" for "2C-2E")
+    name: str
+    # attributes of Section2Facts the rule reads
+    predicates: tuple[str, ...]
+    evaluate: Callable[[Section2Facts], Outcome | None]
+    # False for rules that only continue the evaluation, they are skipped once an earlier rule gave the fallback
+    stops: bool = True
+
+
+@dataclass(frozen=True)
+class Section2Plan:
+    """Rules evaluated in priority order: the first stopping outcome is returned, otherwise the first "continue
+    evaluation" outcome, otherwise the section is skipped."""
+
+    rules: tuple[Rule, ...]
+    skip_reason: str
+
+    def __post_init__(self) -> None:
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate section 2 rules: {names}")
+        for rule in self.rules:
+            for predicate in rule.predicates:
+                if not isinstance(getattr(Section2Facts, predicate, None), functools.cached_property):
+                    raise ValueError(f"Rule {rule.name} reads unknown predicate {predicate}")
+
+    @property
+    def predicates(self) -> tuple[str, ...]:
+        """All predicates the plan may compute, in the order of first use."""
+        return tuple(dict.fromkeys(predicate for rule in self.rules for predicate in rule.predicates))
+
+    def decide(
+        self,
+        annot: annotation_view.AnnotationView,
+        profiler: profiling.Profiler = profiling.DISABLED,
+        parameters: core.Parameters | None = None,
+    ) -> tuple[str, Reason]:
+        facts = Section2Facts(annot, parameters)
+        fallback: Outcome | None = None
+        for rule in self.rules:
+            profiler.rule(rule.name)
+            if not rule.stops and fallback is not None:
+                continue
+            facts.rule = rule.name
+            outcome = rule.evaluate(facts)
+            if outcome is None:
+                continue
+            if outcome.stop:
+                return outcome.option, outcome.reason
+            if fallback is None:
+                fallback = outcome
+        if fallback is not None:
+            return fallback.option, fallback.reason
+        return "2Skip", Reason.of(self.skip_reason)
+
+    def evaluate(
+        self,
+        annot: annotation_view.AnnotationView,
+        profiler: profiling.Profiler = profiling.DISABLED,
+        parameters: core.Parameters | None = None,
+    ) -> tuple[str, str]:
+        option, reason = self.decide(annot, profiler, parameters)
+        return option, str(reason)
+
+
+def _render_contains_dosage_sensitive(kind: str, unit: str, records: list[dict[str, Any]], score_key: str) -> str:
+    count = len(records)
+    scores = [int(r[score_key]) for r in records]
+    names = [r["ISCA Region Name" if unit == "region" else "Gene Symbol"] for r in records]
+    if len(set(scores)) == 1:
+        detail = f'Found {count} such {unit}s: {', '.join(names)}; all with {kind} score {scores[0]}.'
+    else:
+        detail = f'Found {count} such {unit}s: {', '.join(names)} with {kind} scores: {scores}, respectively.'
+    return f"Completely contains at least one established {kind} {unit}. " + detail
+
+
+def _contains_dosage_sensitive(
+    regions: list[dict[str, Any]], genes: list[dict[str, Any]], kind: str, score_key: str
+) -> Outcome | None:
+    if len(regions) > 0:
+        return Outcome("2A", Reason(_render_contains_dosage_sensitive, (kind, "region", regions, score_key)))
+    if len(genes) > 0:
+        return Outcome("2A", Reason(_render_contains_dosage_sensitive, (kind, "gene", genes, score_key)))
+    return None
+
+
+def _render_overlaps_dosage_sensitive_regions(
+    cnv: annotation.CNVRegionAnnotation, regions: list[dict[str, Any]], kind: str
+) -> str:
+    max_overlap = max([cnv.get_overlap_with_region(r["start"], r["end"]) for r in regions])
+    names = [r["ISCA Region Name"] for r in regions]
+    names_str = (", ".join(names[:10]) + ", ...") if len(names) > 10 else ", ".join(names)
+    return (
+        f"Partially overlaps established {kind} region(s) ({len(names)} - {names_str}, max. overlap {max_overlap}bp)."
     )
-    print(f"Evaluating section 2: {gene_names=}, {protein_genes_on_breakpoints=}", file=sys.stderr)
 
-    # Compare protein coding genes in benign CNV - searching for identical gene content
-    benign_cnvs = annot.get_benign_cnvs_gs_outer(frequency_threshold=core.MIN_FREQUENCY_BENIGN)
-    print(f"Evaluating section 2: {benign_cnvs=}", file=sys.stderr)
-    for benign_cnv in benign_cnvs:
-        genes_cnv = sorted([gene["gene_name"] for gene in benign_cnv["genes"]])
-        # here we assume that benign CNV start and end in between genes
-        if genes_cnv == gene_names and len(protein_genes_on_breakpoints) == 0:
-            reason = f'Identical in gene content ({len(gene_names)} genes) to a benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}).'
-            return "2C", reason
 
+def _overlaps_dosage_sensitive_regions(
+    cnv: annotation.CNVRegionAnnotation, regions: list[dict[str, Any]], kind: str
+) -> Outcome | None:
+    if len(regions) == 0:
+        return None
+    return Outcome("2B", Reason(_render_overlaps_dosage_sensitive_regions, (cnv, regions, kind)))
+
+
+def _overlaps_benign_cnvs(facts: Section2Facts) -> Outcome | None:
+    if len(facts.benign_cnvs) == 0:
+        return None
+    return Outcome("2G", Reason(get_reason_from_benigncnvs, (facts.cnv, facts.benign_cnvs)), stop=False)
+
+
+# Duplications
+
+
+def _contains_ts(facts: Section2Facts) -> Outcome | None:
+    return _contains_dosage_sensitive(
+        facts.ts_regions_inside,
+        facts.ts_genes_inside if not facts.ts_regions_inside else [],
+        "TS",
+        "Triplosensitivity Score",
+    )
+
+
+def _overlaps_ts_regions(facts: Section2Facts) -> Outcome | None:
+    return _overlaps_dosage_sensitive_regions(facts.cnv, facts.ts_regions_any, "TS")
+
+
+def _render_identical_to_benign_gain(gene_count: int, benign_cnv: dict[str, Any]) -> str:
+    return f'Identical in gene content ({gene_count} genes) to a benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}).'
+
+
+def _identical_to_benign_gain(facts: Section2Facts) -> Outcome | None:
+    # Identical protein coding genes to a benign CNV
+    if (benign_cnv := facts.benign_matches.identical) is None:
+        return None
+    return Outcome("2C", Reason(_render_identical_to_benign_gain, (len(facts.gene_names), benign_cnv)))
+
+
+def _render_inside_benign_gain(benign_cnv: dict[str, Any]) -> str:
+    return (
+        f'Smaller than an established benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}), breakpoints do not '
+        f'interrupt protein-coding genes.'
+    )
+
+
+def _inside_benign_gain(facts: Section2Facts) -> Outcome | None:
     # Smaller than established benign CNV, breakpoints are OK
-    for benign_cnv in benign_cnvs:
-        if (
-            annot.cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.SPAN_ENTIRE)
-            and len(protein_genes_on_breakpoints) == 0
-        ):
-            reason = (
-                f'Smaller than an established benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}), breakpoints do not '
-                f'interrupt protein-coding genes.'
-            )
-            return "2D", reason
+    if (benign_cnv := facts.benign_matches.spanning) is None or len(facts.protein_genes_on_breakpoints) > 0:
+        return None
+    return Outcome("2D", Reason(_render_inside_benign_gain, (benign_cnv,)))
+
 
+def _render_inside_benign_gain_interrupting_genes(benign_cnv: dict[str, Any], genes: list[dict[str, Any]]) -> str:
+    gene_names = [g["gene_name"] for g in genes]
+    return (
+        f'Smaller than an established benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}), but breakpoints '
+        f'potentially interrupt protein-coding gene(s) ({", ".join(gene_names)}).'
+    )
+
+
+def _inside_benign_gain_interrupting_genes(facts: Section2Facts) -> Outcome | None:
     # Smaller than established benign CNV, breakpoints are NOT OK
-    for benign_cnv in benign_cnvs:
-        if (
-            annot.cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.SPAN_ENTIRE)
-            and len(protein_genes_on_breakpoints) > 0
-        ):
-            gene_names = [g["gene_name"] for g in protein_genes_on_breakpoints]
-            reason = (
-                f'Smaller than an established benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}), but breakpoints '
-                f'potentially interrupt protein-coding gene(s) ({", ".join(gene_names)}).'
-            )
-            if cont_eval is None:
-                cont_eval = "2E", reason
+    if (benign_cnv := facts.benign_matches.spanning) is None:
+        return None
+    return Outcome(
+        "2E",
+        Reason(_render_inside_benign_gain_interrupting_genes, (benign_cnv, facts.protein_genes_on_breakpoints)),
+        stop=False,
+    )
+
+
+def _render_contains_benign_gain(benign_cnv: dict[str, Any]) -> str:
+    return (
+        f'Larger than an established benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}), does not include '
+        f'additional protein-coding genes.'
+    )
 
+
+def _contains_benign_gain(facts: Section2Facts) -> Outcome | None:
     # Larger than established benign CNV, identical protein coding genes
-    protein_genes = annot.get_genes(gene_type="protein_coding")
-    print(f"Evaluating section 2: {protein_genes=}", file=sys.stderr)
-    for benign_cnv in benign_cnvs:
-        if annot.cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.CONTAINED_INSIDE):
-            other_genes = [
-                g for g in protein_genes if g["start"] >= benign_cnv["start"] or g["end"] <= benign_cnv["end"]
-            ]
-            if len(other_genes) == 0:
-                reason = (
-                    f'Larger than an established benign CNV gain (variant_accesion={benign_cnv["variantaccession"]}), does not include '
-                    f'additional protein-coding genes.'
-                )
-                return "2F", reason
-
-    # Overlapping a benign CNV
-    if len(benign_cnvs) > 0 and cont_eval is None:
-        cont_eval = "2G", get_reason_from_benigncnvs(annot.cnv, benign_cnvs)
+    if (benign_cnv := facts.benign_matches.contained) is None:
+        return None
+    return Outcome("2F", Reason(_render_contains_benign_gain, (benign_cnv,)))
+
+
+def _render_contains_hi_gene(hi_gene: dict[str, Any]) -> str:
+    return f'Completely contains an established HI gene {hi_gene["Gene Symbol"]} with HI score {hi_gene["Haploinsufficiency Score"]}.'
+
 
+def _contains_hi_gene(facts: Section2Facts) -> Outcome | None:
     # Complete containment of an HI gene
-    for hi_gene in annot.get_haploinsufficient_genes(annotation.enums.Overlap.CONTAINED_INSIDE, core.HI_TS_SCORES):
-        print(f"Evaluating section 2: inside_only{hi_gene=}", file=sys.stderr)
-        reason = f'Completely contains an established HI gene {hi_gene["Gene Symbol"]} with HI score {hi_gene["Haploinsufficiency Score"]}.'
-        if cont_eval is None:
-            cont_eval = "2H", reason
-
-    # Breakpoints with a hi_gene
-    for hi_gene in annot.get_haploinsufficient_genes(annotation.enums.Overlap.SPAN_ENTIRE, core.HI_TS_SCORES):
-        print(f"Evaluating section 2: span_whole_only{hi_gene=}", file=sys.stderr)
-        reason = (
-            f'Both breakpoints are within the same HI gene {hi_gene["Gene Symbol"]} - gene-level sequence variant, possibly resulting '
-            f'in loss of function (LOF).'
-        )
-        return "2I", reason
-
-    for hi_gene in annot.get_haploinsufficient_genes(annotation.enums.Overlap.START_OR_END, core.HI_TS_SCORES):
-        print(f"Evaluating section 2: partial_both{hi_gene=}", file=sys.stderr)
-        reason = f'One breakpoint is within an established HI gene {hi_gene["Gene Symbol"]}, the patient’s phenotype is unknown.'
-        if cont_eval is None:
-            cont_eval = "2J", reason
-
-    # Breakpoint within other gene
-    genes_on_breakpoints = annot.get_genes(overlap=annotation.enums.Overlap.START_OR_END)
-    if len(genes_on_breakpoints) > 0:
-        gene_names = [g["gene_name"] for g in genes_on_breakpoints]
-        reason = f"One or both breakpoints are within gene(s) of no established clinical significance ({gene_names})."
-        if cont_eval is None:
-            cont_eval = "2L", reason
-
-    # Skip section if there are no supporting data
-    if cont_eval:
-        return cont_eval
-    else:
-        reason = "The section is skipped due to lack of supporting data (no TS/HI regions/genes and benign CNVs)."
-        return "2Skip", reason
+    if not facts.hi_genes_inside:
+        return None
+    return Outcome("2H", Reason(_render_contains_hi_gene, (facts.hi_genes_inside[0],)), stop=False)
+
+
+def _render_inside_hi_gene(hi_gene: dict[str, Any]) -> str:
+    return (
+        f'Both breakpoints are within the same HI gene {hi_gene["Gene Symbol"]} - gene-level sequence variant, possibly resulting '
+        f'in loss of function (LOF).'
+    )
 
 
-def evaluate_section2(annot: annotation.Annotation) -> tuple[str, str]:
-    # cont_evaluation clauses:
-    cont_eval: tuple[str, str] | None = None
+def _inside_hi_gene(facts: Section2Facts) -> Outcome | None:
+    # Both breakpoints within the same HI gene
+    if not facts.hi_genes_spanning:
+        return None
+    return Outcome("2I", Reason(_render_inside_hi_gene, (facts.hi_genes_spanning[0],)))
 
-    if annot.cnv.is_duplication:
-        return evaluate_section2_duplication(annot)
 
-    inside_only_regions = annot.get_haploinsufficient_regions(
-        annotation.enums.Overlap.CONTAINED_INSIDE, core.HI_TS_SCORES
+def _render_breakpoint_in_hi_gene(hi_gene: dict[str, Any]) -> str:
+    return (
+        f'One breakpoint is within an established HI gene {hi_gene["Gene Symbol"]}, the patient’s phenotype is unknown.'
     )
-    print(f"Evaluating section 2: {inside_only_regions=}", file=sys.stderr)
-    if (count := len(inside_only_regions)) > 0:
-        scores = [int(r["Haploinsufficiency Score"]) for r in inside_only_regions]
-        names = [r["ISCA Region Name"] for r in inside_only_regions]
-        if len(set(scores)) == 1:
-            detail = f'Found {count} such regions: {', '.join(names)}; all with HI score {scores[0]}.'
-        else:
-            detail = f'Found {count} such regions: {', '.join(names)} with HI scores: {scores}, respectively.'
-        return "2A", "Completely contains at least one established HI region. " + detail
-
-    inside_only_genes = annot.get_haploinsufficient_genes(annotation.enums.Overlap.CONTAINED_INSIDE, core.HI_TS_SCORES)
-    print(f"Evaluating section 2: {inside_only_genes=}", file=sys.stderr)
-    if (count := len(inside_only_genes)) > 0:
-        scores = [int(g["Haploinsufficiency Score"]) for g in inside_only_genes]
-        names = [g["Gene Symbol"] for g in inside_only_genes]
-        if len(set(scores)) == 1:
-            detail = f'Found {count} such genes: {', '.join(names)}; all with HI score {scores[0]}.'
-        else:
-            detail = f'Found {count} such genes: {', '.join(names)} with HI scores: {scores}, respectively.'
-        return "2A", "Completely contains at least one established HI gene. " + detail
 
-    # Evaluation of every single HI gene:
-    for hi_gene in annot.get_haploinsufficient_genes(annotation.enums.Overlap.ANY, core.HI_TS_SCORES):
-        gene_info = annot.get_gene_by_name(hi_gene["Gene Symbol"])
+
+def _breakpoint_in_hi_gene(facts: Section2Facts) -> Outcome | None:
+    if not facts.hi_genes_on_breakpoints:
+        return None
+    return Outcome("2J", Reason(_render_breakpoint_in_hi_gene, (facts.hi_genes_on_breakpoints[0],)), stop=False)
+
+
+def _render_breakpoint_in_other_gene(genes: list[dict[str, Any]]) -> str:
+    gene_names = [g["gene_name"] for g in genes]
+    return f"One or both breakpoints are within gene(s) of no established clinical significance ({gene_names})."
+
+
+def _breakpoint_in_other_gene(facts: Section2Facts) -> Outcome | None:
+    if not facts.genes_on_breakpoints:
+        return None
+    return Outcome("2L", Reason(_render_breakpoint_in_other_gene, (facts.genes_on_breakpoints,)), stop=False)
+
+
+# Deletions
+
+
+def _contains_hi(facts: Section2Facts) -> Outcome | None:
+    return _contains_dosage_sensitive(
+        facts.hi_regions_inside,
+        facts.hi_genes_inside if not facts.hi_regions_inside else [],
+        "HI",
+        "Haploinsufficiency Score",
+    )
+
+
+def _render_hi_gene_transcript(hi_gene: dict[str, Any], transcript: annotation.TranscriptRegion, option: str) -> str:
+    partial_reason = render_transcript_reason(transcript, option)
+    return f'{partial_reason} (Gene name: {hi_gene['Gene Symbol']}, Transcript ID: {transcript["identifier"]})'
+
+
+def _hi_gene_transcripts(facts: Section2Facts) -> Outcome | None:
+    # Evaluation of every single HI gene, the last "continue evaluation" (2D-1) gene is kept
+    cont_eval: Outcome | None = None
+    for hi_gene in facts.hi_genes_any:
+        gene_info = facts.annot.get_gene_by_name(hi_gene["Gene Symbol"])
         if gene_info is None:
-            print(
-                f'WARNING: gene {hi_gene["Gene Symbol"]} NOT FOUND in GenCode, probably mismatch in coordinates GenCode/Clingen.'
+            trace.warning(
+                "2",
+                "2C",
+                "gene %s NOT FOUND in GenCode, probably mismatch in coordinates GenCode/Clingen.",
+                hi_gene["Gene Symbol"],
             )
             continue
         if gene_info["gene_type"] != "protein_coding":
-            print(f'WARNING: evaluated GENE TYPE is {gene_info["gene_type"]}')
+            trace.warning("2", "2C", "evaluated GENE TYPE is %s", gene_info["gene_type"])
 
-        transcript_regions = annot.get_gene_transcript_regions(hi_gene["Gene Symbol"])
-        print(f"Evaluating section 2: {transcript_regions=} for {hi_gene}", file=sys.stderr)
+        transcript_regions = facts.annot.get_gene_transcript_regions(hi_gene["Gene Symbol"])
+        trace.trace("2", "2C", "transcript_regions=%r for %r", transcript_regions, hi_gene)
 
-        # Evaluate the gene and all its transcripts, return the worst value
-        option, partial_reason, transcript_name = evaluate_gene(transcript_regions)
-        reason = f'{partial_reason} (Gene name: {hi_gene['Gene Symbol']}, Transcript ID: {transcript_name})'
+        # Evaluate the gene and all its transcripts, keep the worst value
+        option, transcript = most_severe_transcript(transcript_regions)
+        if transcript is None:
+            continue
+        reason = Reason(_render_hi_gene_transcript, (hi_gene, transcript, option))
+        if option != "2D-1":  # 2D-1 is "Continue evaluation"
+            return Outcome(option, reason)
+        cont_eval = Outcome(option, reason, stop=False)
+    return cont_eval
 
-        if option != "" and option != "2D-1":  # 2D-1 is "Continue evaluation"
-            return option, reason
-        if option == "2D-1":
-            cont_eval = option, reason
 
+def _overlaps_hi_regions(facts: Section2Facts) -> Outcome | None:
     # Partial overlap with hi_range
-    hi_regions = annot.get_haploinsufficient_regions(annotation.enums.Overlap.ANY, core.HI_TS_SCORES)
-    print(f"Evaluating section 2: {hi_regions=}", file=sys.stderr)
-    if len(hi_regions) > 0:
-        names = [r["ISCA Region Name"] for r in hi_regions]
-        max_overlap = max([annot.cnv.get_overlap_with_region(r["start"], r["end"]) for r in hi_regions])
-        names_str = (", ".join(names[:10]) + ", ...") if len(names) > 10 else ", ".join(names)
-        reason = (
-            f"Partially overlaps established HI region(s) ({len(names)} - {names_str}, max. overlap {max_overlap}bp)."
-        )
-        return "2B", reason
+    return _overlaps_dosage_sensitive_regions(facts.cnv, facts.hi_regions_any, "HI")
+
+
+def _render_inside_benign_loss(benign_cnv: dict[str, Any]) -> str:
+    return (
+        f'An established benign CNV {benign_cnv["variantaccession"]} with pubmedid {benign_cnv.get("pubmedid", "UNKNOWN")} '
+        f'completely contains the target CNV.'
+    )
 
+
+def _inside_benign_loss(facts: Section2Facts) -> Outcome | None:
     # Completely contained within a benign CNV
-    benign_cnvs = annot.get_benign_cnvs_gs_outer(core.MIN_FREQUENCY_BENIGN)
-    print(f"Evaluating section 2: {benign_cnvs=}", file=sys.stderr)
-    for benign_cnv in benign_cnvs:
-        if annot.cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.SPAN_ENTIRE):
-            reason = (
-                f'An established benign CNV {benign_cnv["variantaccession"]} with pubmedid {benign_cnv.get("pubmedid", "UNKNOWN")} '
-                f'completely contains the target CNV.'
-            )
-            return "2F", reason
+    for benign_cnv in facts.benign_cnvs:
+        if facts.cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.SPAN_ENTIRE):
+            return Outcome("2F", Reason(_render_inside_benign_loss, (benign_cnv,)))
+    return None
 
-    # Overlapping a benign CNV
-    if len(benign_cnvs) > 0 and cont_eval is None:
-        reason = get_reason_from_benigncnvs(annot.cnv, benign_cnvs)
-        cont_eval = "2G", reason
 
-    # check HI predictors
-    high_risk_genes = annot.get_high_risk_loss_genes()
-    print(f"Evaluating section 2: {high_risk_genes=}", file=sys.stderr)
-    if len(high_risk_genes) > 0:
-        gene = high_risk_genes[0]
-        reason = (
-            f'Overlaps a gene with a predicted high risk of haplo-insufficiency (Gene name: {gene["gene_name"]}, Predictors: '
-            f'{", ".join(gene["risk_predictors"])})'
-        )
-        return "2H", reason
+def _render_high_risk_gene(gene: dict[str, Any]) -> str:
+    return (
+        f'Overlaps a gene with a predicted high risk of haplo-insufficiency (Gene name: {gene["gene_name"]}, Predictors: '
+        f'{", ".join(gene["risk_predictors"])})'
+    )
+
 
-    # Skip section if no data available
-    if cont_eval is not None:
-        return cont_eval
+def _high_risk_gene(facts: Section2Facts) -> Outcome | None:
+    # check HI predictors
+    if len(facts.high_risk_genes) == 0:
+        return None
+    return Outcome("2H", Reason(_render_high_risk_gene, (facts.high_risk_genes[0],)))
+
+
+DUPLICATION_PLAN = Section2Plan(
+    rules=(
+        Rule("2A", ("ts_regions_inside", "ts_genes_inside"), _contains_ts),
+        Rule("2B", ("ts_regions_any",), _overlaps_ts_regions),
+        Rule("2C", ("benign_matches", "gene_names"), _identical_to_benign_gain),
+        Rule("2D", ("benign_matches", "protein_genes_on_breakpoints"), _inside_benign_gain),
+        Rule(
+            "2E",
+            ("benign_matches", "protein_genes_on_breakpoints"),
+            _inside_benign_gain_interrupting_genes,
+            stops=False,
+        ),
+        Rule("2F", ("benign_matches",), _contains_benign_gain),
+        Rule("2G", ("benign_cnvs",), _overlaps_benign_cnvs, stops=False),
+        Rule("2H", ("hi_genes_inside",), _contains_hi_gene, stops=False),
+        Rule("2I", ("hi_genes_spanning",), _inside_hi_gene),
+        Rule("2J", ("hi_genes_on_breakpoints",), _breakpoint_in_hi_gene, stops=False),
+        Rule("2L", ("genes_on_breakpoints",), _breakpoint_in_other_gene, stops=False),
+    ),
+    skip_reason="The section is skipped due to lack of supporting data (no TS/HI regions/genes and benign CNVs).",
+)
+
+DELETION_PLAN = Section2Plan(
+    rules=(
+        Rule("2A", ("hi_regions_inside", "hi_genes_inside"), _contains_hi),
+        Rule("2C-2E", ("hi_genes_any",), _hi_gene_transcripts),
+        Rule("2B", ("hi_regions_any",), _overlaps_hi_regions),
+        Rule("2F", ("benign_cnvs",), _inside_benign_loss),
+        Rule("2G", ("benign_cnvs",), _overlaps_benign_cnvs, stops=False),
+        Rule("2H", ("high_risk_genes",), _high_risk_gene),
+    ),
+    skip_reason="The section is skipped due to lack of supporting data (no HI regions/genes and benign CNVs).",
+)
+
+
+def decide_section2(
+    annot: annotation_view.AnnotationView,
+    profiler: profiling.Profiler = profiling.DISABLED,
+    parameters: core.Parameters | None = None,
+) -> tuple[str, Reason]:
+    plan = DUPLICATION_PLAN if annot.cnv.is_duplication else DELETION_PLAN
+    return plan.decide(annot, profiler, parameters)
+
+
+def evaluate_section2_duplication(
+    annot: annotation_view.AnnotationView, profiler: profiling.Profiler = profiling.DISABLED
+) -> tuple[str, str]:
+    return DUPLICATION_PLAN.evaluate(annot, profiler)
+
+
+def evaluate_section2(
+    annot: annotation_view.AnnotationView, profiler: profiling.Profiler = profiling.DISABLED
+) -> tuple[str, str]:
+    option, reason = decide_section2(annot, profiler)
+    return option, str(reason)
+
+
+def _render_section1(gene_count: int, enhancers_count: int) -> str:
+    return f"The number of overlapping protein-coding genes ({gene_count}) or enhancers ({enhancers_count}) is more than zero."
+
+
+def decide_section1(gene_count: int, enhancers_count: int) -> tuple[str, Reason]:
+    if gene_count + enhancers_count == 0:
+        return "1B", Reason.of("The number of overlapping protein-coding genes and regulatory elements is zero.")
+    return "1A", Reason(_render_section1, (gene_count, enhancers_count))
+
+
+def evaluate_section1(gene_count: int, enhancers_count: int) -> tuple[str, str]:
+    option, reason = decide_section1(gene_count, enhancers_count)
+    return option, str(reason)
+
+
+def _render_section3(protein_gene_count: int) -> str:
+    return f"Overlaps {protein_gene_count} protein-coding genes."
+
+
+def decide_section3(
+    protein_gene_count: int, duplication: bool, parameters: core.Parameters | None = None
+) -> tuple[str, Reason]:
+    thresholds = (parameters if parameters is not None else core.Parameters()).genes_thresholds(duplication)
+
+    if protein_gene_count < thresholds[0]:
+        option = "3A"
+    elif protein_gene_count < thresholds[1]:
+        option = "3B"
     else:
-        reason = "The section is skipped due to lack of supporting data (no HI regions/genes and benign CNVs)."
-        return "2Skip", reason
+        option = "3C"
+    return option, Reason(_render_section3, (protein_gene_count,))
 
 
-@dataclass
-class MarCNVClassifier:
-    annot: annotation.Annotation
-    acmg_criteria: dict[str, criterion.ACMGCriterion] = field(init=False)
+def evaluate_section3(protein_gene_count: int, duplication: bool) -> tuple[str, str]:
+    option, reason = decide_section3(protein_gene_count, duplication)
+    return option, str(reason)
 
-    def __post_init__(self) -> None:
-        self.acmg_criteria = criterion.get_acmg_criteria(self.annot.cnv.is_duplication)
 
-    def _build_section_result(self, section: str, option: str, reason: str) -> classification.SectionResult:
-        criterion = self.acmg_criteria[option]
-        return classification.SectionResult(
-            section=section,
-            option=option,
-            reason=reason,
-            evidence=criterion.evidence,
-            score=criterion.suggested_points if criterion.suggested_points is not None else 0,
-        )
+def _render_section4(genomic_coord: str, region: dict[str, Any]) -> str:
+    return f'Common population variation {genomic_coord} for population {region["population"]} has frequency of {region["frequency"] * 100.0}%.'
 
-    def _evaluate_section1(self) -> classification.SectionResult:
-        # Find number of genes and regulatory elements
-        gene_count = len(self.annot.get_genes(gene_type="protein_coding"))
-        enhancers_count = self.annot.count_regulatory_types()["enhancer"]
-
-        print(f"Evaluating section 1: {gene_count=}, {enhancers_count=}", file=sys.stderr)
-        # Pick final option and assign reason
-        if gene_count + enhancers_count == 0:
-            option = "1B"
-            reason = "The number of overlapping protein-coding genes and regulatory elements is zero."
-        else:
-            option = "1A"
-            reason = f"The number of overlapping protein-coding genes ({gene_count}) or enhancers ({enhancers_count}) is more than zero."
-        return self._build_section_result(
-            section="1",
-            option=option,
-            reason=reason,
-        )
 
-    def _evaluate_section2(self) -> classification.SectionResult:
-        section = evaluate_section2(self.annot)
-        return self._build_section_result(
-            section="2",
-            option=section[0],
-            reason=section[1],
-        )
+def decide_section4(genomic_coord: str, common_variability_regions: list[Any]) -> tuple[str, Reason]:
+    if len(common_variability_regions) >= 1:
+        region = [r for r in common_variability_regions if r["population"] == "nfe"][0]
+        return "4O", Reason(_render_section4, (genomic_coord, region))
+    return "4Skip", Reason.of("Manual decision needed.")
 
-    def _evaluate_section3(self) -> classification.SectionResult:
-        protein_genes = self.annot.get_genes(gene_type="protein_coding")
 
-        if self.annot.cnv.is_duplication:
-            thresholds = core.DUPLICATION_GENES_THRESHOLDS
-        else:
-            thresholds = core.DELETION_GENES_THRESHOLDS
+def evaluate_section4(genomic_coord: str, common_variability_regions: list[Any]) -> tuple[str, str]:
+    option, reason = decide_section4(genomic_coord, common_variability_regions)
+    return option, str(reason)
 
-        print(f"Evaluating section 3: {len(protein_genes)=}", file=sys.stderr)
-        if len(protein_genes) < thresholds[0]:
-            option = "3A"
-        elif len(protein_genes) < thresholds[1]:
-            option = "3B"
-        else:
-            option = "3C"
 
-        return self._build_section_result(
-            section="3",
-            option=option,
-            reason=f"Overlaps {len(protein_genes)} protein-coding genes.",
-        )
+def decide_section5() -> tuple[str, Reason]:
+    return "5F", Reason.of("No family history is available.")
+
+
+def evaluate_section5() -> tuple[str, str]:
+    option, reason = decide_section5()
+    return option, str(reason)
+
+
+def section_points(acmg_criteria: criterion.CriteriaTable, option: str) -> float:
+    suggested_points = acmg_criteria[option].suggested_points
+    return suggested_points if suggested_points is not None else 0
 
-    def _evaluate_section4(self) -> classification.SectionResult:
-        reason = "Manual decision needed."
-        option = "4Skip"
-
-        common_variability_regions = self.annot.get_common_variability_regions()
-        print(f"Evaluating section 4: {common_variability_regions=}", file=sys.stderr)
-        if len(common_variability_regions) >= 1:
-            region = [r for r in common_variability_regions if r["population"] == "nfe"][0]
-            reason = f'Common population variation {self.annot.cnv.genomic_coord} for population {region["population"]} has frequency of {region["frequency"] * 100.0}%.'
-            option = "4O"
-
-        return self._build_section_result(
-            section="4",
-            option=option,
-            reason=reason,
-        )
 
-    def _evaluate_section5(self) -> classification.SectionResult:
-        return self._build_section_result(
-            section="5",
-            option="5F",
-            reason="No family history is available.",
+def build_section_result(
+    acmg_criteria: criterion.CriteriaTable, section: str, option: str, reason: str
+) -> classification.SectionResult:
+    return classification.SectionResult(
+        section=section,
+        option=option,
+        reason=reason,
+        evidence=acmg_criteria[option].evidence,
+        score=section_points(acmg_criteria, option),
+    )
+
+
+@dataclass
+class Screening:
+    """Options and score of a CNV, with the reasons rendered only by `prediction`."""
+
+    options: dict[str, str]
+    score: float
+    reasons: dict[str, Reason] = field(repr=False)
+    acmg_criteria: criterion.CriteriaTable = field(repr=False)
+    severity: classification.Severity = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.severity = classification.Severity.from_score(self.score)
+
+    @classmethod
+    def from_decisions(
+        cls, acmg_criteria: criterion.CriteriaTable, decisions: list[tuple[str, str, Reason]]
+    ) -> "Screening":
+        # summed in the section order, so the score is identical to the one of the rendered prediction
+        score = round(sum([section_points(acmg_criteria, option) for _, option, _ in decisions]), 8)
+        return cls(
+            options={section: option for section, option, _ in decisions},
+            score=score,
+            reasons={section: reason for section, _, reason in decisions},
+            acmg_criteria=acmg_criteria,
         )
 
-    def classify(self) -> classification.Prediction:
-        sections = [
-            self._evaluate_section1(),
-            self._evaluate_section2(),
-            self._evaluate_section3(),
-            self._evaluate_section4(),
-            self._evaluate_section5(),
+    def prediction(self) -> classification.Prediction:
+        """Renders the full prediction, identical to MarCNVClassifier.classify."""
+        criteria = [
+            build_section_result(self.acmg_criteria, section, option, str(self.reasons[section]))
+            for section, option in self.options.items()
         ]
+        return classification.Prediction(score=self.score, criteria=criteria)
 
-        final_score = round(sum([section.score for section in sections]), 8)
 
-        return classification.Prediction(
-            score=final_score,
-            criteria=sections,
-        )
+@dataclass
+class MarCNVClassifier:
+    """Classifier of one CNV.
+
+    The module-level data shared by all classifiers (criteria tables, section 2 plans, parameters) is immutable, so
+    classifiers run concurrently in threads. A classifier keeps the answered annotation queries of its CNV; it may be
+    classified again, also from several threads, but its profiler records the timings of one thread only.
+    """
+
+    annot: annotation.Annotation
+    profiler: profiling.Profiler = profiling.DISABLED
+    record_dependencies: bool = False
+    parameters: core.Parameters = field(default_factory=core.Parameters)
+    acmg_criteria: criterion.CriteriaTable = field(init=False)
+    view: annotation_view.AnnotationView = field(init=False)
+    # knowledge sources and criteria row each decided section depends on, if `record_dependencies`
+    dependencies: dict[str, list[str]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.acmg_criteria = criterion.get_acmg_criteria(self.annot.cnv.is_duplication)
+        self.view = annotation_view.AnnotationView(self.profiler.wrap(self.annot))
+
+    def _decide_section1(self, view: annotation_view.AnnotationView) -> tuple[str, Reason]:
+        # Find number of genes and regulatory elements
+        gene_count = len(view.get_genes(gene_type="protein_coding"))
+        enhancers_count = view.count_regulatory_types()["enhancer"]
+
+        trace.trace("1", "1A", "gene_count=%d, enhancers_count=%d", gene_count, enhancers_count)
+        return decide_section1(gene_count, enhancers_count)
+
+    def _decide_section2(self, view: annotation_view.AnnotationView) -> tuple[str, Reason]:
+        return decide_section2(view, self.profiler, self.parameters)
+
+    def _decide_section3(self, view: annotation_view.AnnotationView) -> tuple[str, Reason]:
+        protein_genes = view.get_genes(gene_type="protein_coding")
+
+        trace.trace("3", "3A", "len(protein_genes)=%d", len(protein_genes))
+        return decide_section3(len(protein_genes), view.cnv.is_duplication, self.parameters)
+
+    def _decide_section4(self, view: annotation_view.AnnotationView) -> tuple[str, Reason]:
+        common_variability_regions = view.get_common_variability_regions()
+        trace.trace("4", "4O", "common_variability_regions=%r", common_variability_regions)
+        return decide_section4(view.cnv.genomic_coord, common_variability_regions)
+
+    def _decide_section5(self, view: annotation_view.AnnotationView) -> tuple[str, Reason]:
+        return decide_section5()
+
+    def decide(self, sections: Iterable[str] = SECTIONS) -> list[tuple[str, str, Reason]]:
+        """Evaluates the options of the sections without rendering their reasons."""
+        deciders = {
+            "1": self._decide_section1,
+            "2": self._decide_section2,
+            "3": self._decide_section3,
+            "4": self._decide_section4,
+            "5": self._decide_section5,
+        }
+        decisions: list[tuple[str, str, Reason]] = []
+        for name in sections:
+            view = self.view.tracking() if self.record_dependencies else self.view
+            with self.profiler.section(name):
+                option, reason = deciders[name](view)
+            # the reason is rendered only if the info trace is enabled
+            trace.info(name, option, "%s", reason)
+            if view.sources is not None:
+                criteria_row = criterion.criteria_dependency(view.cnv.is_duplication, option)
+                self.dependencies[name] = sorted(view.sources) + [criteria_row]
+            decisions.append((name, option, reason))
+        return decisions
+
+    def screen(self) -> Screening:
+        """Evaluates the options and the score without rendering any reason."""
+        return Screening.from_decisions(self.acmg_criteria, self.decide())
+
+    def classify(self) -> classification.Prediction:
+        return self.screen().prediction()
@@ -0,0 +1,123 @@
+import copy
+from typing import Any, Callable, Hashable, Sequence, TypeVar
+
+import annotation
+
+T = TypeVar("T")
+
+# knowledge sources of the annotation, recorded as dependencies of the section results that read them
+GENES = "genes"  # GenCode genes and transcripts, with the HI predictors of the genes
+REGULATORY = "regulatory"
+DOSAGE_GENES = "dosage_genes"  # ClinGen HI/TS genes
+DOSAGE_REGIONS = "dosage_regions"  # ClinGen HI/TS regions
+BENIGN_CNVS = "benign_cnvs"
+GNOMAD = "gnomad"
+SOURCES = (GENES, REGULATORY, DOSAGE_GENES, DOSAGE_REGIONS, BENIGN_CNVS, GNOMAD)
+
+
+class AnnotationView:
+    """Read-only view of an annotation used by the classifier, where every distinct query is issued at most once.
+
+    Genes are queried once per overlap class and bucketed by gene type from that single result. While `sources`
+    is a set, the knowledge source of every query (including the answered ones) is added to it.
+    """
+
+    def __init__(self, annot: annotation.Annotation) -> None:
+        self.annot = annot
+        self.cnv = annot.cnv
+        self.sources: set[str] | None = None
+        self._cache: dict[Hashable, Any] = {}
+
+    def tracking(self) -> "AnnotationView":
+        """Returns a view sharing the answered queries of this one, adding the knowledge sources it reads to its own
+        `sources`, so concurrent evaluations do not mix their dependencies."""
+        view = copy.copy(self)
+        view.sources = set()
+        return view
+
+    def _memoize(self, source: str, key: Hashable, query: Callable[[], T]) -> T:
+        if self.sources is not None:
+            self.sources.add(source)
+        try:
+            return self._cache[key]
+        except KeyError:
+            result = self._cache[key] = query()
+            return result
+
+    def get_genes(
+        self, gene_type: str | None = None, overlap: annotation.enums.Overlap = annotation.enums.Overlap.ANY
+    ) -> list[dict[str, Any]]:
+        all_types = self._memoize(GENES, ("genes", overlap), lambda: self.annot.get_genes(overlap=overlap))
+        if gene_type is None:
+            return all_types
+        buckets: dict[str, list[dict[str, Any]]] = self._memoize(
+            GENES, ("genes_by_type", overlap), lambda: _bucket_by_type(all_types)
+        )
+        return buckets.get(gene_type, [])
+
+    def count_regulatory_types(self) -> dict[str, int]:
+        return self._memoize(REGULATORY, "regulatory_types", self.annot.count_regulatory_types)
+
+    def get_haploinsufficient_genes(
+        self, overlap: annotation.enums.Overlap, valid_scores: Sequence[int]
+    ) -> list[dict[str, Any]]:
+        return self._memoize(
+            DOSAGE_GENES,
+            ("hi_genes", overlap, tuple(valid_scores)),
+            lambda: self.annot.get_haploinsufficient_genes(overlap, list(valid_scores)),
+        )
+
+    def get_haploinsufficient_regions(
+        self, overlap: annotation.enums.Overlap, valid_scores: Sequence[int]
+    ) -> list[dict[str, Any]]:
+        return self._memoize(
+            DOSAGE_REGIONS,
+            ("hi_regions", overlap, tuple(valid_scores)),
+            lambda: self.annot.get_haploinsufficient_regions(overlap, list(valid_scores)),
+        )
+
+    def get_triplosensitivity_genes(
+        self, overlap: annotation.enums.Overlap, valid_scores: Sequence[int]
+    ) -> list[dict[str, Any]]:
+        return self._memoize(
+            DOSAGE_GENES,
+            ("ts_genes", overlap, tuple(valid_scores)),
+            lambda: self.annot.get_triplosensitivity_genes(overlap, list(valid_scores)),
+        )
+
+    def get_triplosensitivity_regions(
+        self, overlap: annotation.enums.Overlap, valid_scores: Sequence[int]
+    ) -> list[dict[str, Any]]:
+        return self._memoize(
+            DOSAGE_REGIONS,
+            ("ts_regions", overlap, tuple(valid_scores)),
+            lambda: self.annot.get_triplosensitivity_regions(overlap, list(valid_scores)),
+        )
+
+    def get_benign_cnvs_gs_outer(self, frequency_threshold: float) -> list[dict[str, Any]]:
+        return self._memoize(
+            BENIGN_CNVS,
+            ("benign_cnvs_gs_outer", frequency_threshold),
+            lambda: self.annot.get_benign_cnvs_gs_outer(frequency_threshold=frequency_threshold),
+        )
+
+    def get_gene_by_name(self, gene_name: str) -> dict[str, Any] | None:
+        return self._memoize(GENES, ("gene", gene_name), lambda: self.annot.get_gene_by_name(gene_name))
+
+    def get_gene_transcript_regions(self, gene_name: str) -> list[annotation.TranscriptRegion]:
+        return self._memoize(
+            GENES, ("transcripts", gene_name), lambda: self.annot.get_gene_transcript_regions(gene_name)
+        )
+
+    def get_high_risk_loss_genes(self) -> list[dict[str, Any]]:
+        return self._memoize(GENES, "high_risk_loss_genes", self.annot.get_high_risk_loss_genes)
+
+    def get_common_variability_regions(self) -> list[dict[str, Any]]:
+        return self._memoize(GNOMAD, "common_variability_regions", self.annot.get_common_variability_regions)
+
+
+def _bucket_by_type(genes: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    buckets: dict[str, list[dict[str, Any]]] = {}
+    for gene in genes:
+        buckets.setdefault(gene["gene_type"], []).append(gene)
+    return buckets
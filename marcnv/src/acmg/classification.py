@@ -1,6 +1,11 @@
 import bisect
 import enum
 from dataclasses import dataclass, field
+from typing import Any
+
+_EPSILON = 0.00000001
+# lowest scores of the severities above Benign, in the order of Severity
+SEVERITY_THRESHOLDS = (-1.0 + _EPSILON, -0.9 + _EPSILON, 0.9, 1.0)
 
 
 class Severity(enum.StrEnum):
@@ -13,9 +18,7 @@ class Severity(enum.StrEnum):
     @classmethod
     def from_score(cls, score: float) -> "Severity":
         """Returns the enum value from score."""
-        epsilon = 0.00000001
-        severity_thresholds = [-1.0 + epsilon, -0.9 + epsilon, 0.9, 1.0]
-        severity_index = bisect.bisect(severity_thresholds, score)
+        severity_index = bisect.bisect(SEVERITY_THRESHOLDS, score)
         vals = list(cls)
         return cls(vals[severity_index])
 
@@ -37,3 +40,8 @@ class Prediction:
 
     def __post_init__(self) -> None:
         self.severity = Severity.from_score(self.score)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Prediction":
+        """Returns the prediction from its dictionary form, as produced by `dataclasses.asdict`."""
+        return cls(score=data["score"], criteria=[SectionResult(**section) for section in data["criteria"]])
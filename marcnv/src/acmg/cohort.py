@@ -0,0 +1,241 @@
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Sequence
+
+import annotation
+
+from marcnv.src.acmg import acmg_classify, annotation_view, classification, core, criterion
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Cohort classification requires numpy, install the `cohort` extra of marcnv.") from e
+    return numpy
+
+
+# predicates of acmg_classify.Section2Facts read by the section 2 plan of duplications (True) and deletions (False)
+SECTION2_PREDICATES = {
+    True: (
+        "ts_regions_inside",
+        "ts_genes_inside",
+        "ts_regions_any",
+        "benign_cnvs",
+        "protein_genes_on_breakpoints",
+        "hi_genes_inside",
+        "hi_genes_spanning",
+        "hi_genes_on_breakpoints",
+        "genes_on_breakpoints",
+    ),
+    False: ("hi_regions_inside", "hi_genes_inside", "hi_genes_any", "hi_regions_any", "benign_cnvs", "high_risk_genes"),
+}
+
+
+def _section2_facts(view: annotation_view.AnnotationView) -> dict[str, Any]:
+    facts = acmg_classify.Section2Facts(view)
+    duplication = view.cnv.is_duplication
+    row: dict[str, Any] = {predicate: len(getattr(facts, predicate)) for predicate in SECTION2_PREDICATES[duplication]}
+    row["benign_spanning"] = sum(
+        view.cnv.is_overlapping(benign_cnv["start"], benign_cnv["end"], annotation.enums.Overlap.SPAN_ENTIRE)
+        for benign_cnv in facts.benign_cnvs
+    )
+    matches = facts.benign_matches if duplication and facts.benign_cnvs else None
+    row["benign_identical"] = matches is not None and matches.identical is not None
+    row["benign_contained"] = matches is not None and matches.contained is not None
+    return row
+
+
+def _nfe_frequency(common_variability_regions: list[dict[str, Any]]) -> float:
+    # the region section 4 reports
+    frequencies = [r["frequency"] for r in common_variability_regions if r["population"] == "nfe"]
+    return float(frequencies[0]) if frequencies else math.nan
+
+
+@dataclass
+class CohortColumns:
+    """Columnar facts of a cohort of CNVs, one row per CNV."""
+
+    is_duplication: "npt.NDArray[np.bool_]"
+    protein_genes: "npt.NDArray[np.int64]"
+    enhancers: "npt.NDArray[np.int64]"
+    # number of common population variations overlapping the CNV
+    common_variability: "npt.NDArray[np.int64]"
+    # frequency of the common population variation in the nfe population, NaN without one
+    nfe_frequency: "npt.NDArray[np.float64]"
+    # numbers of the HI/TS genes and regions per overlap class, benign CNVs and genes of SECTION2_PREDICATES, by
+    # predicate; 0 for the predicates of the other CNV type
+    section2_counts: dict[str, "npt.NDArray[np.int64]"]
+    # benign CNVs spanning the entire CNV
+    benign_spanning: "npt.NDArray[np.int64]"
+    # duplications with a benign CNV of the same gene content (2C), or inside them without additional protein coding
+    # genes (2F), see acmg_classify.match_benign_cnvs_duplication
+    benign_identical: "npt.NDArray[np.bool_]"
+    benign_contained: "npt.NDArray[np.bool_]"
+
+    @classmethod
+    def from_views(cls, views: Sequence[annotation_view.AnnotationView]) -> "CohortColumns":
+        np = _import_numpy()
+        facts = [_section2_facts(view) for view in views]
+        predicates = dict.fromkeys(SECTION2_PREDICATES[True] + SECTION2_PREDICATES[False])
+        return cls(
+            is_duplication=np.array([view.cnv.is_duplication for view in views], dtype=bool),
+            protein_genes=np.array([len(view.get_genes(gene_type="protein_coding")) for view in views], dtype=np.int64),
+            enhancers=np.array([view.count_regulatory_types()["enhancer"] for view in views], dtype=np.int64),
+            common_variability=np.array([len(view.get_common_variability_regions()) for view in views], dtype=np.int64),
+            nfe_frequency=np.array(
+                [_nfe_frequency(view.get_common_variability_regions()) for view in views], dtype=np.float64
+            ),
+            section2_counts={
+                predicate: np.array([row.get(predicate, 0) for row in facts], dtype=np.int64)
+                for predicate in predicates
+            },
+            benign_spanning=np.array([row["benign_spanning"] for row in facts], dtype=np.int64),
+            benign_identical=np.array([row["benign_identical"] for row in facts], dtype=bool),
+            benign_contained=np.array([row["benign_contained"] for row in facts], dtype=bool),
+        )
+
+
+@dataclass
+class CohortResult:
+    columns: CohortColumns
+    options: dict[str, "npt.NDArray[np.str_]"]
+    scores: "npt.NDArray[np.float64]"
+    severity_codes: "npt.NDArray[np.intp]"
+    # options and unrendered reasons of section 2 of the CNVs the columns did not decide, by row
+    section2: dict[int, tuple[str, acmg_classify.Reason]]
+    _views: list[annotation_view.AnnotationView] = field(repr=False)
+
+    @property
+    def severities(self) -> list[classification.Severity]:
+        severities = list(classification.Severity)
+        return [severities[code] for code in self.severity_codes.tolist()]
+
+    def prediction(self, row: int) -> classification.Prediction:
+        """Renders the full prediction of a CNV, identical to the one from MarCNVClassifier.classify."""
+        view = self._views[row]
+        duplication = bool(self.columns.is_duplication[row])
+        protein_genes = int(self.columns.protein_genes[row])
+        table = criterion.get_acmg_criteria(duplication)
+        sections = [
+            ("1", acmg_classify.decide_section1(protein_genes, int(self.columns.enhancers[row]))),
+            # the option decided by the columns is the one of the section 2 plan, which renders its reason
+            ("2", self.section2[row] if row in self.section2 else acmg_classify.decide_section2(view)),
+            ("3", acmg_classify.decide_section3(protein_genes, duplication)),
+            ("4", acmg_classify.decide_section4(view.cnv.genomic_coord, view.get_common_variability_regions())),
+            ("5", acmg_classify.decide_section5()),
+        ]
+        return classification.Prediction(
+            score=float(self.scores[row]),
+            criteria=[
+                acmg_classify.build_section_result(table, section, option, str(reason))
+                for section, (option, reason) in sections
+            ],
+        )
+
+    def predictions(self) -> list[classification.Prediction]:
+        return [self.prediction(row) for row in range(len(self._views))]
+
+
+def _section_scores(options: "npt.NDArray[np.str_]", is_duplication: "npt.NDArray[np.bool_]") -> "npt.NDArray[Any]":
+    np = _import_numpy()
+    scores = np.zeros(len(options), dtype=np.float64)
+    for duplication in (True, False):
+        table = criterion.get_acmg_criteria(duplication)
+        rows = is_duplication == duplication
+        for option in np.unique(options[rows]).tolist():
+            points = table[option].suggested_points
+            scores[rows & (options == option)] = points if points is not None else 0
+    return scores
+
+
+# rows of the section 2 plan, decided by the HI gene transcripts of each gene
+_PLAN = ""
+
+
+def _decide_section2(
+    columns: CohortColumns, views: Sequence[annotation_view.AnnotationView]
+) -> tuple["npt.NDArray[np.str_]", dict[int, tuple[str, acmg_classify.Reason]]]:
+    """Decides section 2 on the columns as DUPLICATION_PLAN and DELETION_PLAN do: the option of the first stopping
+    rule that holds, otherwise of the first "continue evaluation" rule. The deletions reaching the HI gene transcript
+    rules (2C-2E) are decided by the plan of their CNV; their options and reasons are returned by row."""
+    np = _import_numpy()
+    count = columns.section2_counts
+    dup, dele = columns.is_duplication, ~columns.is_duplication
+    spanning = columns.benign_spanning > 0
+    benign = count["benign_cnvs"] > 0
+
+    rules = [
+        # stopping rules of duplications
+        (dup & ((count["ts_regions_inside"] > 0) | (count["ts_genes_inside"] > 0)), "2A"),
+        (dup & (count["ts_regions_any"] > 0), "2B"),
+        (dup & columns.benign_identical, "2C"),
+        (dup & spanning & (count["protein_genes_on_breakpoints"] == 0), "2D"),
+        (dup & columns.benign_contained, "2F"),
+        (dup & (count["hi_genes_spanning"] > 0), "2I"),
+        # stopping rules of deletions
+        (dele & ((count["hi_regions_inside"] > 0) | (count["hi_genes_inside"] > 0)), "2A"),
+        (dele & (count["hi_genes_any"] > 0), _PLAN),
+        (dele & (count["hi_regions_any"] > 0), "2B"),
+        (dele & spanning, "2F"),
+        (dele & (count["high_risk_genes"] > 0), "2H"),
+        # "continue evaluation" rules
+        (dup & spanning, "2E"),
+        (dup & benign, "2G"),
+        (dup & (count["hi_genes_inside"] > 0), "2H"),
+        (dup & (count["hi_genes_on_breakpoints"] > 0), "2J"),
+        (dup & (count["genes_on_breakpoints"] > 0), "2L"),
+        (dele & benign, "2G"),
+    ]
+    options = np.select([mask for mask, _ in rules], [option for _, option in rules], default="2Skip").astype(object)
+    decided = {row: acmg_classify.decide_section2(views[row]) for row in np.flatnonzero(options == _PLAN).tolist()}
+    for row, (option, _) in decided.items():
+        options[row] = option
+    return options.astype(np.str_), decided
+
+
+def classify_cohort(annots: Sequence[annotation.Annotation]) -> CohortResult:
+    """Classifies a cohort of CNVs with the sections, final scores and severities evaluated as arrays.
+
+    Section 2 is decided on the columns, only the deletions reaching the HI gene transcript rules are evaluated per
+    CNV. No reason is rendered until CohortResult.prediction(s).
+    """
+    np = _import_numpy()
+    views = [annotation_view.AnnotationView(annot) for annot in annots]
+    columns = CohortColumns.from_views(views)
+    dup = columns.is_duplication
+    section2_options, section2 = _decide_section2(columns, views)
+
+    thresholds = np.where(dup[:, None], core.DUPLICATION_GENES_THRESHOLDS, core.DELETION_GENES_THRESHOLDS)
+    options = {
+        "1": np.where(columns.protein_genes + columns.enhancers == 0, "1B", "1A"),
+        "2": section2_options,
+        "3": np.where(
+            columns.protein_genes < thresholds[:, 0],
+            "3A",
+            np.where(columns.protein_genes < thresholds[:, 1], "3B", "3C"),
+        ),
+        "4": np.where(columns.common_variability >= 1, "4O", "4Skip"),
+        "5": np.full(len(views), "5F"),
+    }
+
+    # summed in the section order, as in MarCNVClassifier.classify, so that the floats are identical
+    total = np.zeros(len(views), dtype=np.float64)
+    for section, section_options in options.items():
+        total = total + _section_scores(section_options, dup)
+    # python rounding, numpy rounds differently in the last digit
+    scores = np.array([round(score, 8) for score in total.tolist()], dtype=np.float64)
+    severity_codes = np.searchsorted(classification.SEVERITY_THRESHOLDS, scores, side="right")
+
+    return CohortResult(
+        columns=columns,
+        options=options,
+        scores=scores,
+        severity_codes=severity_codes,
+        section2=section2,
+        _views=views,
+    )
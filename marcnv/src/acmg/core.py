@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass, field
 
 SRC_DIR = os.path.abspath(os.path.dirname(__file__))
 
@@ -11,3 +12,25 @@ DELETION_GENES_THRESHOLDS = (25, 35)
 
 HI_TS_SCORES = [3]
 MIN_FREQUENCY_BENIGN = 0.005
+
+
+@dataclass(frozen=True)
+class Parameters:
+    """Values of the ACMG criteria constants used by a classification, by default the module constants."""
+
+    hi_ts_scores: tuple[int, ...] = field(default_factory=lambda: tuple(HI_TS_SCORES))
+    min_frequency_benign: float = field(default_factory=lambda: MIN_FREQUENCY_BENIGN)
+    duplication_genes_thresholds: tuple[int, int] = field(default_factory=lambda: DUPLICATION_GENES_THRESHOLDS)
+    deletion_genes_thresholds: tuple[int, int] = field(default_factory=lambda: DELETION_GENES_THRESHOLDS)
+
+    def __post_init__(self) -> None:
+        # hashable, so that configurations can be compared and grouped
+        object.__setattr__(self, "hi_ts_scores", tuple(self.hi_ts_scores))
+        for name in ("duplication_genes_thresholds", "deletion_genes_thresholds"):
+            thresholds = tuple(getattr(self, name))
+            if len(thresholds) != 2 or thresholds[0] > thresholds[1]:
+                raise ValueError(f"{name} must be two increasing numbers of genes, got {thresholds}")
+            object.__setattr__(self, name, thresholds)
+
+    def genes_thresholds(self, duplication: bool) -> tuple[int, int]:
+        return self.duplication_genes_thresholds if duplication else self.deletion_genes_thresholds
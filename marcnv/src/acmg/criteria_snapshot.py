@@ -0,0 +1,101 @@
+# Generated by `python -m marcnv.src.acmg.criterion` from the ACMG criteria TSV files. Do not edit.
+# The tables are used only while the checksums match the TSV files, otherwise the TSV files are parsed.
+
+GAIN = (
+    'fc09193445bbfca957de960b8a4d729b92b5139fd27e7a6da22ca2aa1faebb1d',
+    (
+        ('1A', 'Copy Number Gain Content (For intragenic variants, use section 2I)', '', '1A. Contains protein-coding or other known functionally important elements', 0.0, 0.0, 0.0, 'The CNV contains or overlaps protein-coding genes or other known functionally important elements.'),
+        ('1B', 'Copy Number Gain Content (For intragenic variants, use section 2I)', '', '1B. Does NOT contain protein-coding or any known functionally important elements', -0.6, -0.6, -0.6, 'The CNV is completely void of gene content, including intronic sequence, repetitive elements or pseudogenes. In these scenarios, there may not be any evidence to interrogate about the genomic region, as no genes are present. With no evidence supporting or refuting pathogenicity, the default classification should be one of uncertainty, which is reflected in the recommended default score.  Additional information, however, could move a CNV like this toward either pathogenic (P) or benign (B) as appropriate. Inheritance information from the family being studied (considered in Section 5) could be used to classify this type of CNV as likely benign (LB) or benign (B). However, the possible presence of functionally important elements, such as promoters, enhancers, or other regulatory regions near coding sequence, should be considered with clinical correlation for possible effects on gene expression. In addition, given that CNV breakpoints are not precisely mapped due to gaps in probe or bait coverage, it is important to consider all genes in the maximum CNV interval before presuming a CNV to be clinically benign (even though reporting is often done on the minimal interval only). Further evaluation may be necessary to clarify the genomic content of the CNV for appropriate clinical interpretation. Generally, it is acceptable to adopt a laboratory policy not to report these CNVs or report them in a supplemental list, as there is no relevant literature to interrogate. An exception might be made if the CNV exceeds a size cutoff established by the laboratory.'),
+        ('2Skip', '', '', '2Skip. Skip if the copy number gain does not overlap these types of genes/regions', 0.0, 0.0, 0.0, 'DOES NOT overlap established triplosensitive (TS), haploinsufficient (HI), or benign genes or genomic regions'),
+        ('2A', 'Overlap with ESTABLISHED TS genes or genomic regions', '', '2A. Complete overlap; the TS gene or minimal critical region is fully contained within the observed copy number gain', 1.0, 0.0, 1.0, 'The CNV completely contains established dosage sensitive genes or genomic regions.'),
+        ('2B', 'Overlap with ESTABLISHED TS genes or genomic regions', '', '2B. Partial overlap of an established TS region: The observed CNV does NOT contain the known causative gene or critical region for this established TS genomic region OR Unclear if the known causative gene or critical region is affected OR No specific causative gene or critical region has been established for this TS genomic region', 0.0, 0.0, 0.0, 'The CNV partially overlaps an established dosage sensitive genomic region, further evaluation is required to determine whether the causative gene or critical region for the established region is known. If the critical gene/region has not yet been established, additional evidence will be necessary to determine the clinical relevance of the CNV under evaluation. For example, though the clinical significance of the 1p36 deletion (MIM: 607872) has been appreciated for some time, there is still no established causative gene or critical region; deletions overlapping (but not completely encompassing this region) would fall under category 2B, and would require further evidence to determine their classification and clinical significance.'),
+        ('2C', 'Overlap with ESTABLISHED benign copy number gain genes or genomic regions', '', '2C. Identical in gene content to the established benign copy number gain', -1.0, -1.0, 0.0, "If the CNV under evaluation overlaps with 'established benign' genes or genomic regions; In general, these are CNVs that occur at high frequency in the general population (1% or higher), are not known to be more frequent in cases compared to controls and are not associated with any consistent phenotype. When a CNV under evaluation is contained completely within one of these genes/regions, it may be considered 'benign'."),
+        ('2D', 'Overlap with ESTABLISHED benign copy number gain genes or genomic regions', '', '2D. Smaller than established benign copy number gain, breakpoint(s) does not interrupt protein-coding genes', -1.0, -1.0, 0.0, "If the CNV under evaluation overlaps with 'established benign' genes or genomic regions; In general, these are CNVs that occur at high frequency in the general population (1% or higher), are not known to be more frequent in cases compared to controls and are not associated with any consistent phenotype. When a CNV under evaluation is contained completely within one of these genes/regions, it may be considered 'benign'."),
+        ('2E', 'Overlap with ESTABLISHED benign copy number gain genes or genomic regions', '', '2E. Smaller than established benign copy number gain, breakpoint(s) potentially interrupts protein-coding gene', 0.0, 0.0, 0.0, "If the CNV under evaluation overlaps with 'established benign' genes or genomic regions; In general, these are CNVs that occur at high frequency in the general population (1% or higher), are not known to be more frequent in cases compared to controls and are not associated with any consistent phenotype. When a CNV under evaluation is smaller than established benign copy number gain and breakpoint(s) potentially interrupts protein-coding gene, an additional evaluation is necessary."),
+        ('2F', 'Overlap with ESTABLISHED benign copy number gain genes or genomic regions', '', '2F. Larger than known benign copy number gain, does not include additional protein-coding genes', -0.9, -1.0, 0.0, "If the CNV under evaluation overlaps with 'established benign' genes or genomic regions; In general, these are CNVs that occur at high frequency in the general population (1% or higher), are not known to be more frequent in cases compared to controls and are not associated with any consistent phenotype. When a CNV under evaluation is contained completely within one of these genes/regions, it may be considered 'benign'."),
+        ('2G', 'Overlap with ESTABLISHED benign copy number gain genes or genomic regions', '', '2G. Overlaps a benign copy number gain but includes additional genomic material', 0.0, 0.0, 0.0, 'If the CNV under evaluation overlaps an established benign gene/region but is larger, it may contain clinically relevant genes or functionally important elements (such as regulatory regions for nearby HI genes), and additional evaluation is recommended.'),
+        ('2H', 'Overlap with ESTABLISHED HI gene(s)', '', '2H. HI gene fully contained within observed copy number gain', 0.0, 0.0, 0.0, "For the purposes of this framework, 'established dosage sensitive' genes or genomic regions are those that have been evaluated and shown to have sufficient evidence for HI and/or TS (i.e., a score of 1,2, or 3) in the Dosage Sensitivity Map, a publicly available resource cataloging evidence supporting and/or refuting the role of dosage sensitivity for genes and genomic regions."),
+        ('2I', 'Breakpoint(s) within ESTABLISHED HI genes', '', '2I. Both breakpoints are within the same gene (gene-level sequence variant, possibly resulting in loss of function (LOF))', None, 0.0, 0.9, 'Smaller, intragenic variants may be evaluated similarly to sequence-level variants. Intragenic duplication; one must consider: whether or not the duplication is in tandem; if the reading frame is disrupted; and if nonsense-mediated decay (NMD) is predicted to occur. Duplications affecting individual genes are typically expected to be in tandem rather than as insertions or translocations elsewhere in the genome. Partial-gene duplications including terminal coding exons, i.e., either the first or last exons, of any type of gene are also often not deleterious because functional gene structure may be preserved.  In contrast, duplications with breakpoints entirely within a gene and not involving terminal exons can be deleterious because they can disrupt the reading frame or splicing. In specific cases, it is essential to accurately determine the reading frame because it has known clinical implications (e.g., distinguishing between Duchenne and Becker muscular dystrophy). See ClinGen SVI working group PVS1 specifications: PVS1=0.90 (Range: 0.45 to 0.90); PVS1_Strong=0.45 (Range: 0.30 to 0.90); N/A=0 (Continue Evaluation).'),
+        ('2J', 'Breakpoint(s) within ESTABLISHED HI genes', '', '2J. One breakpoint is within an established HI gene, patients phenotype is either inconsistent with what is expected for LOF of that gene OR unknown', 0.0, 0.0, 0.0, 'If the CNV partially overlaps a curated HI or TS gene, additional evaluation to determine the potential functional effect is required based on breakpoint location, involvement of coding sequence (for partial gene deletion/duplication) and evidence from the literature.'),
+        ('2K', 'Breakpoint(s) within ESTABLISHED HI genes', '', '2K. One breakpoint is within an established HI gene, patients phenotype is highly specificand consistent with what is expected for LOF of that gene', 0.45, 0.0, 0.45, 'If the CNV partially overlaps a curated HI or TS gene, additional evaluation to determine the potential functional effect is required based on breakpoint location, involvement of coding sequence (for partial gene deletion/duplication) and evidence from the literature.'),
+        ('2L', 'Breakpoints within other gene(s)', '', '2L. One or both breakpoints are within gene(s) of no establishedclinical significance', 0.0, 0.0, 0.0, 'If one or both breakpoints are within gene(s) of no established clinical significance, an additional evaluation is necessary.'),
+        ('3A', 'Number of protein-coding RefSeq genes wholly or partially included in the copy number gain', '', '3A. 0-34 genes', 0.0, 0.0, 0.0, 'We recommend counting each cluster/family as a single gene. Exceptions include gene families in which individual genes are known to be associated with disease (such as the SCN gene cluster region at 2q24.3); in these cases, the disease genes may be counted individually.'),
+        ('3B', 'Number of protein-coding RefSeq genes wholly or partially included in the copy number gain', '', '3B. 35-49 genes', 0.45, 0.45, 0.45, 'We recommend counting each cluster/family as a single gene. Exceptions include gene families in which individual genes are known to be associated with disease (such as the SCN gene cluster region at 2q24.3); in these cases, the disease genes may be counted individually.'),
+        ('3C', 'Number of protein-coding RefSeq genes wholly or partially included in the copy number gain', '', '3C. 50 or more genes', 0.9, 0.9, 0.9, 'We recommend counting each cluster/family as a single gene. Exceptions include gene families in which individual genes are known to be associated with disease (such as the SCN gene cluster region at 2q24.3); in these cases, the disease genes may be counted individually.'),
+        ('4Skip', '', '', 'Skip if there have been no reports associating either the copy number gain or any of the genes therein with human phenotypes caused by triplosensitivity', 0.0, 0.0, 0.0, 'There have been no reports associating either the copy-number gain or any of the genes therein with human phenotypes caused by triplosensitivity.'),
+        ('4', 'Individual case evidence  de novo occurrences', '', 'Reported proband has either: complete duplication of one or more genes within the observed copy number gain OR an overlapping copy number gain similar in genomic content to the observed copy number gain AND...', None, None, None, ''),
+        ('4A', 'Individual case evidence  de novo occurrences', '4', '4A. ...the reported phenotype is highly specific and relatively unique to the gene or genomic region', 0.45, 0.0, 0.9, "'Highly specific, well-defined' phenotypes (those with pathognomonic features for a specific condition) include congenital anomalies (e.g., skeletal dysplasias, midline facial defects, holoprosencephaly, etc.) or a constellation of findings (e.g., coloboma, heart defects, choanal atresia, growth delays, genital anomalies, and ear abnormalities associated with CHARGE syndrome (MIM:214800)). If parental relationships are assumed but not confirmed (i.e., both maternity and paternity have been confirmed), relative strength is decreased, and points are subsequently reduced. When the gene(s) being assessed are of known clinical significance, points should be assigned for each reported de novo observation. Confirmed de novo: 0.45 points each; Assumed de novo: 0.30 points each; (Range: 0.15 to 0.45)."),
+        ('4B', 'Individual case evidence  de novo occurrences', '4', '4B. ...the reported phenotype is consistent with the gene/genomic region, is highly specific, but not necessarily unique to the gene/genomic region', 0.3, 0.0, 0.9, 'This scenario may include phenotypes that are relatively rare in the general population but may also be associated with more than one known genetic cause, such as early infantile epileptic encephalopathy. If parental relationships are assumed but not confirmed (i.e., both maternity and paternity have been confirmed), relative strength is decreased, and points are subsequently reduced. When the gene(s) being assessed are of known clinical significance, points should be assigned for each reported de novo observation. Confirmed de novo: 0.30 points each; Assumed de novo: 0.15 points each; (Range: 0 to 0.45).'),
+        ('4C', 'Individual case evidence  de novo occurrences', '4', '4C. ...the reported phenotype is consistent with the gene/genomic region, but not highly specific and/or with high genetic heterogeneity', 0.15, 0.0, 0.9, "This may include e.g., intellectual disability, autism spectrum disorder, etc. If parental relationships are assumed but not confirmed (i.e., both maternity and paternity have been confirmed), relative strength is decreased, and points are subsequently reduced. When the gene(s) being assessed are of known clinical significance, points should be assigned for each reported de novo observation. When the gene(s) being assessed are of unknown clinical significance, the expected phenotype associated with the gene is unknown. In this scenario, consistency of the observed phenotypes with each other, as well as their relative specificity is critical. Because there is no 'expected' phenotype against which to compare, there must be at least two de novo cases with similar phenotypes before evidence can be counted. Each additional case observed with a consistent phenotype may be awarded additional points. Confirmed de novo: 0.15 point each; Assumed de novo: 0.10 points each; (Range: 0 to 0.30)."),
+        ('4D', 'Individual case evidence - inconsistent phenotype', '4', '4D. ...the reported phenotype is NOT consistent with what is expected for the gene/genomic region or not consistent in general', 0.0, -0.3, 0.0, 'Clinical judgement should be used to determine if this should result in 0 added points to the evaluation, or negative point values (i.e., evidence against a role in pathogenicity). Negative point values could be considered with increasing evidence of inconsistency. For example, consider a de novo deletion of a particular gene or genomic region reported twice in the literature - once in a seven-year-old with developmental delay, and once in a newborn with a congenital anomaly. Though the reported phenotypes are not the same, there is not enough information here to constitute evidence against a role in pathogenicity - the newborn may ultimately go on to be diagnosed with developmental delay, and it may be unclear whether the older child was assessed for the congenital anomaly. A scenario like this may warrant 0 points. Next consider a scenario in which de novo deletions have been observed in 5 cases in the literature - all in well-phenotyped, older individuals - 1 with developmental delay, 1 with a history of cardiac defect and normal development, 1 with a history of genitourinary anomalies and normal development, and 2 in individuals from the general population.  In this scenario, with such disparate phenotypes and reasonable confidence that there are no overlapping phenotypes, negative points may be assigned. 0 points each; (Range: 0 to -0.30).'),
+        ('4E', 'Individual case evidence  unknown inheritance', '', '4E. Reported proband has a highly specific phenotype consistent with the gene/genomic region, but the inheritance of the variant is unknown.', 0.1, 0.0, 0.3, 'Occasionally, particularly in older literature, there are probands with compelling phenotypes and CNVs similar in genomic content to the CNV under evaluation but without inheritance information. It is recommended that these types of cases only be included as evidence if the phenotype in the proband is highly specific and consistent with that of other probands for which inheritance is known, and only be assigned a minimal number of points. These types of cases should not be used in the setting of nonspecific phenotypes (e.g., developmental delay or autism spectrum disorder). 0.10 points each; (Range: 0 to 0.15).'),
+        ('4F', 'Individual case evidence  segregation among similarly affected family members', '', '4F. 3-4 observed segregations', 0.15, 0.15, 0.15, ''),
+        ('4G', 'Individual case evidence  segregation among similarly affected family members', '', '4G. 5-6 observed segregations', 0.3, 0.3, 0.3, ''),
+        ('4H', 'Individual case evidence  segregation among similarly affected family members', '', '4H. 7 or more observed segregations', 0.45, 0.45, 0.45, ''),
+        ('4I', 'Individual case evidence - Non-Segregations', '', '4I. Variant is NOT found in another individual in the probands family AFFECTED with a consistent, specific, well-defined phenotype (no known phenocopies)', -0.45, -0.9, 0.0, 'Interpret with caution. Consider whether there may be a biologically plausible explanation for this non-segregation, such as the presence of phenocopies. This scenario is more likely to occur in the setting of disorders that are more common in the general population (for example, breast cancer) and/or disorders that are known to have both genetic and non-genetic causes (for example, cardiomyopathy). Assign the default number of negative points (-0.45) when the individuals in the family are affected with similar, highly specific phenotypes (with no known phenocopies) and are not found to carry the same variant. Consider downgrading this evidence when phenocopies are a possibility. -0.45 points per family; (Range: 0 to -0.45).'),
+        ('4J', 'Individual case evidence - Non-Segregations', '', '4J. Variant IS found in another individual in the probands family UNAFFECTED with the specific, well-defined phenotype observed in the proband', -0.3, -0.9, 0.0, 'Interpret with caution. Consider whether the family member found to have the variant is truly unaffected. Truly affected individuals may appear to be unaffected in the context of variable expressivity, reduced or age-dependent penetrance, disorders with subtle clinical manifestations, incomplete clinical evaluation, or novel disorders in which the phenotypic spectrum has not yet been well characterized. For example: the phenotype under investigation is specific and well-defined, such as a rare eye phenotype only appreciable with dilated eye examination. If the family member were evaluated by an ophthalmologist with dilated eye exam and found not to have said eye phenotype, assign the default number of negative points for a family member with the variant but unaffected with the specific, well-defined phenotype. If the family member were evaluated by a general practitioner, and it is unclear whether a dilated eye exam was performed, consider downgrading this evidence. In this scenario, 0 points may be appropriate if a dilated eye exam was not performed; there would be no way to know whether this individual was truly unaffected or not without this study. -0.30 points per family; (Range: 0 to -0.30).'),
+        ('4K', 'Individual case evidence - Non-Segregations', '', '4K. Variant IS found in another individual in the probands family UNAFFECTED with the non-specific phenotype observed in the proband', -0.15, -0.3, 0.0, 'Interpret with caution. Consider whether the family member found to have the variant is truly unaffected. Truly affected individuals may appear to be unaffected in the context of variable expressivity, reduced or age-dependent penetrance, disorders with subtle clinical manifestations, incomplete clinical evaluation, or novel disorders in which the phenotypic spectrum has not yet been well characterized. If the family member were thoroughly evaluated and said to be unaffected, consider awarding the default number of negative points for a family member with the variant but unaffected with a non-specific phenotype. Consider downgrading or not awarding any negative points at all if, for example, that family member is simply stated in a publication not to be affected, but no details of their evaluation are provided. -0.15 points per family; (Range: 0 to -0.15)'),
+        ('4L', 'Case-control and population evidence', '', '4L. Statistically significantincrease amongst observations in cases (with a consistent, specific, well-defined phenotype) compared to controls', 0.45, 0.0, 0.45, "If the CNV has been studied as part of a well-powered case-control study with adequate numbers of cases and controls, points may be added or deducted based on enrichment (or lack thereof) in the clinical population. Interpretation of case-control data should include evaluation of significance (i.e. p-value), effect size (e.g. likelihood ratio), and clinical information (e.g. phenotypic specificity). Similar to categories defined for sequence variants, CNVs in this category will be observed at a significantly higher frequency in cases versus controls (p< 0.05), and with a strong effect size (odds ratio or likelihood ratio >5) and relatively narrow associated 95% confidence interval (lower bound >1). In general, probands with similar, highly specific, well-defined phenotypes represent stronger evidence than probands with disparate or non-specific phenotypes. For the purposes of this framework, 'highly specific, well-defined' phenotypes are those that are both distinct and have a known genetic etiology with limited genetic heterogeneity. Examples of 'highly specific, well-defined' phenotypes include congenital anomalies (e.g., skeletal dysplasias, midline facial defects, holoprosencephaly, etc.) or a constellation of findings (e.g., coloboma, heart defects, choanal atresia, growth delays, genital anomalies, and ear abnormalities associated with CHARGE syndrome (MIM:214800)). 0.45 per study (Range: 0 to 0.45 per study)."),
+        ('4M', 'Case-control and population evidence', '', '4M. Statistically significantincrease amongst observations in cases (without a consistent, non-specific phenotype OR unknown phenotype) compared to controls', 0.3, 0.0, 0.45, "If the CNV has been studied as part of a well-powered case-control study with adequate numbers of cases and controls, points may be added or deducted based on enrichment (or lack thereof) in the clinical population. Interpretation of case-control data should include evaluation of significance (i.e. p-value), effect size (e.g. likelihood ratio), and clinical information (e.g. phenotypic specificity). Similar to categories defined for sequence variants, CNVs in this category will be observed at a significantly higher frequency in cases versus controls (p< 0.05), and with a strong effect size (odds ratio or likelihood ratio >5) and relatively narrow associated 95% confidence interval (lower bound >1). 'Non-specific' phenotypes are those that may be more common in the general population, have more considerable genetic heterogeneity, and/or can be caused by etiologies other than genetic variation. Examples of 'non-specific' phenotypes include autism spectrum disorder and intellectual disability.  Inheritance information, when available, can be used to modify the strength of case-level evidence. 0.30 per study (Range:0 to 0.30 per study)."),
+        ('4N', 'Case-control and population evidence', '', '4N. No statistically significant difference between observations in cases and controls', -0.9, -0.9, 0.0, 'If the CNV has been studied as part of a well-powered case-control study with adequate numbers of cases and controls, points may be added or deducted based on enrichment (or lack thereof) in the clinical population. Interpretation of case-control data should include evaluation of significance (i.e. p-value), effect size (e.g. likelihood ratio), and clinical information (e.g. phenotypic specificity). Similar to categories defined for sequence variants, CNVs in this category will be observed at a significantly higher frequency in cases versus controls (p< 0.05), and with a strong effect size (odds ratio or likelihood ratio >5) and relatively narrow associated 95% confidence interval (lower bound >1). Alternatively, CNVs that are not enriched are observed at similar (or higher) frequencies in controls compared to cases, may be deducted points, particularly when such CNVs are also relatively common e.g. >0.1% frequency. -0.90 (per study) (Range:0 to -0.90 per study).'),
+        ('4O', 'Case-control and population evidence', '', '4O. Overlap with common population variation', -1.0, -1.0, 0.0, "CNV may be considered 'common' in the general population if it is present at a frequency of 1% or greater in the DGV Gold Standard dataset (or other high confidence dataset). Consider assigning less weight if a variant is observed in the general population, but at a frequency lower than 1%. Note that expected carrier frequencies associated with autosomal recessive diseases may be higher than 1%; do not use this criterion to classify a CNV as 'benign' if there is a well-known autosomal recessive disease gene (for which loss of function is the established disease mechanism) in the interval. Consider downgrading if there are reasons to question the reported population frequency of a variant."),
+        ('5A', 'Observed copy number gain is DE NOVO', '', '5A. Use appropriate category from de novo scoring section in Section 4.', None, 0.0, 0.45, 'Use de novo scoring categories from Section 4 (4A-4D) to determine score.'),
+        ('5B', 'Observed copy number gain is INHERITED', '', '5B. Patient with specific, well-defined phenotype and no family history. CNV is inherited from an apparently unaffected parent.', -0.3, -0.45, 0.0, 'When a CNV is found in a parent or other relative, the carrier parent and other relevant family members should have a thorough medical evaluation for the presence or absence of the clinical features present in the proband. When this information is not provided to the laboratory, this should be included in the report with a recommendation for correlation with parental clinical features. Do not add or deduct points for inheritance from a parent if the affected status of that parent is unknown.'),
+        ('5C', 'Observed copy number gain is INHERITED', '', '5C. Patient with non-specific phenotype and no family history. CNV is inherited from an apparently unaffected parent.', -0.15, -0.3, 0.0, 'When a CNV is found in a parent or other relative, the carrier parent and other relevant family members should have a thorough medical evaluation for the presence or absence of the clinical features present in the proband. When this information is not provided to the laboratory, this should be included in the report with a recommendation for correlation with parental clinical features. Do not add or deduct points for inheritance from a parent if the affected status of that parent is unknown.'),
+        ('5D', 'Observed copy number gain is INHERITED', '', '5D. CNV segregates with a consistent phenotype observed in the patients family.', 0.0, 0.0, 0.45, 'When a CNV is found in a parent or other relative, the carrier parent and other relevant family members should have a thorough medical evaluation for the presence or absence of the clinical features present in the proband. When this information is not provided to the laboratory, this should be included in the report with a recommendation for correlation with parental clinical features. Do not add or deduct points for inheritance from a parent if the affected status of that parent is unknown. Use segregation scoring categories from Section 4 (4F-4H) to determine score.'),
+        ('5E', 'Observed copy number gain  NON-SEGREGATIONS', '', '5E. Use appropriate category from non-segregation section in Section 4.', 0.0, -0.45, 0.0, 'Use non-segregation scoring categories from Section 4 (4I-4K) to determine score.'),
+        ('5F', 'Other', '', '5F. Inheritance information is unavailable or uninformative.', 0.0, 0.0, 0.0, 'If inheritance information is unknown or uninformative (for example, only one parent is available for follow-up, and the CNV is not found in the parent available for study), and no information is known about the patient phenotype, no points can be awarded.'),
+        ('5G', 'Other', '', '5G. Inheritance information is unavailable or uninformative. The patient phenotype is non-specific, but is consistent with what has been described in similar cases.', 0.1, 0.0, 0.15, "Points may be assigned depending upon the relative specificity of the phenotype. In general, cases under evaluation by the clinical laboratory should be scored in a similar manner to relevant cases observed in the scientific literature (e.g., de novo cases scored similarly to literature de novo cases, inherited cases scored similarly to other cases with the same inheritance pattern, etc.). The ranges allow the laboratory to upgrade or downgrade evidence from their observed case based upon their presumed ability to obtain more detailed clinical information, including pertinent negatives (e.g., phenotypes reported in the literature that the patient under evaluation has been determined NOT to have), from the referring clinician, something that is typically not possible in literature cases. If this is not possible, or if any questions remain about how well a patient's phenotype matches with what has been previously described, score as you would an additional case observed in the literature."),
+        ('5H', 'Other', '', '5H. Inheritance information is unavailable or uninformative. The patient phenotype is highly specific and consistent with what has been described in similar cases.', 0.15, 0.0, 0.3, "Points may be assigned depending upon the relative specificity of the phenotype. In general, cases under evaluation by the clinical laboratory should be scored in a similar manner to relevant cases observed in the scientific literature (e.g., de novo cases scored similarly to literature de novo cases, inherited cases scored similarly to other cases with the same inheritance pattern, etc.). The ranges allow the laboratory to upgrade or downgrade evidence from their observed case based upon their presumed ability to obtain more detailed clinical information, including pertinent negatives (e.g., phenotypes reported in the literature that the patient under evaluation has been determined NOT to have), from the referring clinician, something that is typically not possible in literature cases. If this is not possible, or if any questions remain about how well a patient's phenotype matches with what has been previously described, score as you would an additional case observed in the literature."),
+    ),
+)
+LOSS = (
+    '334ec3f9e6fa5a4479093bbfe38da538769748f2dff37cf5476f18e590fb02f0',
+    (
+        ('1A', 'Copy number loss content (For intragenic variants, use section 2E)', '', '1A. Contains protein-coding or other known functionally important elements', 0.0, 0.0, 0.0, 'The CNV contains or overlaps protein-coding genes or other known functionally important elements.'),
+        ('1B', 'Copy number loss content (For intragenic variants, use section 2E)', '', '1B. Does NOT contain protein-coding or any known functionally important elements', -0.6, -0.6, -0.6, 'The CNV is completely void of gene content, including intronic sequence, repetitive elements or pseudogenes. In these scenarios, there may not be any evidence to interrogate about the genomic region, as no genes are present. With no evidence supporting or refuting pathogenicity, the default classification should be one of uncertainty, which is reflected in the recommended default score.  Additional information, however, could move a CNV like this toward either pathogenic (P) or benign (B) as appropriate. Inheritance information from the family being studied (considered in Section 5) could be used to classify this type of CNV as likely benign (LB) or benign (B). However, the possible presence of functionally important elements, such as promoters, enhancers, or other regulatory regions near coding sequence, should be considered with clinical correlation for possible effects on gene expression. In addition, given that CNV breakpoints are not precisely mapped due to gaps in probe or bait coverage, it is important to consider all genes in the maximum CNV interval before presuming a CNV to be clinically benign (even though reporting is often done on the minimal interval only). Further evaluation may be necessary to clarify the genomic content of the CNV for appropriate clinical interpretation. Generally, it is acceptable to adopt a laboratory policy not to report these CNVs or report them in a supplemental list, as there is no relevant literature to interrogate. An exception might be made if the CNV exceeds a size cutoff established by the laboratory.'),
+        ('2Skip', '', '', 'Skip to Section 3 if your copy number loss DOES NOT overlap these types of genes/regions', 0.0, 0.0, 0.0, 'DOES NOT overlap established/predicted haploinsufficiency (HI) or established benign genes/genomic regions'),
+        ('2A', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '', '2A. Complete overlap of an established HI gene/genomic region', 1.0, 0.0, 1.0, 'The CNV completely contains established dosage sensitive genes or genomic regions.'),
+        ('2B', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '', '2B. Partial overlap of an established HI genomic region. The observed CNV does NOT contain the known causative gene or critical region for this established HI genomic region OR Unclear if known causative gene or critical region is affected OR No specific causative gene or critical region has been established for this HI genomic region (e.g. 1p36 deletion)', 0.0, 0.0, 0.0, 'The CNV partially overlaps an established dosage sensitive genomic region, further evaluation is required to determine whether the causative gene or critical region for the established region is known. If the critical gene/region has not yet been established, additional evidence will be necessary to determine the clinical relevance of the CNV under evaluation. For example, though the clinical significance of the 1p36 deletion (MIM: 607872) has been appreciated for some time, there is still no established causative gene or critical region; deletions overlapping (but not completely encompassing this region) would fall under category 2B, and would require further evidence to determine their classification and clinical significance.'),
+        ('2C', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '', '2C. Partial overlap with the 5 end of an established HI gene (3 end of the gene not involved)...', None, None, None, 'If the CNV partially overlaps a curated HI or TS gene, additional evaluation to determine the potential functional effect is required based on breakpoint location, involvement of coding sequence (for partial gene deletion/duplication), and evidence from the literature.'),
+        ('2C-1', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '2C', '2C-1. ... and coding sequence is involved', 0.9, 0.0, 1.0, "Scoring should be based on the likelihood that a functional protein could still be produced. Deletions that include 5' UTR exons, first coding exons, or internal exons are typically deleterious in LOF genes. If the gene has alternative in-frame methionine downstream of the deletion, or if an alternatively spliced isoform is not encompassed by the deletion, consider downgrading from the suggested default number of points. If a significant portion of the gene is deleted, or if a known functional domain is deleted, consider upgrading the suggested default number of points. If the deletion only involves the 5' UTR, but the promoter is well-characterized and included in the deleted interval, consider upgrading the suggested default number of points."),
+        ('2C-2', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '2C', '2C-2. ... and only the 5 UTR is involved', 0.0, 0.0, 0.45, "The recommended default score is 0. However, there are genes in which there is evidence supporting the role of 5'UTR variants in disease, in these scenarios, it may be appropriate to upgrade the score."),
+        ('2D', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '', '2D. Partial overlap with the 3 end of an established HI gene (5 end of the gene not involved)...', None, None, None, 'If the CNV partially overlaps a curated HI or TS gene, additional evaluation to determine the potential functional effect is required based on breakpoint location, involvement of coding sequence (for partial gene deletion/duplication) and evidence from the literature.'),
+        ('2D-1', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '2D', '2D-1.  ... and only the 3 untranslated region is involved.', 0.0, 0.0, 0.0, "One must consider whether or not the resulting protein product is expected to undergo nonsense-mediated decay (NMD). Deletions that involve the last exons of a LOF gene are not universally pathogenic if amino acids in the carboxyl terminus of the encoded protein are dispensable. If only the 3' UTR is involved, the recommended default score is 0."),
+        ('2D-2', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '2D', '2D-2. ... and only the last exon is involved. Other established pathogenic variants have been reported in this exon.', 0.9, 0.0, 0.9, "If the deletion involves only the last exon, the resulting protein product is expected to escape nonsense-mediated decay (NMD). If, however, there is evidence to suggest that the last exon is critical to the protein's function (for example, if other established pathogenic variants have been documented in that exon), then such a deletion may be disease-causing. Use the scoring range to reflect the level of confidence that the last exon is critical to gene function (e.g., increasing points with increasing number of documented pathogenic variants, functional studies showing that loss of the last exon results in disrupted function, the last exon is within an established variation hotspot, etc.)."),
+        ('2D-3', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '2D', '2D-3. ... and only the last exon is involved. No other established pathogenic variants have been reported in this exon.', 0.3, 0.0, 0.45, 'If there is no evidence to suggest that the last exon is critical to the gene function (for example, no other pathogenic variants have been reported in that exon), the recommended default score is 0.30.'),
+        ('2D-4', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '2D', '2D-4. ... and it includes other exons in addition to the last exon. Nonsense-mediated decay is expected to occur.', 0.9, 0.0, 1.0, "If a deletion overlaps the 3' end of the gene and includes exons other than the last exon, nonsense-mediated decay (NMD) is expected to occur, and the recommended default score is 0.90. Consider upgrading from the default score if there is additional evidence to suggest a detrimental effect on the protein (for example, if a significant percentage of the protein is expected to be missing)."),
+        ('2E', 'Overlap with ESTABLISHED HI genes or genomic regions and consideration of reason for referral', '', '2E. Both breakpoints are within the same gene (gene-level sequence variant)', None, 0.0, 0.9, 'Smaller, intragenic variants may be evaluated similarly to sequence-level variants. Intragenic deletions; one must consider: whether or not the deletion disrupts the reading frame; whether or not the deletion is predicted to undergo nonsense-mediated decay (NMD); if the deleted exons are present in biologically-relevant transcript(s); if the truncated/altered region is critical to protein function; the frequency of LOF variants in the involved exon(s) in the general population; and the amount of protein removed by the deletion. See ClinGen SVI working group PVS1 specifications: PVS1=0.90 (Range: 0.45 to 0.90); PVS1_Strong=0.45 (Range: 0.30 to 0.90); PVS1_Moderate or PM4 (in-frame indels)=0.30 (Range: 0.15 to 0.45); PVS1_Supporting=0.15 (Range: 0 to 0.30); N/A=No points, but continue evaluation.'),
+        ('2F', 'Overlap with ESTABLISHED benign genes or genomic regions', '', '2F. Completely contained within an established benignCNV region', -1.0, -1.0, 0.0, "If the CNV under evaluation overlap with 'established benign' genes or genomic regions; In general, these are CNVs that occur at high frequency in the general population (1% or higher), are not known to be more frequent in cases compared to controls and are not associated with any consistent phenotype. When a CNV under evaluation is contained completely within one of these genes/regions, it may be considered 'benign'."),
+        ('2G', 'Overlap with ESTABLISHED benign genes or genomic regions', '', '2G. Overlaps an established benign CNV, but includes additional genomic material', 0.0, 0.0, 0.0, 'If the CNV under evaluation overlaps an established benign gene/region but is larger, it may contain clinically relevant genes or functionally important elements (such as regulatory regions for nearby HI genes), and additional evaluation is recommended.'),
+        ('2H', 'HI Predictors', '', '2H. Multiple HI predictors suggest that AT LEAST ONE gene in the interval is haploinsufficient (HI)', 0.15, 0.15, 0.15, 'In silico predictions do not need to be used for deletions that involve a gene which has been already established to cause disease due to HI or LOF (categories 2A-2E, deletion metric); use of this evidence is restricted to intervals encompassing genes of uncertain clinical significance. The points associated with this category should only be given once; do not count this piece of evidence multiple times, even if there is more than one gene in the region predicted to be HI.'),
+        ('3A', 'Number of protein-coding RefSeq genes wholly or partially included in the copy number loss', '', '3A. 0-24 genes', 0.0, 0.0, 0.0, 'We recommend counting each cluster/family as a single gene. Exceptions include gene families in which individual genes are known to be associated with disease (such as the SCN gene cluster region at 2q24.3); in these cases, the disease genes may be counted individually.'),
+        ('3B', 'Number of protein-coding RefSeq genes wholly or partially included in the copy number loss', '', '3B. 25-34 genes', 0.45, 0.45, 0.45, 'We recommend counting each cluster/family as a single gene. Exceptions include gene families in which individual genes are known to be associated with disease (such as the SCN gene cluster region at 2q24.3); in these cases, the disease genes may be counted individually.'),
+        ('3C', 'Number of protein-coding RefSeq genes wholly or partially included in the copy number loss', '', '3C. 35 or more genes', 0.9, 0.9, 0.9, 'We recommend counting each cluster/family as a single gene. Exceptions include gene families in which individual genes are known to be associated with disease (such as the SCN gene cluster region at 2q24.3); in these cases, the disease genes may be counted individually.'),
+        ('4Skip', '', '', 'Skip if either your CNV overlapped with an established HI gene/region in Section 2, OR there have been no reports associating either the CNV or any genes within the CNV with human phenotypes caused by loss of function (LOF) or copy number loss', 0.0, 0.0, 0.0, 'The CNV overlapped with an established HI gene/region in section 2, OR there have been no reports associating either the CNV or any genes within the CNV with human phenotypes caused by loss of function [LOF] or copy-number loss.'),
+        ('4', 'Individual case evidence  de novo occurrences', '', 'Reported proband has either: A complete deletion of or a LOF variant within gene encompassed by the observed copy number loss OR an overlapping copy number loss similar in genomic content to the observed copy number loss AND...', None, None, None, ''),
+        ('4A', 'Individual case evidence  de novo occurrences', '4', '4A. ...the reported phenotype is highly specific and relatively unique to the gene or genomic region', 0.45, 0.0, 0.9, "'Highly specific, well-defined' phenotypes (those with pathognomonic features for a specific condition) include congenital anomalies (e.g., skeletal dysplasias, midline facial defects, holoprosencephaly, etc.) or a constellation of findings (e.g., coloboma, heart defects, choanal atresia, growth delays, genital anomalies, and ear abnormalities associated with CHARGE syndrome (MIM:214800)). If parental relationships are assumed but not confirmed (i.e., both maternity and paternity have been confirmed), relative strength is decreased, and points are subsequently reduced. When the gene(s) being assessed are of known clinical significance, points should be assigned for each reported de novo observation. Confirmed de novo: 0.45 points each; Assumed de novo: 0.30 points each; (Range: 0.15 to 0.45)."),
+        ('4B', 'Individual case evidence  de novo occurrences', '4', '4B. ...the reported phenotype is consistent with the gene/genomic region, is highly specific, but not necessarily unique to the gene/genomic region', 0.3, 0.0, 0.9, 'This scenario may include phenotypes that are relatively rare in the general population but may also be associated with more than one known genetic cause, such as early infantile epileptic encephalopathy. If parental relationships are assumed but not confirmed (i.e., both maternity and paternity have been confirmed), relative strength is decreased, and points are subsequently reduced. When the gene(s) being assessed are of known clinical significance, points should be assigned for each reported de novo observation. Confirmed de novo: 0.30 points each; Assumed de novo: 0.15 points each; (Range: 0 to 0.45).'),
+        ('4C', 'Individual case evidence  de novo occurrences', '4', '4C. ...the reported phenotype is consistent with the gene/genomic region, but not highly specific and/or with high genetic heterogeneity', 0.15, 0.0, 0.9, "This may include e.g., intellectual disability, autism spectrum disorder, etc. If parental relationships are assumed but not confirmed (i.e., both maternity and paternity have been confirmed), relative strength is decreased, and points are subsequently reduced. When the gene(s) being assessed are of known clinical significance, points should be assigned for each reported de novo observation. When the gene(s) being assessed are of unknown clinical significance, the expected phenotype associated with the gene is unknown. In this scenario, consistency of the observed phenotypes with each other, as well as their relative specificity is critical. Because there is no 'expected' phenotype against which to compare, there must be at least two de novo cases with similar phenotypes before evidence can be counted. Each additional case observed with a consistent phenotype may be awarded additional points. Confirmed de novo: 0.15 point each; Assumed de novo: 0.10 points each; (Range: 0 to 0.30)."),
+        ('4D', 'Individual case evidence - inconsistent phenotype', '4', '4D. ...the reported phenotype is NOT consistent with what is expected for the gene/genomic region or not consistent in general', 0.0, -0.3, 0.0, 'Clinical judgement should be used to determine if this should result in 0 added points to the evaluation, or negative point values (i.e., evidence against a role in pathogenicity). Negative point values could be considered with increasing evidence of inconsistency. For example, consider a de novo deletion of a particular gene or genomic region reported twice in the literature - once in a seven-year-old with developmental delay, and once in a newborn with a congenital anomaly. Though the reported phenotypes are not the same, there is not enough information here to constitute evidence against a role in pathogenicity - the newborn may ultimately go on to be diagnosed with developmental delay, and it may be unclear whether the older child was assessed for the congenital anomaly. A scenario like this may warrant 0 points. Next consider a scenario in which de novo deletions have been observed in 5 cases in the literature - all in well-phenotyped, older individuals - 1 with developmental delay, 1 with a history of cardiac defect and normal development, 1 with a history of genitourinary anomalies and normal development, and 2 in individuals from the general population.  In this scenario, with such disparate phenotypes and reasonable confidence that there are no overlapping phenotypes, negative points may be assigned. 0 points each; (Range: 0 to -0.30).'),
+        ('4E', 'Individual case evidence  unknown inheritance', '', '4E. Reported proband has a highly specific phenotype consistent with the gene/genomic region, but the inheritance of the variant is unknown.', 0.1, 0.0, 0.3, 'Occasionally, particularly in older literature, there are probands with compelling phenotypes and CNVs similar in genomic content to the CNV under evaluation but without inheritance information. It is recommended that these types of cases only be included as evidence if the phenotype in the proband is highly specific and consistent with that of other probands for which inheritance is known, and only be assigned a minimal number of points. These types of cases should not be used in the setting of nonspecific phenotypes (e.g., developmental delay or autism spectrum disorder). 0.10 points each; (Range: 0 to 0.15).'),
+        ('4F', 'Individual case evidence  segregation among similarly affected family members', '', '4F. 3-4 observed segregations', 0.15, 0.15, 0.15, ''),
+        ('4G', 'Individual case evidence  segregation among similarly affected family members', '', '4G. 5-6 observed segregations', 0.3, 0.3, 0.3, ''),
+        ('4H', 'Individual case evidence  segregation among similarly affected family members', '', '4H. 7 or more observed segregations', 0.45, 0.45, 0.45, ''),
+        ('4I', 'Individual case evidence - Non-Segregations', '', '4I. Variant is NOT found in another individual in the probands family AFFECTED with a consistent, specific, well-defined phenotype (no known phenocopies)', -0.45, -0.9, 0.0, 'Interpret with caution. Consider whether there may be a biologically plausible explanation for this non-segregation, such as the presence of phenocopies. This scenario is more likely to occur in the setting of disorders that are more common in the general population (for example, breast cancer) and/or disorders that are known to have both genetic and non-genetic causes (for example, cardiomyopathy). Assign the default number of negative points (-0.45) when the individuals in the family are affected with similar, highly specific phenotypes (with no known phenocopies) and are not found to carry the same variant. Consider downgrading this evidence when phenocopies are a possibility. -0.45 points per family; (Range: 0 to -0.45).'),
+        ('4J', 'Individual case evidence - Non-Segregations', '', '4J. Variant IS found in another individual in the probands family UNAFFECTED with the specific, well-defined phenotype observed in the proband', -0.3, -0.9, 0.0, 'Interpret with caution. Consider whether the family member found to have the variant is truly unaffected. Truly affected individuals may appear to be unaffected in the context of variable expressivity, reduced or age-dependent penetrance, disorders with subtle clinical manifestations, incomplete clinical evaluation, or novel disorders in which the phenotypic spectrum has not yet been well characterized. For example: the phenotype under investigation is specific and well-defined, such as a rare eye phenotype only appreciable with dilated eye examination. If the family member were evaluated by an ophthalmologist with dilated eye exam and found not to have said eye phenotype, assign the default number of negative points for a family member with the variant but unaffected with the specific, well-defined phenotype. If the family member were evaluated by a general practitioner, and it is unclear whether a dilated eye exam was performed, consider downgrading this evidence. In this scenario, 0 points may be appropriate if a dilated eye exam was not performed; there would be no way to know whether this individual was truly unaffected or not without this study. -0.30 points per family; (Range: 0 to -0.30).'),
+        ('4K', 'Individual case evidence - Non-Segregations', '', '4K. Variant IS found in another individual in the probands family UNAFFECTED with the non-specific phenotype observed in the proband', -0.15, -0.3, 0.0, 'Interpret with caution. Consider whether the family member found to have the variant is truly unaffected. Truly affected individuals may appear to be unaffected in the context of variable expressivity, reduced or age-dependent penetrance, disorders with subtle clinical manifestations, incomplete clinical evaluation, or novel disorders in which the phenotypic spectrum has not yet been well characterized. If the family member were thoroughly evaluated and said to be unaffected, consider awarding the default number of negative points for a family member with the variant but unaffected with a non-specific phenotype. Consider downgrading or not awarding any negative points at all if, for example, that family member is simply stated in a publication not to be affected, but no details of their evaluation are provided. -0.15 points per family; (Range: 0 to -0.15)'),
+        ('4L', 'Case-control and population evidence', '', '4L. Statistically significantincrease amongst observations in cases (with a consistent, specific, well-defined phenotype) compared to controls', 0.45, 0.0, 0.45, "If the CNV has been studied as part of a well-powered case-control study with adequate numbers of cases and controls, points may be added or deducted based on enrichment (or lack thereof) in the clinical population. Interpretation of case-control data should include evaluation of significance (i.e. p-value), effect size (e.g. likelihood ratio), and clinical information (e.g. phenotypic specificity). Similar to categories defined for sequence variants, CNVs in this category will be observed at a significantly higher frequency in cases versus controls (p< 0.05), and with a strong effect size (odds ratio or likelihood ratio >5) and relatively narrow associated 95% confidence interval (lower bound >1). In general, probands with similar, highly specific, well-defined phenotypes represent stronger evidence than probands with disparate or non-specific phenotypes. For the purposes of this framework, 'highly specific, well-defined' phenotypes are those that are both distinct and have a known genetic etiology with limited genetic heterogeneity. Examples of 'highly specific, well-defined' phenotypes include congenital anomalies (e.g., skeletal dysplasias, midline facial defects, holoprosencephaly, etc.) or a constellation of findings (e.g., coloboma, heart defects, choanal atresia, growth delays, genital anomalies, and ear abnormalities associated with CHARGE syndrome (MIM:214800)). 0.45 per study (Range: 0 to 0.45 per study)."),
+        ('4M', 'Case-control and population evidence', '', '4M. Statistically significantincrease amongst observations in cases (without a consistent, non-specific phenotype OR unknown phenotype) compared to controls', 0.3, 0.0, 0.45, "If the CNV has been studied as part of a well-powered case-control study with adequate numbers of cases and controls, points may be added or deducted based on enrichment (or lack thereof) in the clinical population. Interpretation of case-control data should include evaluation of significance (i.e. p-value), effect size (e.g. likelihood ratio), and clinical information (e.g. phenotypic specificity). Similar to categories defined for sequence variants, CNVs in this category will be observed at a significantly higher frequency in cases versus controls (p< 0.05), and with a strong effect size (odds ratio or likelihood ratio >5) and relatively narrow associated 95% confidence interval (lower bound >1). 'Non-specific' phenotypes are those that may be more common in the general population, have more considerable genetic heterogeneity, and/or can be caused by etiologies other than genetic variation. Examples of 'non-specific' phenotypes include autism spectrum disorder and intellectual disability.  Inheritance information, when available, can be used to modify the strength of case-level evidence. 0.30 per study (Range:0 to 0.30 per study)."),
+        ('4N', 'Case-control and population evidence', '', '4N. No statistically significant difference between observations in cases and controls', -0.9, -0.9, 0.0, 'If the CNV has been studied as part of a well-powered case-control study with adequate numbers of cases and controls, points may be added or deducted based on enrichment (or lack thereof) in the clinical population. Interpretation of case-control data should include evaluation of significance (i.e. p-value), effect size (e.g. likelihood ratio), and clinical information (e.g. phenotypic specificity). Similar to categories defined for sequence variants, CNVs in this category will be observed at a significantly higher frequency in cases versus controls (p< 0.05), and with a strong effect size (odds ratio or likelihood ratio >5) and relatively narrow associated 95% confidence interval (lower bound >1). Alternatively, CNVs that are not enriched are observed at similar (or higher) frequencies in controls compared to cases, may be deducted points, particularly when such CNVs are also relatively common e.g. >0.1% frequency. -0.90 (per study) (Range:0 to -0.90 per study).'),
+        ('4O', 'Case-control and population evidence', '', '4O. Overlap with common population variation', -1.0, -1.0, 0.0, "CNV may be considered 'common' in the general population if it is present at a frequency of 1% or greater in the DGV Gold Standard dataset (or other high confidence dataset). Consider assigning less weight if a variant is observed in the general population, but at a frequency lower than 1%. Note that expected carrier frequencies associated with autosomal recessive diseases may be higher than 1%; do not use this criterion to classify a CNV as 'benign' if there is a well-known autosomal recessive disease gene (for which loss of function is the established disease mechanism) in the interval. Consider downgrading if there are reasons to question the reported population frequency of a variant."),
+        ('5A', 'Observed copy number loss is DE NOVO', '', '5A. Use appropriate category from de novo scoring section in Section 4.', None, 0.0, 0.45, 'Use de novo scoring categories from Section 4 (4A-4D) to determine score.'),
+        ('5B', 'Observed copy number loss is INHERITED', '', '5B. Patient with specific, well-defined phenotype and no family history. CNV is inherited from an apparently unaffected parent.', -0.3, -0.45, 0.0, 'When a CNV is found in a parent or other relative, the carrier parent and other relevant family members should have a thorough medical evaluation for the presence or absence of the clinical features present in the proband. When this information is not provided to the laboratory, this should be included in the report with a recommendation for correlation with parental clinical features. Do not add or deduct points for inheritance from a parent if the affected status of that parent is unknown.'),
+        ('5C', 'Observed copy number loss is INHERITED', '', '5C. Patient with non-specific phenotype and no family history. CNV is inherited from an apparently unaffected parent.', -0.15, -0.3, 0.0, 'When a CNV is found in a parent or other relative, the carrier parent and other relevant family members should have a thorough medical evaluation for the presence or absence of the clinical features present in the proband. When this information is not provided to the laboratory, this should be included in the report with a recommendation for correlation with parental clinical features. Do not add or deduct points for inheritance from a parent if the affected status of that parent is unknown.'),
+        ('5D', 'Observed copy number loss is INHERITED', '', '5D. CNV segregates with a consistent phenotype observed in the patients family.', None, 0.0, 0.45, 'When a CNV is found in a parent or other relative, the carrier parent and other relevant family members should have a thorough medical evaluation for the presence or absence of the clinical features present in the proband. When this information is not provided to the laboratory, this should be included in the report with a recommendation for correlation with parental clinical features. Do not add or deduct points for inheritance from a parent if the affected status of that parent is unknown. Use segregation scoring categories from Section 4 (4F-4H) to determine score.'),
+        ('5E', 'Observed copy number loss  NON-SEGREGATIONS', '', '5E. Use appropriate category from non-segregation section in Section 4.', None, -0.45, 0.0, 'Use non-segregation scoring categories from Section 4 (4I-4K) to determine score.'),
+        ('5F', 'Other', '', '5F. Inheritance information is unavailable or uninformative.', 0.0, 0.0, 0.0, 'If inheritance information is unknown or uninformative (for example, only one parent is available for follow-up, and the CNV is not found in the parent available for study), and no information is known about the patient phenotype, no points can be awarded.'),
+        ('5G', 'Other', '', '5G. Inheritance information is unavailable or uninformative. The patient phenotype is non-specific, but is consistent with what has been described in similar cases.', 0.1, 0.0, 0.15, "Points may be assigned depending upon the relative specificity of the phenotype. In general, cases under evaluation by the clinical laboratory should be scored in a similar manner to relevant cases observed in the scientific literature (e.g., de novo cases scored similarly to literature de novo cases, inherited cases scored similarly to other cases with the same inheritance pattern, etc.). The ranges allow the laboratory to upgrade or downgrade evidence from their observed case based upon their presumed ability to obtain more detailed clinical information, including pertinent negatives (e.g., phenotypes reported in the literature that the patient under evaluation has been determined NOT to have), from the referring clinician, something that is typically not possible in literature cases. If this is not possible, or if any questions remain about how well a patient's phenotype matches with what has been previously described, score as you would an additional case observed in the literature."),
+        ('5H', 'Other', '', '5H. Inheritance information is unavailable or uninformative. The patient phenotype is highly specific and consistent with what has been described in similar cases.', 0.3, 0.0, 0.3, "Points may be assigned depending upon the relative specificity of the phenotype. In general, cases under evaluation by the clinical laboratory should be scored in a similar manner to relevant cases observed in the scientific literature (e.g., de novo cases scored similarly to literature de novo cases, inherited cases scored similarly to other cases with the same inheritance pattern, etc.). The ranges allow the laboratory to upgrade or downgrade evidence from their observed case based upon their presumed ability to obtain more detailed clinical information, including pertinent negatives (e.g., phenotypes reported in the literature that the patient under evaluation has been determined NOT to have), from the referring clinician, something that is typically not possible in literature cases. If this is not possible, or if any questions remain about how well a patient's phenotype matches with what has been previously described, score as you would an additional case observed in the literature."),
+    ),
+)
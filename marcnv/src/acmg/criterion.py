@@ -1,6 +1,11 @@
-import csv
+import functools
+import hashlib
+import io
 import os
-from dataclasses import dataclass
+import threading
+import types
+from dataclasses import astuple, dataclass
+from typing import Mapping
 
 from marcnv.src.acmg import core
 
@@ -15,8 +20,10 @@ _ACMG_HEADER = [
     "Tooltip",
 ]
 
+SNAPSHOT_FILEPATH = os.path.join(core.SRC_DIR, "criteria_snapshot.py")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ACMGCriterion:
     evidence_type: str
     pretext: str
@@ -27,35 +34,135 @@ class ACMGCriterion:
     tooltip: str
 
 
-def _load_acmg_file(filepath: str) -> dict[str, ACMGCriterion]:
+CriteriaTable = Mapping[str, ACMGCriterion]
+
+_registry: dict[bool, CriteriaTable] | None = None
+_registry_lock = threading.Lock()
+
+
+def _acmg_filepath(duplication: bool) -> str:
+    return core.ACMG_GAIN_TSV_FILEPATH if duplication else core.ACMG_LOSS_TSV_FILEPATH
+
+
+def _read_acmg_file(filepath: str) -> bytes:
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"ACMG file not found: {filepath}")
+    with open(filepath, "rb") as f:
+        return f.read()
+
+
+def _parse_acmg_table(content: bytes) -> dict[str, ACMGCriterion]:
+    # only needed when the snapshot is stale, imported here to keep it out of the startup
+    import csv
 
     criteria: dict[str, ACMGCriterion] = {}
-    with open(filepath, "r") as f:
-        reader = csv.DictReader(
-            f,
-            delimiter="\t",
-        )
+    reader = csv.DictReader(io.StringIO(content.decode()), delimiter="\t")
 
-        if reader.fieldnames != _ACMG_HEADER:
-            raise ValueError(f"ACMG file header mismatch: {reader.fieldnames}. Expected: {_ACMG_HEADER}")
-
-        for row in reader:
-            criterion = ACMGCriterion(
-                evidence_type=row["Evidence Type"] if row["Evidence Type"] else "",
-                pretext=row["Pretext"] if row["Pretext"] else "",
-                evidence=row["Evidence"] if row["Evidence"] else "",
-                suggested_points=float(row["Suggested points"]) if row["Suggested points"] else None,
-                min_score=float(row["Min Score"]) if row["Min Score"] else None,
-                max_score=float(row["Max Score"]) if row["Max Score"] else None,
-                tooltip=row["Tooltip"] if row["Tooltip"] else "",
-            )
-            if row["Index"] in criteria:
-                raise ValueError(f'Duplicate index in ACMG criteria: {row['Index']}')
-            criteria[row["Index"]] = criterion
+    if reader.fieldnames != _ACMG_HEADER:
+        raise ValueError(f"ACMG file header mismatch: {reader.fieldnames}. Expected: {_ACMG_HEADER}")
+
+    for row in reader:
+        criterion = ACMGCriterion(
+            evidence_type=row["Evidence Type"] if row["Evidence Type"] else "",
+            pretext=row["Pretext"] if row["Pretext"] else "",
+            evidence=row["Evidence"] if row["Evidence"] else "",
+            suggested_points=float(row["Suggested points"]) if row["Suggested points"] else None,
+            min_score=float(row["Min Score"]) if row["Min Score"] else None,
+            max_score=float(row["Max Score"]) if row["Max Score"] else None,
+            tooltip=row["Tooltip"] if row["Tooltip"] else "",
+        )
+        if row["Index"] in criteria:
+            raise ValueError(f'Duplicate index in ACMG criteria: {row['Index']}')
+        criteria[row["Index"]] = criterion
     return criteria
 
 
-def get_acmg_criteria(duplication: bool) -> dict[str, ACMGCriterion]:
-    return _load_acmg_file(core.ACMG_GAIN_TSV_FILEPATH if duplication else core.ACMG_LOSS_TSV_FILEPATH)
+def _load_acmg_file(filepath: str) -> dict[str, ACMGCriterion]:
+    return _parse_acmg_table(_read_acmg_file(filepath))
+
+
+def _load_snapshot(duplication: bool, checksum: str) -> dict[str, ACMGCriterion] | None:
+    try:
+        from marcnv.src.acmg import criteria_snapshot
+    except ImportError:
+        return None
+
+    snapshot_checksum, rows = criteria_snapshot.GAIN if duplication else criteria_snapshot.LOSS
+    if snapshot_checksum != checksum:
+        return None
+    return {index: ACMGCriterion(*fields) for index, *fields in rows}
+
+
+@functools.cache
+def criteria_checksum(duplication: bool) -> str:
+    """Returns the SHA-256 checksum of the ACMG criteria TSV for gains or losses."""
+    return hashlib.sha256(_read_acmg_file(_acmg_filepath(duplication))).hexdigest()
+
+
+def _build_registry() -> dict[bool, CriteriaTable]:
+    # identical records (e.g. sections 1 and 5) are stored only once and shared by both tables
+    interned: dict[ACMGCriterion, ACMGCriterion] = {}
+    registry: dict[bool, CriteriaTable] = {}
+    for duplication in (True, False):
+        checksum = criteria_checksum(duplication)
+        criteria = _load_snapshot(duplication, checksum)
+        if criteria is None:
+            criteria = _load_acmg_file(_acmg_filepath(duplication))
+        table = {index: interned.setdefault(record, record) for index, record in criteria.items()}
+        registry[duplication] = types.MappingProxyType(table)
+    return registry
+
+
+def get_acmg_criteria(duplication: bool) -> CriteriaTable:
+    """Returns the read-only ACMG criteria table, loaded once per process and shared by all classifiers and threads."""
+    global _registry
+    if _registry is None:
+        # threads racing for the first table load it once
+        with _registry_lock:
+            if _registry is None:
+                _registry = _build_registry()
+    return _registry[duplication]
+
+
+def criteria_dependency(duplication: bool, index: str) -> str:
+    """Returns the dependency label of a criteria row, e.g. `acmg_gain.tsv:2A`."""
+    return f"{os.path.basename(_acmg_filepath(duplication))}:{index}"
+
+
+def changed_criteria(previous_filepath: str, duplication: bool) -> list[str]:
+    """Returns the dependency labels of the rows added, removed or changed since the `previous_filepath` TSV."""
+    previous = _load_acmg_file(previous_filepath)
+    current = get_acmg_criteria(duplication)
+    return [
+        criteria_dependency(duplication, index)
+        for index in sorted(previous.keys() | current.keys())
+        if previous.get(index) != current.get(index)
+    ]
+
+
+def render_snapshot() -> str:
+    """Renders the source of the precompiled criteria module from the current ACMG TSV files."""
+    lines = [
+        "# Generated by `python -m marcnv.src.acmg.criterion` from the ACMG criteria TSV files. Do not edit.",
+        "# The tables are used only while the checksums match the TSV files, otherwise the TSV files are parsed.",
+        "",
+    ]
+    for name, duplication in (("GAIN", True), ("LOSS", False)):
+        criteria = _load_acmg_file(_acmg_filepath(duplication))
+        lines.append(f"{name} = (")
+        lines.append(f"    {criteria_checksum(duplication)!r},")
+        lines.append("    (")
+        for index, record in criteria.items():
+            lines.append(f"        {(index, *astuple(record))!r},")
+        lines.append("    ),")
+        lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(filepath: str = SNAPSHOT_FILEPATH) -> None:
+    with open(filepath, "w") as f:
+        f.write(render_snapshot())
+
+
+if __name__ == "__main__":
+    write_snapshot()
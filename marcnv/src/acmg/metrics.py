@@ -0,0 +1,228 @@
+"""Aggregate metrics of classification runs.
+
+Worker processes measure every classification (`Observation`): the time to load and parse the annotation, to classify
+it and to evaluate each section, and the peak memory of the worker. The process collecting the results records them
+with the predictions in a `Registry`, which counts the CNVs, section options, severities and cache hits, keeps
+latency histograms and exposes all of it in the Prometheus text format (`to_prometheus`) or as a JSON summary
+(`summary`).
+"""
+
+import bisect
+import collections
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Sequence
+
+import annotation
+
+from marcnv.src.acmg import classification, profiling
+
+# upper bounds of the histogram buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SECTION_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def peak_memory() -> int:
+    """Returns the peak resident memory of the current process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 2**10
+
+
+@dataclass(frozen=True, slots=True)
+class Observation:
+    # wall time of loading and parsing the annotation and of classifying it, in seconds
+    load: float
+    classify: float
+    # wall time of each section
+    sections: dict[str, float]
+    # process that classified the CNV and its peak resident memory in bytes
+    pid: int = field(default_factory=os.getpid)
+    peak_rss: int = field(default_factory=peak_memory)
+
+
+class SectionTimer(profiling.Profiler):
+    """Profiler recording only the wall and CPU time of the sections, without counting annotation queries."""
+
+    def wrap(self, annot: annotation.Annotation) -> annotation.Annotation:
+        return annot
+
+    def rule(self, name: str) -> None:
+        pass
+
+
+def section_seconds(profiler: profiling.Profiler) -> dict[str, float]:
+    return {name: timing.wall for name, timing in profiler.timings.sections.items()}
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # observations per bucket, the last one above all bounds
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Returns the upper bound of the bucket of the `q`-quantile, or the maximum if it lies above all bounds."""
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def _header(name: str, kind: str, description: str) -> list[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: dict[str, str]) -> Iterator[str]:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        yield f"{name}_bucket{_labels({**labels, 'le': repr(bound)})} {cumulative}"
+    yield f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {histogram.count}"
+    yield f"{name}_sum{_labels(labels)} {histogram.sum!r}"
+    yield f"{name}_count{_labels(labels)} {histogram.count}"
+
+
+class Registry:
+    """Metrics of one run, recorded by the process collecting the results."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.started = clock()
+        # CNVs by status: classified or failed
+        self.cnvs: collections.Counter[str] = collections.Counter()
+        self.options: collections.Counter[tuple[str, str]] = collections.Counter()
+        self.severities: collections.Counter[str] = collections.Counter()
+        # prediction cache lookups: hit or miss
+        self.cache: collections.Counter[str] = collections.Counter()
+        self.latency = Histogram()
+        self.load = Histogram()
+        self.classify = Histogram()
+        self.sections: dict[str, Histogram] = {}
+        self.peak_rss: dict[int, int] = {}
+
+    def observe(
+        self,
+        prediction: classification.Prediction | None,
+        observation: Observation | None = None,
+        cached: bool | None = None,
+    ) -> None:
+        """Records a result; `cached` is None when no prediction cache is used. Failed CNVs count as no lookup."""
+        self.cnvs["failed" if prediction is None else "classified"] += 1
+        if prediction is not None:
+            for section in prediction.criteria:
+                self.options[section.section, section.option] += 1
+            self.severities[prediction.severity.value] += 1
+            if cached is not None:
+                self.cache["hit" if cached else "miss"] += 1
+        if observation is not None:
+            self.latency.observe(observation.load + observation.classify)
+            self.load.observe(observation.load)
+            if not cached:
+                self.classify.observe(observation.classify)
+            for section, seconds in observation.sections.items():
+                self.sections.setdefault(section, Histogram(SECTION_BUCKETS)).observe(seconds)
+            self.peak_rss[observation.pid] = max(self.peak_rss.get(observation.pid, 0), observation.peak_rss)
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def throughput(self) -> float:
+        """CNVs classified per second since the start of the run."""
+        elapsed = self.elapsed()
+        return self.cnvs["classified"] / elapsed if elapsed > 0 else 0.0
+
+    def to_prometheus(self) -> str:
+        lines = [
+            *_header("marcnv_cnvs_total", "counter", "CNVs processed, by status."),
+            *(f"marcnv_cnvs_total{_labels({'status': s})} {self.cnvs[s]}" for s in ("classified", "failed")),
+            *_header("marcnv_run_seconds", "gauge", "Time since the start of the run."),
+            f"marcnv_run_seconds {self.elapsed()!r}",
+            *_header("marcnv_cnvs_per_second", "gauge", "CNVs classified per second since the start of the run."),
+            f"marcnv_cnvs_per_second {self.throughput()!r}",
+            *_header("marcnv_classification_seconds", "histogram", "Time to load and classify a CNV."),
+            *_histogram_lines("marcnv_classification_seconds", self.latency, {}),
+            *_header("marcnv_load_seconds", "histogram", "Time to load and parse the annotation of a CNV."),
+            *_histogram_lines("marcnv_load_seconds", self.load, {}),
+            *_header("marcnv_classify_seconds", "histogram", "Time to classify a loaded CNV."),
+            *_histogram_lines("marcnv_classify_seconds", self.classify, {}),
+            *_header("marcnv_section_seconds", "histogram", "Time to evaluate a section."),
+        ]
+        for section in sorted(self.sections):
+            lines.extend(_histogram_lines("marcnv_section_seconds", self.sections[section], {"section": section}))
+        lines.extend(_header("marcnv_options_total", "counter", "Selected options of the sections."))
+        for (section, option), count in sorted(self.options.items()):
+            lines.append(f"marcnv_options_total{_labels({'section': section, 'option': option})} {count}")
+        lines.extend(_header("marcnv_severity_total", "counter", "Severities of the predictions."))
+        for severity, count in sorted(self.severities.items()):
+            lines.append(f"marcnv_severity_total{_labels({'severity': severity})} {count}")
+        if self.cache:
+            lines.extend(_header("marcnv_cache_lookups_total", "counter", "Prediction cache lookups, by result."))
+            lines += [f"marcnv_cache_lookups_total{_labels({'result': r})} {self.cache[r]}" for r in ("hit", "miss")]
+        lines.extend(_header("marcnv_worker_peak_rss_bytes", "gauge", "Peak resident memory of a worker process."))
+        for pid, peak in sorted(self.peak_rss.items()):
+            lines.append(f"marcnv_worker_peak_rss_bytes{_labels({'pid': str(pid)})} {peak}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Writes the metrics to a file, replaced at once so scrapers (e.g. a textfile collector) never read it half
+        written."""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+    def summary(self) -> dict[str, Any]:
+        lookups = self.cache["hit"] + self.cache["miss"]
+        options: dict[str, dict[str, int]] = {}
+        for (section, option), count in sorted(self.options.items()):
+            options.setdefault(section, {})[option] = count
+        return {
+            "cnvs": {status: self.cnvs[status] for status in ("classified", "failed")},
+            "seconds": self.elapsed(),
+            "cnvs_per_second": self.throughput(),
+            "latency": self.latency.summary(),
+            "load": self.load.summary(),
+            "classify": self.classify.summary(),
+            "sections": {section: self.sections[section].summary() for section in sorted(self.sections)},
+            "options": options,
+            "severities": dict(sorted(self.severities.items())),
+            "cache": {**self.cache, "hit_rate": self.cache["hit"] / lookups} if lookups else None,
+            "peak_rss": {str(pid): peak for pid, peak in sorted(self.peak_rss.items())},
+        }
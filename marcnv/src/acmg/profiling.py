@@ -0,0 +1,95 @@
+import contextlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterator, cast
+
+import annotation
+
+
+@dataclass
+class Timing:
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+    def add(self, wall: float, cpu: float) -> None:
+        self.wall += wall
+        self.cpu += cpu
+        self.calls += 1
+
+
+@dataclass
+class Timings:
+    sections: dict[str, Timing] = field(default_factory=dict)
+    rules: dict[str, Timing] = field(default_factory=dict)
+    queries: dict[str, int] = field(default_factory=dict)
+
+
+class _CountingAnnotation:
+    """Proxy of annotation.Annotation counting the calls of its query methods."""
+
+    def __init__(self, annot: annotation.Annotation, queries: dict[str, int]) -> None:
+        self._annot = annot
+        self._queries = queries
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._annot, name)
+        if not callable(attr) or not name.startswith(("get_", "count_")):
+            return attr
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            self._queries[name] = self._queries.get(name, 0) + 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+class Profiler:
+    """Records wall and CPU time per section and per section 2 rule, and the number of annotation queries."""
+
+    def __init__(self) -> None:
+        self.timings = Timings()
+        self._rule: tuple[str, float, float] | None = None
+
+    def wrap(self, annot: annotation.Annotation) -> annotation.Annotation:
+        return cast(annotation.Annotation, _CountingAnnotation(annot, self.timings.queries))
+
+    def _close_rule(self, wall: float, cpu: float) -> None:
+        if self._rule is not None:
+            name, wall_start, cpu_start = self._rule
+            self.timings.rules.setdefault(name, Timing()).add(wall - wall_start, cpu - cpu_start)
+            self._rule = None
+
+    def rule(self, name: str) -> None:
+        """Starts timing of a rule; the previous rule ends here or at the end of the section."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._close_rule(wall, cpu)
+        self._rule = (name, wall, cpu)
+
+    @contextlib.contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter(), time.process_time()
+            self._close_rule(wall, cpu)
+            self.timings.sections.setdefault(name, Timing()).add(wall - wall_start, cpu - cpu_start)
+
+
+class NullProfiler(Profiler):
+    """Profiler that records nothing, used when profiling is disabled."""
+
+    _NULL_CONTEXT = contextlib.nullcontext()
+
+    def wrap(self, annot: annotation.Annotation) -> annotation.Annotation:
+        return annot
+
+    def rule(self, name: str) -> None:
+        pass
+
+    def section(self, name: str) -> contextlib.nullcontext[None]:  # type: ignore[override]
+        return self._NULL_CONTEXT
+
+
+DISABLED = NullProfiler()
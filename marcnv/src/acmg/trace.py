@@ -0,0 +1,55 @@
+import logging
+import sys
+from typing import Any, Iterable, TextIO
+
+LEVELS = {
+    "off": logging.CRITICAL + 1,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+    "debug": logging.DEBUG,
+}
+
+logger = logging.getLogger("marcnv")
+logger.addHandler(logging.NullHandler())
+
+_sections: frozenset[str] | None = None
+
+
+class _SectionFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "section"):
+            record.section = "-"
+            record.rule = "-"
+        return super().format(record)
+
+
+def configure(level: str = "warning", sections: Iterable[str] | None = None, stream: TextIO = sys.stderr) -> None:
+    """Sets the trace level and, optionally, the sections ("1" to "5") to trace. Records go to `stream`."""
+    global _sections
+    _sections = frozenset(sections) if sections else None
+
+    for handler in [h for h in logger.handlers if not isinstance(h, logging.NullHandler)]:
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(_SectionFormatter("%(levelname)s section %(section)s [%(rule)s]: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(LEVELS[level])
+    logger.propagate = False
+
+
+def enabled(section: str, level: int = logging.DEBUG) -> bool:
+    return logger.isEnabledFor(level) and (_sections is None or level >= logging.WARNING or section in _sections)
+
+
+def trace(section: str, rule: str, message: str, *args: Any, level: int = logging.DEBUG) -> None:
+    """Emits a trace record for a section and rule. `message` is %-formatted with `args` only if the record is enabled."""
+    if enabled(section, level):
+        logger.log(level, message, *args, extra={"section": section, "rule": rule})
+
+
+def info(section: str, rule: str, message: str, *args: Any) -> None:
+    trace(section, rule, message, *args, level=logging.INFO)
+
+
+def warning(section: str, rule: str, message: str, *args: Any) -> None:
+    trace(section, rule, message, *args, level=logging.WARNING)
@@ -0,0 +1,152 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from marcnv.src.acmg import classification, criterion
+from marcnv.src.io import writers
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+# number of insertions of a process between two evictions, the cache may exceed its size by this much
+EVICTION_INTERVAL = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    prediction TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_last_access ON predictions (last_access);
+"""
+
+
+@functools.cache
+def marcnv_version() -> str:
+    # importlib.metadata takes longer to import than the classification of a CNV
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("marcnv")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def cache_key(document: dict[str, Any]) -> str:
+    """Returns the key of an annotation document: its normalized content, the ACMG criteria and the marcnv version."""
+    digest = hashlib.sha256()
+    digest.update(marcnv_version().encode())
+    digest.update(criterion.criteria_checksum(duplication=True).encode())
+    digest.update(criterion.criteria_checksum(duplication=False).encode())
+    digest.update(json.dumps(document, sort_keys=True, separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PredictionCache:
+    """On-disk LRU cache of predictions in SQLite, safe for concurrent use from several processes and threads.
+
+    Every process and thread opens its own connection on first use. The least recently used entries beyond
+    `max_entries` are evicted periodically and on close.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES, timeout: float = 60.0) -> None:
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.stats = CacheStats()
+        self._local = threading.local()
+        # connections of all threads with the process that opened them, to close them on close
+        self._connections: list[tuple[int, sqlite3.Connection]] = []
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in ("_local", "_connections", "_lock"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # connections must not be shared with forked worker processes nor used by two threads at once
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # closed by the thread calling close
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            local.connection, local.pid = connection, os.getpid()
+            with self._lock:
+                self._connections.append((os.getpid(), connection))
+        return local.connection
+
+    def get(self, key: str) -> classification.Prediction | None:
+        row = self.connection.execute("SELECT prediction FROM predictions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.hits += 1
+        self.connection.execute("UPDATE predictions SET last_access = ? WHERE key = ?", (time.time(), key))
+        return classification.Prediction.from_dict(json.loads(row[0]))
+
+    def put(self, key: str, prediction: classification.Prediction) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO predictions (key, prediction, last_access) VALUES (?, ?, ?)",
+            (key, writers.dumps(prediction, compact=True), time.time()),
+        )
+        with self._lock:
+            self._puts += 1
+            evict = self._puts % EVICTION_INTERVAL == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries beyond `max_entries`."""
+        self._evict(self.connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        connection.execute(
+            "DELETE FROM predictions WHERE key IN "
+            "(SELECT key FROM predictions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        row = self.connection.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            connections = [connection for pid, connection in self._connections if pid == os.getpid()]
+            self._connections.clear()
+            # every thread opens a new connection on its next use
+            self._local = threading.local()
+        if connections:
+            self._evict(connections[0])
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,140 @@
+"""Deduplication of recurrent CNVs in a batch: CNVs of identical coordinates are classified once.
+
+A cluster holds the CNVs with the same chromosome, start, end and type, and so the same annotation. The
+representative is the first CNV of the cluster in the input order; its prediction is given to all members.
+There is no clustering by reciprocal overlap: CNVs of other coordinates are classified on their own even if they
+overlap the same genes, as the reasons name the coordinates and section 2 depends on the overlaps with dosage
+sensitive regions, benign CNVs and transcripts.
+
+The coordinates of annotation files are read from the beginning of the file (see `reference.describe`).
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from marcnv.src.acmg import trace
+from marcnv.src.batch import runner
+from marcnv.src.io import reference
+
+
+@dataclass(frozen=True)
+class Cluster:
+    # indices of the inputs, the first one is the representative
+    members: list[int]
+
+    @property
+    def representative(self) -> int:
+        return self.members[0]
+
+
+@dataclass
+class DedupStats:
+    inputs: int
+    clusters: int
+    # inputs classified: representatives and members classified on their own
+    classified: int = 0
+    # members given the prediction of their representative
+    fanned_out: int = 0
+    # estimated time of classifying the fanned out members
+    saved_seconds: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Number of inputs per classified CNV."""
+        return self.inputs / self.classified if self.classified else 1.0
+
+    def summary(self) -> str:
+        return (
+            f"Dedup: {self.inputs} CNVs at {self.clusters} distinct coordinates (ratio {self.ratio:.2f}), "
+            f"{self.fanned_out} predictions reused, ~{self.saved_seconds:.1f}s saved."
+        )
+
+
+def cluster(regions: Sequence[reference.Region]) -> list[Cluster]:
+    """Clusters the CNVs with the same coordinates. Clusters are ordered by their representative."""
+    members: dict[reference.Region, list[int]] = {}
+    for i, region in enumerate(regions):
+        members.setdefault(region, []).append(i)
+    return [Cluster(indices) for indices in members.values()]
+
+
+def _classify(
+    paths: list[str], workers: int, options: runner.ClassifyOptions, threads: bool
+) -> tuple[list[runner.BatchResult], float]:
+    """Returns the results and the mean time of a classification."""
+    started = time.perf_counter()
+    results = list(runner.classify_many(paths, workers=workers, options=options, threads=threads))
+    return results, (time.perf_counter() - started) / max(len(paths), 1)
+
+
+def classify_deduplicated(
+    inputs: Iterable[str],
+    workers: int | None = None,
+    options: runner.ClassifyOptions = runner.ClassifyOptions(),
+    threads: bool = False,
+) -> tuple[list[runner.BatchResult], DedupStats]:
+    """Classifies one representative per cluster of CNVs (see `cluster`) and gives its prediction to the members.
+
+    Returns the results in the input order and the statistics of the deduplication. Inputs whose coordinates cannot
+    be read and members of clusters whose representative failed are classified on their own.
+    """
+    paths = list(inputs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    regions: list[reference.Region | None] = []
+    for path in paths:
+        try:
+            regions.append(reference.describe(path))
+        except Exception:
+            trace.logger.debug("Coordinates of %s cannot be read", path, exc_info=True)
+            regions.append(None)
+    described = [i for i, region in enumerate(regions) if region is not None]
+    clusters = [
+        Cluster([described[i] for i in c.members])
+        for c in cluster([region for region in regions if region is not None])
+    ]
+    undescribed = [i for i, region in enumerate(regions) if region is None]
+    stats = DedupStats(inputs=len(paths), clusters=len(clusters) + len(undescribed))
+
+    results: list[runner.BatchResult | None] = [None] * len(paths)
+    classified = sorted([c.representative for c in clusters] + undescribed)
+    mean_seconds = 0.0
+    if classified:
+        batch, mean_seconds = _classify([paths[i] for i in classified], workers, options, threads)
+        for i, result in zip(classified, batch):
+            results[i] = result
+
+    separately: list[int] = []
+    for c in clusters:
+        representative = results[c.representative]
+        assert representative is not None
+        for member in c.members[1:]:
+            if representative.prediction is None:
+                separately.append(member)
+            else:
+                results[member] = _fan_out(paths[member], representative)
+
+    if separately:
+        separately.sort()
+        batch, _ = _classify([paths[i] for i in separately], workers, options, threads)
+        for i, result in zip(separately, batch):
+            results[i] = result
+
+    stats.classified = len(classified) + len(separately)
+    stats.fanned_out = len(paths) - stats.classified
+    stats.saved_seconds = stats.fanned_out * mean_seconds
+    return [result for result in results if result is not None], stats
+
+
+def _fan_out(input_path: str, representative: runner.BatchResult) -> runner.BatchResult:
+    assert representative.prediction is not None
+    return runner.BatchResult(
+        input=input_path,
+        prediction=representative.prediction,
+        cached=representative.cached,
+        dependencies=representative.dependencies,
+        representative=representative.input,
+    )
@@ -0,0 +1,133 @@
+"""Re-classification of stored predictions after a change of the knowledge sources or the ACMG criteria.
+
+Predictions classified with dependencies store, per section, the knowledge sources of the annotation it read (see
+`annotation_view.SOURCES`) and the criteria row of its option (e.g. `acmg_loss.tsv:2H`). A changeset lists changed
+sources, criteria rows, or whole criteria files (e.g. `acmg_loss.tsv`). Only the affected sections are recomputed:
+
+- sections reading a changed source are evaluated again from their (re-annotated) input,
+- sections depending only on a changed criteria row get the current points and evidence of their option,
+
+and the score is summed again. The input annotation is loaded only if some section is evaluated again; inputs given
+as CNV coordinates are annotated again from a reference store.
+"""
+
+import contextlib
+import os
+from dataclasses import dataclass, field
+from typing import Any, Collection, Iterable, Iterator
+
+import annotation
+
+from marcnv.src.acmg import acmg_classify, annotation_view, classification, core, criterion, trace
+from marcnv.src.io import loader, reference
+
+# criteria files of gains and losses, as in the dependency labels of their rows
+CRITERIA_FILES = (os.path.basename(core.ACMG_GAIN_TSV_FILEPATH), os.path.basename(core.ACMG_LOSS_TSV_FILEPATH))
+
+
+@dataclass
+class ReclassifyResult:
+    input: str
+    prediction: classification.Prediction | None
+    dependencies: dict[str, list[str]] | None = None
+    error: str | None = None
+    # sections evaluated again and sections only rescored
+    evaluated: list[str] = field(default_factory=list)
+    rescored: list[str] = field(default_factory=list)
+
+
+def _is_criteria_row(dependency: str) -> bool:
+    return ":" in dependency
+
+
+def validate_changeset(changeset: Collection[str]) -> None:
+    for entry in changeset:
+        if entry in annotation_view.SOURCES or entry.split(":")[0] in CRITERIA_FILES:
+            continue
+        raise ValueError(
+            f"Unknown change {entry!r}, expected one of {', '.join(annotation_view.SOURCES)}, a criteria file "
+            f"({', '.join(CRITERIA_FILES)}) or its row (e.g. {CRITERIA_FILES[0]}:2A)."
+        )
+
+
+def is_affected(dependency: str, changeset: Collection[str]) -> bool:
+    return dependency in changeset or (_is_criteria_row(dependency) and dependency.split(":")[0] in changeset)
+
+
+def _load(input_path: str, projected: bool, reference_store: reference.ReferenceStore | None) -> annotation.Annotation:
+    if not reference.is_region(input_path):
+        return loader.load(input_path, projected)
+    if reference_store is None:
+        raise ValueError(f"{input_path} is given by its coordinates, annotating it again needs a reference store.")
+    return reference_store.annotation(reference.Region.parse(input_path), projected)
+
+
+def reclassify_record(
+    record: dict[str, Any],
+    changeset: Collection[str],
+    projected: bool = False,
+    reference_store: reference.ReferenceStore | None = None,
+) -> ReclassifyResult:
+    """Updates a stored prediction (a JSON line with its `input` and `dependencies`) by the changeset."""
+    input_path = record["input"]
+    dependencies: dict[str, list[str]] | None = record.get("dependencies")
+    if dependencies is None:
+        raise ValueError(f"No dependencies are stored for {input_path}, classify it with --dependencies.")
+    duplication = any(dep.split(":")[0] == CRITERIA_FILES[0] for deps in dependencies.values() for dep in deps)
+    prediction = classification.Prediction.from_dict(record)
+    sections = {section.section: section for section in prediction.criteria}
+
+    evaluated = [
+        name
+        for name in sections
+        if any(is_affected(dep, changeset) for dep in dependencies[name] if not _is_criteria_row(dep))
+    ]
+    rescored = [
+        name
+        for name in sections
+        if name not in evaluated and any(is_affected(dep, changeset) for dep in dependencies[name])
+    ]
+    if not evaluated and not rescored:
+        return ReclassifyResult(input=input_path, prediction=prediction, dependencies=dependencies)
+
+    acmg_criteria = criterion.get_acmg_criteria(duplication)
+    dependencies = dict(dependencies)
+    if evaluated:
+        annot = _load(input_path, projected, reference_store)
+        classifier = acmg_classify.MarCNVClassifier(annot, record_dependencies=True)
+        for name, option, reason in classifier.decide(evaluated):
+            sections[name] = acmg_classify.build_section_result(acmg_criteria, name, option, str(reason))
+        dependencies.update(classifier.dependencies)
+    for name in rescored:
+        section = sections[name]
+        sections[name] = acmg_classify.build_section_result(acmg_criteria, name, section.option, section.reason)
+
+    # summed in the section order, as by the classifier
+    score = round(sum([section.score for section in sections.values()]), 8)
+    return ReclassifyResult(
+        input=input_path,
+        prediction=classification.Prediction(score=score, criteria=list(sections.values())),
+        dependencies=dependencies,
+        evaluated=evaluated,
+        rescored=rescored,
+    )
+
+
+def reclassify_many(
+    records: Iterable[dict[str, Any]],
+    changeset: Collection[str],
+    projected: bool = False,
+    reference_path: str | None = None,
+) -> Iterator[ReclassifyResult]:
+    """Updates stored predictions in their order; a prediction that cannot be updated yields a result with an error.
+
+    Inputs given as CNV coordinates are annotated from the reference store in `reference_path`."""
+    validate_changeset(changeset)
+    opened = reference.ReferenceStore(reference_path) if reference_path is not None else contextlib.nullcontext()
+    with opened as reference_store:
+        for record in records:
+            try:
+                yield reclassify_record(record, changeset, projected, reference_store)
+            except Exception as e:
+                trace.logger.debug("Re-classification of %s failed", record.get("input"), exc_info=True)
+                yield ReclassifyResult(input=record.get("input", ""), prediction=None, error=f"{type(e).__name__}: {e}")
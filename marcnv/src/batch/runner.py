@@ -0,0 +1,274 @@
+import collections
+import functools
+import glob
+import itertools
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from marcnv.src.acmg import classification, criterion, metrics, profiling, trace
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.batch import cache
+from marcnv.src.io import loader, reference
+
+ANNOTATION_SUFFIXES = (".json", ".json.gz")
+
+
+@dataclass(frozen=True)
+class ClassifyOptions:
+    # add timings to the results
+    profile: bool = False
+    # load only the annotation data read by the classifier, see marcnv.src.io.loader
+    projected: bool = False
+    # path of the prediction cache, see marcnv.src.batch.cache
+    cache_path: str | None = None
+    cache_max_entries: int = cache.DEFAULT_MAX_ENTRIES
+    # record the dependencies of the section results, see marcnv.src.batch.reclassify
+    dependencies: bool = False
+    # directory of a reference store annotating CNVs given as chr:start-end:gain|loss, see marcnv.src.io.reference
+    reference: str | None = None
+    # measure the classifications for marcnv.src.acmg.metrics
+    metrics: bool = False
+
+    def __post_init__(self) -> None:
+        if self.dependencies and self.cache_path is not None:
+            raise ValueError("Dependencies are not stored in the prediction cache, they cannot be used together.")
+
+
+@dataclass
+class BatchResult:
+    input: str
+    prediction: classification.Prediction | None
+    error: str | None = None
+    timings: profiling.Timings | None = None
+    cached: bool = False
+    dependencies: dict[str, list[str]] | None = None
+    # input whose prediction was reused, see marcnv.src.batch.dedup
+    representative: str | None = None
+    observation: metrics.Observation | None = None
+
+
+def _is_annotation_file(path: str) -> bool:
+    return path.endswith(ANNOTATION_SUFFIXES)
+
+
+def _read_manifest(path: str) -> list[str]:
+    base_dir = os.path.dirname(os.path.abspath(path))
+    inputs: list[str] = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            inputs.append(line if os.path.isabs(line) or reference.is_region(line) else os.path.join(base_dir, line))
+    return inputs
+
+
+def collect_inputs(source: str) -> list[str]:
+    """Expands a directory, a glob pattern, a manifest file or a single annotation file into annotation paths.
+
+    CNV coordinates (chr:start-end:gain|loss), also in manifests, are kept as they are.
+    """
+    if reference.is_region(source):
+        return [source]
+    if os.path.isdir(source):
+        return sorted(os.path.join(source, name) for name in os.listdir(source) if _is_annotation_file(name))
+    if glob.has_magic(source):
+        return sorted(path for path in glob.glob(source) if _is_annotation_file(path))
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Batch input not found: {source}")
+    if _is_annotation_file(source):
+        return [source]
+    return _read_manifest(source)
+
+
+def output_name(input_path: str) -> str:
+    """Returns the file name of the prediction JSON for an annotation path or CNV coordinates."""
+    if reference.is_region(input_path):
+        return f"{reference.Region.parse(input_path).name}.json"
+    name = os.path.basename(input_path)
+    for suffix in ANNOTATION_SUFFIXES[::-1]:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return f"{name}.json"
+
+
+def output_name_conflicts(inputs: Iterable[str]) -> dict[str, list[str]]:
+    """Returns the prediction file names shared by different inputs, e.g. `a/s1.json.gz` and `b/s1.json.gz`, with
+    the inputs sharing them; the same input given twice does not conflict."""
+    sources: dict[str, dict[str, None]] = collections.defaultdict(dict)
+    for input_path in inputs:
+        key = input_path if reference.is_region(input_path) else os.path.abspath(input_path)
+        sources[output_name(input_path)].setdefault(key, None)
+    return {name: list(paths) for name, paths in sources.items() if len(paths) > 1}
+
+
+def _init_worker() -> None:
+    # warm up the per-process state, so the first CNV of each worker does not pay for it
+    criterion.get_acmg_criteria(duplication=True)
+    criterion.get_acmg_criteria(duplication=False)
+
+
+@functools.cache
+def _open_cache(path: str, max_entries: int) -> cache.PredictionCache:
+    # one connection per process, reused by all its CNVs
+    return cache.PredictionCache(path, max_entries=max_entries)
+
+
+@functools.cache
+def _open_reference(path: str) -> reference.ReferenceStore:
+    # mapped once per process, the pages are shared by all processes
+    return reference.ReferenceStore(path)
+
+
+def classify_file(input_path: str, options: ClassifyOptions = ClassifyOptions()) -> BatchResult:
+    profiler = profiling.Profiler() if options.profile else profiling.DISABLED
+    if options.metrics and not options.profile:
+        profiler = metrics.SectionTimer()
+    started = time.perf_counter()
+    try:
+        from_reference = options.reference is not None and reference.is_region(input_path)
+        if options.cache_path is None and not from_reference:
+            annot = loader.load(input_path, options.projected)
+        else:
+            if from_reference:
+                assert options.reference is not None
+                document = _open_reference(options.reference).document(reference.Region.parse(input_path))
+            else:
+                document = loader.read_document(input_path)
+            if options.cache_path is not None:
+                prediction_cache = _open_cache(options.cache_path, options.cache_max_entries)
+                key = cache.cache_key(document)
+                if (cached := prediction_cache.get(key)) is not None:
+                    observation = None
+                    if options.metrics:
+                        observation = metrics.Observation(load=time.perf_counter() - started, classify=0.0, sections={})
+                    return BatchResult(input=input_path, prediction=cached, cached=True, observation=observation)
+            annot = loader.project(document) if options.projected else loader.annotation_from_dict(document)
+            del document
+
+        loaded = time.perf_counter()
+        classifier = MarCNVClassifier(annot, profiler=profiler, record_dependencies=options.dependencies)
+        prediction = classifier.classify()
+        classified = time.perf_counter()
+
+        if options.cache_path is not None:
+            prediction_cache.put(key, prediction)
+    except Exception as e:
+        trace.logger.debug("Classification of %s failed", input_path, exc_info=True)
+        return BatchResult(input=input_path, prediction=None, error=f"{type(e).__name__}: {e}")
+    return BatchResult(
+        input=input_path,
+        prediction=prediction,
+        timings=profiler.timings if options.profile else None,
+        dependencies=classifier.dependencies if options.dependencies else None,
+        observation=(
+            metrics.Observation(loaded - started, classified - loaded, metrics.section_seconds(profiler))
+            if options.metrics
+            else None
+        ),
+    )
+
+
+def _classify_measured(input_path: str, options: ClassifyOptions) -> tuple[BatchResult, int]:
+    return classify_file(input_path, options), metrics.peak_memory()
+
+
+def _classify_recycling(
+    paths: list[str], workers: int, options: ClassifyOptions, max_worker_memory: int | None
+) -> Iterator[BatchResult]:
+    """Classifies in generations of worker pools: once a worker exceeds `max_worker_memory` (if given), no more files
+    are submitted, the pool is drained and replaced. If a worker dies (e.g. killed when out of memory), the pool is
+    replaced as well and the first unfinished file is classified alone; the file killing that worker too fails."""
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    position = 0
+    isolate = False
+    while position < len(paths):
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending: collections.deque[Future[tuple[BatchResult, int]]] = collections.deque()
+            submitted = position
+            recycle = False
+            while not recycle or pending:
+                window = 1 if isolate else 2 * workers
+                while not recycle and submitted < len(paths) and len(pending) < window:
+                    try:
+                        future = executor.submit(_classify_measured, paths[submitted], options)
+                    except BrokenProcessPool:
+                        if not pending:
+                            raise
+                        # a submitted file killed its worker, the results of the pending files tell which
+                        break
+                    pending.append(future)
+                    submitted += 1
+                if not pending:
+                    break
+                try:
+                    result, memory = pending.popleft().result()
+                except BrokenProcessPool:
+                    if isolate:
+                        error = "BrokenProcessPool: the worker process died while classifying it"
+                        yield BatchResult(input=paths[position], prediction=None, error=error)
+                        position += 1
+                    isolate = not isolate
+                    break
+                isolate = False
+                yield result
+                position += 1
+                recycle = recycle or (max_worker_memory is not None and memory > max_worker_memory)
+
+
+def classify_many(
+    inputs: Iterable[str],
+    workers: int | None = None,
+    chunksize: int = 16,
+    options: ClassifyOptions = ClassifyOptions(),
+    max_worker_memory: int | None = None,
+    threads: bool = False,
+) -> Iterator[BatchResult]:
+    """Classifies annotation files in a pool of worker processes, yielding results in the input order.
+
+    A file that cannot be loaded or classified yields a result with an error instead of stopping the run, also when it
+    kills its worker process (see `_classify_recycling`).
+    With `workers=1`, the files are classified in the current process, unless `max_worker_memory` (bytes) is given:
+    the worker processes are then replaced whenever one of them exceeds it.
+    With `threads`, the workers are threads of the current process, which scale only on free-threaded Python builds.
+    """
+    # the pools are imported on use, single files are classified without them
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    paths = list(inputs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if threads and max_worker_memory is not None:
+        raise ValueError("max_worker_memory applies to worker processes, it cannot be used with threads.")
+
+    if max_worker_memory is not None:
+        yield from _classify_recycling(paths, max(workers, 1), options, max_worker_memory)
+        return
+
+    if workers <= 1 or len(paths) <= 1:
+        _init_worker()
+        yield from (classify_file(path, options) for path in paths)
+        return
+
+    if threads:
+        _init_worker()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="marcnv-worker") as thread_executor:
+            yield from thread_executor.map(classify_file, paths, itertools.repeat(options))
+        return
+
+    position = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for result in executor.map(classify_file, paths, itertools.repeat(options), chunksize=chunksize):
+                yield result
+                position += 1
+    except BrokenProcessPool:
+        # the results of the dead worker are lost, the files from the first of them are classified again
+        trace.logger.warning("A worker process died, classifying the remaining %d files again.", len(paths) - position)
+        yield from _classify_recycling(paths[position:], workers, options, max_worker_memory=None)
@@ -0,0 +1,173 @@
+"""Sharded and resumable batch runs.
+
+The inputs are split into `count` contiguous shards (`shard`), so each node or process of a run classifies a
+deterministic part of the same input list and the shard outputs concatenated in their order follow the input order.
+
+A journaled run writes the predictions as JSON lines and keeps an append-only journal next to them
+(`<output>.journal`): a header identifying the input list, then one line per completed input with the offset and
+length of its prediction in the output (length 0 for failed inputs). Journal lines are appended in checkpoints,
+after the output is synced to disk, so the journal never refers to predictions that were not stored. A restarted run
+truncates the output to the end of the journaled predictions and continues with the first input not journaled.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Iterable, Self, Sequence
+
+from marcnv.src.batch import runner
+from marcnv.src.io import writers
+
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = ".journal"
+DEFAULT_CHECKPOINT_EVERY = 64
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """Parses `index/count`, indices start at 0."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {text!r}, expected index/count, e.g. 0/4") from None
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {text!r}, the index must be from 0 to count - 1")
+    return index, count
+
+
+def shard(inputs: Sequence[str], index: int, count: int) -> list[str]:
+    """Returns the `index`-th of `count` contiguous parts of the inputs, their sizes differ by at most one."""
+    return list(inputs[index * len(inputs) // count : (index + 1) * len(inputs) // count])
+
+
+def shard_path(path: str, index: int, count: int) -> str:
+    """Returns the output path of a shard, e.g. `predictions.shard-0-of-4.jsonl` for `predictions.jsonl`."""
+    base, extension = os.path.splitext(path)
+    return f"{base}.shard-{index}-of-{count}{extension}"
+
+
+def inputs_digest(inputs: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for path in inputs:
+        digest.update(path.encode() + b"\n")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    input: str
+    offset: int
+    length: int
+    error: str | None = None
+
+
+def read_journal(path: str) -> tuple[dict[str, Any], list[JournalEntry], int]:
+    """Returns the header, the entries and the size of the complete lines of a journal; a line cut by a crash is
+    ignored."""
+    with open(path, "rb") as f:
+        data = f.read()
+    size = data.rfind(b"\n") + 1
+    lines = data[:size].splitlines()
+    if not lines:
+        raise ValueError(f"The journal {path} has no header.")
+    header = json.loads(lines[0])
+    if header.get("version") != JOURNAL_VERSION:
+        raise ValueError(f"Unsupported version {header.get('version')} of the journal {path}.")
+    return header, [JournalEntry(**json.loads(line)) for line in lines[1:]], size
+
+
+class JournaledWriter:
+    """Writes predictions as JSON lines and journals them, resuming an interrupted run of the same inputs.
+
+    The results must be written in the input order; `completed` is the number of inputs already journaled, which
+    are not to be classified again.
+    """
+
+    def __init__(self, path: str, inputs: Sequence[str], checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY) -> None:
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.checkpoint_every = checkpoint_every
+        header = {"version": JOURNAL_VERSION, "inputs": len(inputs), "digest": inputs_digest(inputs)}
+
+        entries: list[JournalEntry] = []
+        if os.path.exists(self.journal_path):
+            journal_header, entries, size = read_journal(self.journal_path)
+            if journal_header != header:
+                raise ValueError(
+                    f"The journal {self.journal_path} belongs to another list of inputs, remove it to start over."
+                )
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(size)
+        else:
+            with open(self.journal_path, "w") as f:
+                f.write(json.dumps(header) + "\n")
+        # results are written in the input order, so the journaled inputs are the first ones
+        self.completed = len(entries)
+        end = max((entry.offset + entry.length for entry in entries), default=0)
+
+        # predictions written after the last checkpoint are written again
+        with open(self.path, "ab") as f:
+            if f.tell() < end:
+                raise ValueError(f"The output {self.path} is shorter than its journal, remove both to start over.")
+            f.truncate(end)
+        self.output: IO[bytes] = open(self.path, "ab")
+        self.journal: IO[str] = open(self.journal_path, "a")
+        self.pending: list[JournalEntry] = []
+
+    def write(self, result: runner.BatchResult) -> None:
+        offset = self.output.tell()
+        if result.prediction is None:
+            self.pending.append(JournalEntry(result.input, offset, 0, result.error))
+        else:
+            prediction = writers.prediction_to_dict(result.prediction, result.timings, result.dependencies)
+            record = {"input": result.input, **prediction}
+            data = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+            self.output.write(data)
+            self.pending.append(JournalEntry(result.input, offset, len(data)))
+        self.completed += 1
+        if len(self.pending) >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        self.output.flush()
+        os.fsync(self.output.fileno())
+        for entry in self.pending:
+            self.journal.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.pending.clear()
+
+    def close(self) -> None:
+        self.checkpoint()
+        self.output.close()
+        self.journal.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def merge(paths: Sequence[str], output: str) -> int:
+    """Concatenates journaled shard outputs in their order into `output`, returns the number of predictions.
+
+    Raises ValueError if a shard was not completed.
+    """
+    journals = []
+    for path in paths:
+        header, entries, _ = read_journal(path + JOURNAL_SUFFIX)
+        if len(entries) != header["inputs"]:
+            raise ValueError(f"The shard {path} is not complete: {len(entries)}/{header['inputs']} inputs journaled.")
+        journals.append(entries)
+
+    predictions = 0
+    with open(output, "wb") as merged:
+        for path, entries in zip(paths, journals):
+            end = max((entry.offset + entry.length for entry in entries), default=0)
+            with open(path, "rb") as f:
+                while end > 0 and (chunk := f.read(min(end, 2**20))):
+                    merged.write(chunk)
+                    end -= len(chunk)
+            predictions += sum(entry.length > 0 for entry in entries)
+    return predictions
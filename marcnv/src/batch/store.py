@@ -0,0 +1,292 @@
+"""Cohort store of predictions in SQLite, to query the results of batch runs without reading the prediction files.
+
+Every CNV is one row keyed by its sample, coordinates and input, with the score and severity of the prediction and the
+option, points, reason and evidence of every section in columns named as in the columnar output (e.g. `section2_option`,
+see marcnv.src.io.writers). The coordinates, severities, scores and section options are indexed, so cohort queries,
+severity histograms and re-exports read only the matching rows.
+"""
+
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Self
+
+from marcnv.src.acmg import classification
+from marcnv.src.io import reference, writers
+
+# recurrent CNVs of a sample are told apart by their inputs
+KEY = ("sample", "chromosome", "start", "end", "cnv_type", "input")
+SECTION_FIELDS = ("option", "score", "reason", "evidence")
+COLUMNS = (
+    *KEY,
+    "score",
+    "severity",
+    *(f"section{section}_{name}" for section in writers.SECTIONS for name in SECTION_FIELDS),
+)
+# columns the rows can be counted by, sections stand for their options
+COUNTED = ("severity", "sample", "chromosome", "cnv_type", *writers.SECTIONS)
+DEFAULT_BATCH_SIZE = 1000
+# stored in `PRAGMA user_version`, stores of other versions are refused
+SCHEMA_VERSION = 1
+
+_TYPES = {"start": "INTEGER", "end": "INTEGER", "score": "REAL"}
+_INTERVAL = re.compile(r"^(?P<chromosome>(chr)?[0-9A-Za-z_]+):(?P<start>\d+)-(?P<end>\d+)$")
+
+
+def _quote(column: str) -> str:
+    # `end` is an SQL keyword
+    return f'"{column}"'
+
+
+def _column_type(column: str) -> str:
+    return "REAL" if column.endswith("_score") else _TYPES.get(column, "TEXT")
+
+
+def _schema() -> list[str]:
+    columns = ",\n    ".join(f"{_quote(column)} {_column_type(column)} NOT NULL" for column in COLUMNS)
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS cnvs (\n    {columns},\n    PRIMARY KEY ({', '.join(map(_quote, KEY))})\n);",
+        "CREATE INDEX IF NOT EXISTS cnvs_region ON cnvs (chromosome, start);",
+        "CREATE INDEX IF NOT EXISTS cnvs_severity ON cnvs (severity, score);",
+        "CREATE INDEX IF NOT EXISTS cnvs_score ON cnvs (score);",
+    ]
+    for section in writers.SECTIONS:
+        statements.append(f"CREATE INDEX IF NOT EXISTS cnvs_section{section} ON cnvs (section{section}_option);")
+    return statements
+
+
+def parse_interval(text: str) -> tuple[str, int, int]:
+    """Parses `chr:start-end`, the `chr` prefix of the chromosome is optional."""
+    match = _INTERVAL.match(text.strip())
+    if match is None:
+        raise ValueError(f"Invalid interval {text!r}, expected chr:start-end")
+    chromosome = match["chromosome"] if match["chromosome"].startswith("chr") else f"chr{match['chromosome']}"
+    return chromosome, int(match["start"]), int(match["end"])
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass(frozen=True)
+class Query:
+    """Conditions on the stored CNVs; values of one condition are alternatives, conditions must all hold."""
+
+    samples: tuple[str, ...] = ()
+    severities: tuple[classification.Severity, ...] = ()
+    # section options, e.g. 2A, of any section
+    options: tuple[str, ...] = ()
+    # section and a text its reason contains (case-insensitive), e.g. ("2", "TS region")
+    reasons: tuple[tuple[str, str], ...] = ()
+    # chromosome, start and end of an interval the CNVs overlap
+    region: tuple[str, int, int] | None = None
+    cnv_type: str | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    sections: dict[str, list[str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "severities", tuple(classification.Severity(s) for s in self.severities))
+        sections: dict[str, list[str]] = {}
+        for option in self.options:
+            if option[:1] not in writers.SECTIONS:
+                raise ValueError(f"Unknown section of the option {option!r}.")
+            sections.setdefault(option[:1], []).append(option)
+        for section, _ in self.reasons:
+            if section not in writers.SECTIONS:
+                raise ValueError(f"Unknown section {section!r}.")
+        object.__setattr__(self, "sections", sections)
+
+    def where(self) -> tuple[str, list[Any]]:
+        """Returns the SQL condition of the query and its parameters."""
+        conditions: list[str] = []
+        params: list[Any] = []
+
+        def any_of(column: str, values: Iterable[Any]) -> None:
+            values = list(values)
+            conditions.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+        if self.samples:
+            any_of("sample", self.samples)
+        if self.severities:
+            any_of("severity", (severity.value for severity in self.severities))
+        for section, options in self.sections.items():
+            any_of(f"section{section}_option", options)
+        for section, text in self.reasons:
+            conditions.append(f"section{section}_reason LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(text)}%")
+        if self.region is not None:
+            chromosome, start, end = self.region
+            conditions.append('chromosome = ? AND start <= ? AND "end" >= ?')
+            params.extend((chromosome, end, start))
+        if self.cnv_type is not None:
+            conditions.append("cnv_type = ?")
+            params.append(self.cnv_type)
+        if self.min_score is not None:
+            conditions.append("score >= ?")
+            params.append(self.min_score)
+        if self.max_score is not None:
+            conditions.append("score <= ?")
+            params.append(self.max_score)
+        return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+
+@dataclass
+class StoredPrediction:
+    sample: str
+    region: reference.Region
+    input: str
+    prediction: classification.Prediction
+
+
+def _row(sample: str, region: reference.Region, input_path: str, prediction: classification.Prediction) -> tuple:
+    sections = {section.section: section for section in prediction.criteria}
+    if sections.keys() != set(writers.SECTIONS):
+        sections_text = ", ".join(writers.SECTIONS)
+        raise ValueError(f"Prediction of {input_path} does not have exactly the sections {sections_text}.")
+    values: list[Any] = [sample, region.chromosome, region.start, region.end, region.cnv_type, input_path]
+    values += [prediction.score, prediction.severity.value]
+    for section in writers.SECTIONS:
+        values += [getattr(sections[section], name) for name in SECTION_FIELDS]
+    return tuple(values)
+
+
+def _stored(row: sqlite3.Row) -> StoredPrediction:
+    criteria = [
+        classification.SectionResult(
+            section=section,
+            option=row[f"section{section}_option"],
+            reason=row[f"section{section}_reason"],
+            score=row[f"section{section}_score"],
+            evidence=row[f"section{section}_evidence"],
+        )
+        for section in writers.SECTIONS
+    ]
+    return StoredPrediction(
+        sample=row["sample"],
+        region=reference.Region(row["chromosome"], row["start"], row["end"], row["cnv_type"]),
+        input=row["input"],
+        prediction=classification.Prediction(score=row["score"], criteria=criteria),
+    )
+
+
+class CohortStore:
+    """Store of the predictions of a cohort in one SQLite file.
+
+    Added predictions are inserted in transactions of `batch_size` rows. A prediction of the same sample, CNV and input
+    as a stored one replaces it and is counted in `replaced`. Several processes may write to the same store.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, timeout: float = 60.0) -> None:
+        self.path = os.path.abspath(path)
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self._create_schema()
+        except Exception:
+            self.connection.close()
+            raise
+        self._pending: list[tuple] = []
+        self.replaced = 0
+
+    def _create_schema(self) -> None:
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            exists = self.connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'cnvs'").fetchone()
+            if exists is not None and version != SCHEMA_VERSION:
+                raise ValueError(f"Cohort store {self.path} was written by another version of marcnv, rebuild it.")
+            for statement in _schema():
+                self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def add(
+        self,
+        input_path: str,
+        prediction: classification.Prediction,
+        sample: str = "",
+        region: reference.Region | None = None,
+    ) -> None:
+        """Adds the prediction of an annotation file or of CNV coordinates; the coordinates of a file are read from it
+        unless given."""
+        self._pending.append(_row(sample, region or reference.describe(input_path), input_path, prediction))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" * len(COLUMNS))
+        stored = f"SELECT 1 FROM cnvs WHERE {' AND '.join(f'{_quote(column)} = ?' for column in KEY)}"
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            keys = {row[: len(KEY)] for row in self._pending}
+            replaced = len(self._pending) - len(keys)
+            replaced += sum(self.connection.execute(stored, key).fetchone() is not None for key in keys)
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO cnvs ({', '.join(map(_quote, COLUMNS))}) VALUES ({placeholders})",
+                self._pending,
+            )
+        self.replaced += replaced
+        self._pending.clear()
+
+    def select(self, query: Query = Query()) -> Iterator[StoredPrediction]:
+        """Yields the stored predictions matching the query, ordered by sample, coordinates and input."""
+        self.flush()
+        where, params = query.where()
+        rows = self.connection.execute(f"SELECT * FROM cnvs {where} ORDER BY {', '.join(map(_quote, KEY))}", params)
+        yield from map(_stored, rows)
+
+    def count(self, by: str, query: Query = Query()) -> dict[str, int]:
+        """Returns the number of matching CNVs per severity, sample, chromosome, CNV type or option of a section."""
+        if by not in COUNTED:
+            raise ValueError(f"Cannot count by {by!r}, expected one of {', '.join(COUNTED)}.")
+        self.flush()
+        column = f"section{by}_option" if by in writers.SECTIONS else by
+        where, params = query.where()
+        rows = self.connection.execute(
+            f"SELECT {column}, COUNT(*) FROM cnvs {where} GROUP BY {column} ORDER BY {column}", params
+        )
+        return {value: count for value, count in rows}
+
+    def score_distribution(self, query: Query = Query()) -> dict[str, dict[str, float]]:
+        """Returns the count and the minimal, mean and maximal score of the matching CNVs per severity."""
+        self.flush()
+        where, params = query.where()
+        rows = self.connection.execute(
+            f"SELECT severity, COUNT(*), MIN(score), AVG(score), MAX(score) FROM cnvs {where} GROUP BY severity",
+            params,
+        )
+        distribution = {
+            severity: {"count": count, "min": low, "mean": mean, "max": high}
+            for severity, count, low, mean, high in rows
+        }
+        return {s.value: distribution[s.value] for s in classification.Severity if s.value in distribution}
+
+    def export(self, writer: writers.JSONLinesWriter | writers.ColumnarWriter, query: Query = Query()) -> int:
+        """Writes the matching predictions as in a batch run, returns their number."""
+        count = 0
+        for stored in self.select(query):
+            writer.write(stored.input, stored.prediction)
+            count += 1
+        return count
+
+    def __len__(self) -> int:
+        self.flush()
+        return int(self.connection.execute("SELECT COUNT(*) FROM cnvs").fetchone()[0])
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,154 @@
+"""Classification of CNVs under many values of the ACMG criteria constants (`core.Parameters`).
+
+Every annotation is loaded once. Sections 1, 4 and 5 and the number of protein coding genes do not depend on the
+parameters and are evaluated once per CNV, section 2 once per distinct `hi_ts_scores` and `min_frequency_benign`
+(all of them share the annotation queries), and section 3 once per configuration. No reason is rendered.
+"""
+
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+import annotation
+
+from marcnv.src.acmg import acmg_classify, annotation_view, classification, core, criterion, trace
+from marcnv.src.io import loader
+
+PARAMETERS = tuple(f.name for f in fields(core.Parameters))
+TABLE_COLUMNS = (
+    "input",
+    "configuration",
+    *PARAMETERS,
+    *(f"section{section}" for section in acmg_classify.SECTIONS),
+    "score",
+    "severity",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigurationResult:
+    options: dict[str, str]
+    score: float
+    severity: classification.Severity
+
+
+@dataclass
+class SweepResult:
+    input: str
+    # one result per configuration, in their order
+    results: list[ConfigurationResult] | None
+    error: str | None = None
+
+
+def grid(**values: Sequence[Any]) -> list[core.Parameters]:
+    """Returns all combinations of the given values of parameters, the other parameters keep their defaults.
+
+    For example `grid(min_frequency_benign=[0.005, 0.01], hi_ts_scores=[(3,), (2, 3)])` gives 4 configurations.
+    """
+    return [core.Parameters(**dict(zip(values, combination))) for combination in itertools.product(*values.values())]
+
+
+def sweep_annotation(
+    annot: annotation.Annotation, configurations: Sequence[core.Parameters]
+) -> list[acmg_classify.Screening]:
+    """Returns the screening of the CNV for every configuration, identical to `MarCNVClassifier.screen` with them."""
+    view = annotation_view.AnnotationView(annot)
+    duplication = view.cnv.is_duplication
+    acmg_criteria = criterion.get_acmg_criteria(duplication)
+
+    protein_gene_count = len(view.get_genes(gene_type="protein_coding"))
+    section1 = acmg_classify.decide_section1(protein_gene_count, view.count_regulatory_types()["enhancer"])
+    section4 = acmg_classify.decide_section4(view.cnv.genomic_coord, view.get_common_variability_regions())
+    section5 = acmg_classify.decide_section5()
+    section2: dict[tuple[tuple[int, ...], float], tuple[str, acmg_classify.Reason]] = {}
+
+    screenings = []
+    for parameters in configurations:
+        key = (parameters.hi_ts_scores, parameters.min_frequency_benign)
+        if key not in section2:
+            section2[key] = acmg_classify.decide_section2(view, parameters=parameters)
+        section3 = acmg_classify.decide_section3(protein_gene_count, duplication, parameters)
+        decisions = [("1", *section1), ("2", *section2[key]), ("3", *section3), ("4", *section4), ("5", *section5)]
+        screenings.append(acmg_classify.Screening.from_decisions(acmg_criteria, decisions))
+    return screenings
+
+
+def sweep_file(input_path: str, configurations: Sequence[core.Parameters], projected: bool = False) -> SweepResult:
+    try:
+        screenings = sweep_annotation(loader.load(input_path, projected), configurations)
+    except Exception as e:
+        trace.logger.debug("Sweep of %s failed", input_path, exc_info=True)
+        return SweepResult(input=input_path, results=None, error=f"{type(e).__name__}: {e}")
+    # only the options and scores are sent back from the worker processes
+    results = [ConfigurationResult(s.options, s.score, s.severity) for s in screenings]
+    return SweepResult(input=input_path, results=results)
+
+
+def _init_worker() -> None:
+    criterion.get_acmg_criteria(duplication=True)
+    criterion.get_acmg_criteria(duplication=False)
+
+
+def sweep_many(
+    inputs: Iterable[str],
+    configurations: Sequence[core.Parameters],
+    workers: int | None = None,
+    projected: bool = False,
+    chunksize: int = 4,
+) -> Iterator[SweepResult]:
+    """Sweeps annotation files in a pool of worker processes, yielding results in the input order.
+
+    A file that cannot be loaded or classified yields a result with an error instead of stopping the run.
+    """
+    paths = list(inputs)
+    configurations = list(configurations)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(paths) <= 1:
+        _init_worker()
+        yield from (sweep_file(path, configurations, projected) for path in paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        yield from executor.map(
+            sweep_file,
+            paths,
+            itertools.repeat(configurations),
+            itertools.repeat(projected),
+            chunksize=chunksize,
+        )
+
+
+def format_value(value: Any) -> str:
+    if isinstance(value, tuple):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def table_rows(result: SweepResult, configurations: Sequence[core.Parameters]) -> Iterator[dict[str, Any]]:
+    """Yields one row per configuration of a successful result, with the columns of TABLE_COLUMNS."""
+    for index, (parameters, outcome) in enumerate(zip(configurations, result.results or [])):
+        yield {
+            "input": result.input,
+            "configuration": index,
+            **{name: format_value(getattr(parameters, name)) for name in PARAMETERS},
+            **{f"section{section}": option for section, option in outcome.options.items()},
+            "score": outcome.score,
+            "severity": outcome.severity.value,
+        }
+
+
+class TableWriter:
+    """Writes the sweep results as a tab separated table, one row per CNV and configuration."""
+
+    def __init__(self, stream: IO[str], configurations: Sequence[core.Parameters]) -> None:
+        self.configurations = configurations
+        self.writer = csv.DictWriter(stream, fieldnames=TABLE_COLUMNS, delimiter="\t", lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, result: SweepResult) -> None:
+        self.writer.writerows(table_rows(result, self.configurations))
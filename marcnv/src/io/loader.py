@@ -0,0 +1,307 @@
+import gzip
+import json
+import re
+import sys
+from typing import IO, Any, Iterator, cast
+
+import annotation
+
+_FIRST_KEY_CNV = re.compile(r'\s*\{\s*"cnv"\s*:\s*')
+
+# Sources of the annotation, the keys of its JSON besides "cnv".
+SOURCES = (
+    "_benign_cnv",
+    "_benign_cnv_gs_inner",
+    "_benign_cnv_gs_outer",
+    "_regulatory",
+    "_gnomad",
+    "_hi_gene",
+    "_hi_region",
+    "_genes",
+)
+
+# Sources of the annotation never queried by the classifier, loaded as empty.
+SKIPPED_SOURCES = ("_benign_cnv", "_benign_cnv_gs_inner")
+
+# Queries without arguments answered once from the full document; their sources are then loaded as empty.
+PRECOMPUTED_QUERIES = {
+    "count_regulatory_types": "_regulatory",
+    "get_common_variability_regions": "_gnomad",
+}
+
+# Record fields of each source neither read by the classifier nor by the annotation queries it issues.
+DROPPED_FIELDS: dict[str, frozenset[str]] = {
+    "_genes": frozenset(
+        {
+            "_id",
+            "source",
+            "phase",
+            "level",
+            "havana_gene",
+            "full_name",
+            "alternative_names",
+            "external",
+            "pathways",
+            "function",
+            "expression",
+            "phenotype",
+        }
+    ),
+    "_benign_cnv_gs_outer": frozenset({"_id"}),
+}
+
+# Sub-features of transcripts (exons, CDS, UTRs, codons) repeat the attributes of their transcript, only their
+# coordinates are needed to locate the transcript regions.
+TRANSCRIPT_FEATURES = ("exon", "CDS", "start_codon", "stop_codon", "five_prime_UTR", "three_prime_UTR")
+KEPT_FEATURE_FIELDS = frozenset({"start", "end", "strand", "phase", "exon_number"})
+
+# Fields with few distinct values, stored once per process.
+INTERNED_FIELDS = frozenset({"chromosome", "strand", "gene_type", "cnv_type"})
+
+
+class ProjectedAnnotation(annotation.Annotation):
+    """Annotation holding only the data read by the classifier, with the answers of precomputed queries."""
+
+    _precomputed: dict[str, Any]
+
+    def count_regulatory_types(self) -> Any:
+        return self._precomputed["count_regulatory_types"]
+
+    def get_common_variability_regions(self) -> Any:
+        return self._precomputed["get_common_variability_regions"]
+
+
+def _compact(record: dict[str, Any], dropped: frozenset[str]) -> dict[str, Any]:
+    compact: dict[str, Any] = {}
+    for key, value in record.items():
+        if key in dropped:
+            continue
+        if key in INTERNED_FIELDS and isinstance(value, str):
+            value = sys.intern(value)
+        compact[key] = value
+    return compact
+
+
+def _compact_gene(gene: dict[str, Any]) -> dict[str, Any]:
+    compact = _compact(gene, DROPPED_FIELDS["_genes"])
+    if "transcript" in compact:
+        transcripts = []
+        for transcript in compact["transcript"]:
+            transcript = dict(transcript)
+            for feature in TRANSCRIPT_FEATURES:
+                if feature in transcript:
+                    transcript[feature] = [
+                        {key: value for key, value in record.items() if key in KEPT_FEATURE_FIELDS}
+                        for record in transcript[feature]
+                    ]
+            transcripts.append(transcript)
+        compact["transcript"] = transcripts
+    return compact
+
+
+def _project(document: dict[str, Any]) -> dict[str, Any]:
+    projected: dict[str, Any] = {}
+    for source, records in document.items():
+        if source in SKIPPED_SOURCES or source in PRECOMPUTED_QUERIES.values():
+            projected[source] = []
+        elif source == "_genes":
+            projected[source] = [_compact_gene(gene) for gene in records]
+        elif source in DROPPED_FIELDS:
+            projected[source] = [_compact(record, DROPPED_FIELDS[source]) for record in records]
+        else:
+            projected[source] = records
+    return projected
+
+
+def annotation_from_dict(
+    document: dict[str, Any], cls: type[annotation.Annotation] = annotation.Annotation
+) -> annotation.Annotation:
+    """Builds the annotation from a document with the layout of the annotation JSON, without re-reading any file.
+
+    As in the JSON, the document holds the CNV under "cnv" and every other key is an argument of the annotation.
+    """
+    sources = {key: value for key, value in document.items() if key != "cnv"}
+    return cls(cnv=annotation.CNVRegionAnnotation(**document["cnv"]), **sources)
+
+
+def _precompute(cnv: dict[str, Any], source: str, records: list[Any]) -> dict[str, Any]:
+    # the queries read only their own source, the other sources are left empty
+    sources = {key: [] for key in SOURCES} | {source: records}
+    single = annotation_from_dict({"cnv": cnv, **sources})
+    return {query: getattr(single, query)() for query, read in PRECOMPUTED_QUERIES.items() if read == source}
+
+
+def _projected_annotation(
+    cnv: dict[str, Any], sources: dict[str, Any], precomputed: dict[str, Any]
+) -> ProjectedAnnotation:
+    annot = cast(ProjectedAnnotation, annotation_from_dict({"cnv": cnv, **sources}, cls=ProjectedAnnotation))
+    annot._precomputed = precomputed
+    return annot
+
+
+def project(document: dict[str, Any]) -> ProjectedAnnotation:
+    """Builds an annotation keeping only the parts of an already parsed document the classifier reads.
+
+    The projection follows the parse, so the whole document is in memory meanwhile; to load a file without ever
+    holding all of it, see load_projected.
+    """
+    precomputed: dict[str, Any] = {}
+    for source in set(PRECOMPUTED_QUERIES.values()):
+        precomputed |= _precompute(document["cnv"], source, document.get(source, []))
+    projected = _project(document)
+    return _projected_annotation(projected.pop("cnv"), projected, precomputed)
+
+
+class _JSONReader:
+    """Decodes a JSON text stream piecewise: the members of its top object and the items of their arrays one by one,
+    so only the current item and the unread rest of the last chunk are held as text."""
+
+    def __init__(self, stream: IO[str], chunk_size: int = 1 << 16) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # reads at least the unread rest again, so a long value is retried only logarithmically often
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it, or "" at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos : self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if (found := self.peek()) != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}, found {found!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number may continue in the next chunk
+            if end < len(self.buffer) or not self._fill():
+                self.pos = end
+                return value
+
+    def _members(self, close: str) -> Iterator[None]:
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect(close)
+                return
+
+    def keys(self) -> Iterator[str]:
+        """Yields the keys of an object, each before its value, which the caller reads (`value` or `items`)."""
+        self.expect("{")
+        for _ in self._members("}"):
+            key = self.value()
+            self.expect(":")
+            yield key
+
+    def items(self) -> Iterator[Any]:
+        """Yields the items of an array one by one."""
+        self.expect("[")
+        for _ in self._members("]"):
+            yield self.value()
+
+
+def _read_projected(stream: IO[str], chunk_size: int = 1 << 16) -> ProjectedAnnotation:
+    reader = _JSONReader(stream, chunk_size)
+    cnv: dict[str, Any] | None = None
+    sources: dict[str, Any] = {}
+    precomputed: dict[str, Any] = {}
+    # sources of precomputed queries read before the CNV, as written by other tools than the annotation package
+    waiting: dict[str, list[Any]] = {}
+    for key in reader.keys():
+        if key == "cnv":
+            cnv = reader.value()
+            for source, records in waiting.items():
+                precomputed |= _precompute(cnv, source, records)
+            waiting.clear()
+            continue
+        if reader.peek() != "[":
+            sources[key] = reader.value()
+            continue
+        if key in SKIPPED_SOURCES:
+            for _ in reader.items():
+                pass
+            sources[key] = []
+        elif key in PRECOMPUTED_QUERIES.values():
+            if cnv is None:
+                waiting[key] = list(reader.items())
+            else:
+                precomputed |= _precompute(cnv, key, list(reader.items()))
+            sources[key] = []
+        elif key == "_genes":
+            sources[key] = [_compact_gene(gene) for gene in reader.items()]
+        elif key in DROPPED_FIELDS:
+            sources[key] = [_compact(record, DROPPED_FIELDS[key]) for record in reader.items()]
+        else:
+            sources[key] = list(reader.items())
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+    if cnv is None:
+        raise KeyError("cnv")
+    return _projected_annotation(cnv, sources, precomputed)
+
+
+def read_document(path: str) -> dict[str, Any]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        document: dict[str, Any] = json.load(f)
+    return document
+
+
+def read_cnv(path: str, prefix_size: int = 1 << 16) -> dict[str, Any]:
+    """Returns the CNV of an annotation JSON. If it is the first key, as written by the annotation package, only the
+    beginning of the file is decoded."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        prefix = f.read(prefix_size)
+    if (match := _FIRST_KEY_CNV.match(prefix)) is not None:
+        try:
+            cnv, _ = json.JSONDecoder().raw_decode(prefix, match.end())
+            return cast(dict[str, Any], cnv)
+        except json.JSONDecodeError:
+            pass
+    return cast(dict[str, Any], read_document(path)["cnv"])
+
+
+def load_projected(path: str) -> ProjectedAnnotation:
+    """Loads an annotation JSON (optionally gzipped), keeping only the data used by the classifier.
+
+    The file is decoded incrementally, one record at a time, and every record is projected as soon as it is decoded,
+    so the full document is never in memory.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return _read_projected(f)
+
+
+def load(path: str, projected: bool = False) -> annotation.Annotation:
+    if projected:
+        return load_projected(path)
+    return annotation.Annotation.load_from_json(path)
@@ -0,0 +1,246 @@
+"""Local reference store: annotation of CNVs given by coordinates (`chr1:1000-2000:gain`) without annotation JSON.
+
+The store is a directory built from JSON lines tables (e.g. `mongoexport` output, optionally gzipped) of the records
+the annotation JSON holds, one table per knowledge source (see `SOURCE_KEYS`):
+
+- `manifest.json`: format version, byte order, and the rows of each chromosome in every source,
+- `<source>.records`: the records as compact JSON, in the order of the input table,
+- `<source>.index`: int64 columns over the rows sorted by chromosome and start: start, end, running maximum of the
+  end within the chromosome, offset and length of the record, and its row in the input table.
+
+The index and the records are memory-mapped read-only, so any number of worker processes share one copy in the
+page cache. A CNV is annotated with the records overlapping it, in the order of the input tables, which gives the
+same document as the annotation JSON: the annotation queries of the classifier answer it unchanged.
+"""
+
+import bisect
+import gzip
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterator, Self
+
+import annotation
+
+from marcnv.src.acmg import annotation_view
+from marcnv.src.io import loader
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# document key of the records of each knowledge source
+SOURCE_KEYS = {
+    annotation_view.GENES: "_genes",
+    annotation_view.REGULATORY: "_regulatory",
+    annotation_view.DOSAGE_GENES: "_hi_gene",
+    annotation_view.DOSAGE_REGIONS: "_hi_region",
+    annotation_view.BENIGN_CNVS: "_benign_cnv_gs_outer",
+    annotation_view.GNOMAD: "_gnomad",
+}
+
+# columns of the index files, in their order
+INDEX_COLUMNS = ("start", "end", "max_end", "offset", "length", "row")
+
+_REGION = re.compile(r"^(?P<chromosome>(chr)?[0-9A-Za-z_]+):(?P<start>\d+)-(?P<end>\d+):(?P<cnv_type>gain|loss)$")
+
+
+@dataclass(frozen=True)
+class Region:
+    chromosome: str
+    start: int
+    end: int
+    cnv_type: str
+
+    @classmethod
+    def parse(cls, text: str) -> "Region":
+        """Parses `chr:start-end:gain|loss`, the `chr` prefix of the chromosome is optional."""
+        match = _REGION.match(text.strip())
+        if match is None:
+            raise ValueError(f"Invalid CNV {text!r}, expected chr:start-end:gain|loss")
+        chromosome = match["chromosome"] if match["chromosome"].startswith("chr") else f"chr{match['chromosome']}"
+        start, end = int(match["start"]), int(match["end"])
+        if start >= end:
+            raise ValueError(f"Invalid CNV {text!r}, the start must be before the end")
+        return cls(chromosome, start, end, match["cnv_type"])
+
+    @property
+    def name(self) -> str:
+        return f"{self.chromosome}_{self.start}_{self.end}_{self.cnv_type}"
+
+    def cnv(self) -> dict[str, Any]:
+        """Returns the CNV in the form of the annotation JSON."""
+        return {
+            "chr": self.chromosome,
+            "start": self.start,
+            "end": self.end,
+            "cnv_type": self.cnv_type,
+            "length": self.end - self.start,
+            "name": self.name,
+            # cytobands are not part of the store and the classifier does not read them
+            "cytogenetic_position": "",
+        }
+
+
+def is_region(text: str) -> bool:
+    return _REGION.match(text.strip()) is not None
+
+
+def describe(input_path: str) -> Region:
+    """Returns the coordinates of an annotation file or of CNV coordinates."""
+    if is_region(input_path):
+        return Region.parse(input_path)
+    cnv = loader.read_cnv(input_path)
+    return Region(cnv["chr"], cnv["start"], cnv["end"], cnv["cnv_type"])
+
+
+def _read_table(path: str) -> Iterator[dict[str, Any]]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _build_source(table: str | None, records_path: str, index_path: str) -> dict[str, list[int]]:
+    chromosomes: dict[str, int] = {}
+    codes, columns = array("q"), {name: array("q") for name in INDEX_COLUMNS if name != "max_end"}
+    with open(records_path, "wb") as records:
+        for row, record in enumerate(_read_table(table) if table is not None else []):
+            record.pop("_id", None)
+            data = json.dumps(record, separators=(",", ":")).encode()
+            codes.append(chromosomes.setdefault(record["chromosome"], len(chromosomes)))
+            columns["start"].append(record["start"])
+            columns["end"].append(record["end"])
+            columns["offset"].append(records.tell())
+            columns["length"].append(len(data))
+            columns["row"].append(row)
+            records.write(data)
+
+    names = sorted(chromosomes, key=lambda name: chromosomes[name])
+    order = sorted(range(len(codes)), key=lambda i: (names[codes[i]], columns["start"][i]))
+    sorted_columns = {name: array("q", (values[i] for i in order)) for name, values in columns.items()}
+
+    ranges: dict[str, list[int]] = {}
+    max_end = sorted_columns["max_end"] = array("q", sorted_columns["end"])
+    for position, i in enumerate(order):
+        chromosome = names[codes[i]]
+        if chromosome not in ranges:
+            ranges[chromosome] = [position, position]
+        else:
+            max_end[position] = max(max_end[position], max_end[position - 1])
+        ranges[chromosome][1] = position + 1
+
+    with open(index_path, "wb") as index:
+        for name in INDEX_COLUMNS:
+            sorted_columns[name].tofile(index)
+    return ranges
+
+
+def build(output_dir: str, tables: dict[str, str | None]) -> None:
+    """Builds the store in `output_dir` from JSON lines tables keyed by source, a missing source is stored empty."""
+    unknown = tables.keys() - SOURCE_KEYS.keys()
+    if unknown:
+        raise ValueError(f"Unknown sources {sorted(unknown)}, expected some of {list(SOURCE_KEYS)}")
+    os.makedirs(output_dir, exist_ok=True)
+    sources = {}
+    for source in SOURCE_KEYS:
+        ranges = _build_source(
+            tables.get(source),
+            os.path.join(output_dir, f"{source}.records"),
+            os.path.join(output_dir, f"{source}.index"),
+        )
+        sources[source] = {"rows": sum(end - start for start, end in ranges.values()), "chromosomes": ranges}
+    manifest = {"version": FORMAT_VERSION, "byteorder": sys.byteorder, "sources": sources}
+    with open(os.path.join(output_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _map(path: str) -> mmap.mmap | None:
+    # empty files cannot be mapped
+    if os.path.getsize(path) == 0:
+        return None
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Source:
+    def __init__(self, directory: str, name: str, manifest: dict[str, Any]) -> None:
+        self.rows: int = manifest["rows"]
+        self.chromosomes: dict[str, list[int]] = manifest["chromosomes"]
+        self.records = _map(os.path.join(directory, f"{name}.records"))
+        self.index = _map(os.path.join(directory, f"{name}.index"))
+        self._view = memoryview(self.index).cast("q") if self.index is not None else memoryview(array("q"))
+        self.columns = {name: self._view[i * self.rows : (i + 1) * self.rows] for i, name in enumerate(INDEX_COLUMNS)}
+
+    def overlapping(self, chromosome: str, start: int, end: int) -> list[dict[str, Any]]:
+        """Returns the records overlapping the interval (bounds included), in the order of the input table."""
+        if chromosome not in self.chromosomes or self.records is None:
+            return []
+        low, high = self.chromosomes[chromosome]
+        starts, ends, max_ends = self.columns["start"], self.columns["end"], self.columns["max_end"]
+        # rows before `first` end before the interval, rows from `last` start after it
+        first = bisect.bisect_left(max_ends, start, low, high)
+        last = bisect.bisect_right(starts, end, first, high)
+        rows = sorted(
+            (self.columns["row"][i], self.columns["offset"][i], self.columns["length"][i])
+            for i in range(first, last)
+            if ends[i] >= start
+        )
+        # decoded at once, which is much faster than record by record
+        records = self.records
+        return json.loads(b"[" + b",".join([records[offset : offset + length] for _, offset, length in rows]) + b"]")
+
+    def close(self) -> None:
+        # the mappings can be closed only once no view of them is left
+        for column in self.columns.values():
+            column.release()
+        self.columns.clear()
+        self._view.release()
+        for mapping in (self.index, self.records):
+            if mapping is not None:
+                mapping.close()
+
+
+class ReferenceStore:
+    """Read-only store opened from a directory built by `build`."""
+
+    def __init__(self, directory: str) -> None:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported version {manifest['version']} of the reference store {directory}.")
+        if manifest["byteorder"] != sys.byteorder:
+            raise ValueError(f"The reference store {directory} was built on a {manifest['byteorder']} endian machine.")
+        self.directory = directory
+        self.sources = {name: _Source(directory, name, manifest["sources"][name]) for name in SOURCE_KEYS}
+
+    def records(self, source: str, region: Region) -> list[dict[str, Any]]:
+        """Returns the records of a source overlapping the CNV."""
+        return self.sources[source].overlapping(region.chromosome, region.start, region.end)
+
+    def document(self, region: Region) -> dict[str, Any]:
+        """Returns the annotation document of the CNV, as in the annotation JSON."""
+        document: dict[str, Any] = {"cnv": region.cnv()}
+        for source in loader.SKIPPED_SOURCES:
+            document[source] = []
+        for name, key in SOURCE_KEYS.items():
+            document[key] = self.records(name, region)
+        return document
+
+    def annotation(self, region: Region, projected: bool = False) -> annotation.Annotation:
+        document = self.document(region)
+        return loader.project(document) if projected else loader.annotation_from_dict(document)
+
+    def close(self) -> None:
+        for source in self.sources.values():
+            source.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,235 @@
+"""Streaming classification of annotation documents read from stdin or a pipe.
+
+The stream holds annotation documents (the content of annotation JSONs), newline-delimited or simply concatenated,
+optionally gzipped (also as concatenated gzip members). Predictions are written as JSON lines in the input order.
+
+The work is pipelined over three threads connected by bounded queues: the reader decompresses the stream, splits it
+into documents and decodes them, the calling thread classifies them and the writer serializes the predictions.
+Reading and decompression release the GIL, so they overlap with the classification; the queues bound the number of
+documents held in memory when one stage is slower than the others.
+"""
+
+import codecs
+import gzip
+import io
+import json
+import queue
+import threading
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Iterable, Iterator, cast
+
+from marcnv.src.acmg import classification, trace
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.io import loader, writers
+
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK_SIZE = 1 << 20
+# documents larger than this are taken for a malformed stream instead of being buffered further
+MAX_DOCUMENT_CHARS = 256 * 2**20
+DEFAULT_QUEUE_SIZE = 8
+
+_WHITESPACE = " \t\n\r"
+_END = object()
+
+
+class StreamError(ValueError):
+    pass
+
+
+def read_text(binary: IO[bytes], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yields the text of a binary stream as it arrives, decompressed if it starts as gzip."""
+    buffered = binary if isinstance(binary, io.BufferedReader) else io.BufferedReader(cast(io.RawIOBase, binary))
+    source: gzip.GzipFile | io.BufferedReader = buffered
+    if buffered.peek(2)[:2] == GZIP_MAGIC:
+        source = gzip.GzipFile(fileobj=buffered)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # unlike read, read1 returns what is available without waiting for a full chunk from a pipe
+    while data := source.read1(chunk_size):
+        if text := decoder.decode(data):
+            yield text
+    if text := decoder.decode(b"", final=True):
+        yield text
+
+
+def iter_documents(chunks: Iterable[str], max_document_chars: int = MAX_DOCUMENT_CHARS) -> Iterator[Any]:
+    """Yields the JSON documents of a text, given in chunks, one per line or concatenated.
+
+    Decoding of an incomplete document is attempted once its end is likely: at the end of its first line if it ends
+    with `}` (a document per line), at a `}` starting a line (the end of an indented document), or when the pending
+    text has doubled since the last attempt, so every document is decoded at most about twice. Once documents are
+    found at these ends of lines, only those are followed and every document is decoded once.
+    Raises StreamError for malformed or truncated documents.
+    """
+    decoder = json.JSONDecoder()
+    parts: list[str] = []
+    size = threshold = 0
+    # whether no newline was read since the pending document started, and the last character read
+    first_line, previous = True, ""
+    # whether the last documents were found at the hints of their ends, then only the hints are followed
+    delimited = False
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        window = previous + chunk
+        previous = chunk[-1]
+        hint = "\n}" in window
+        if first_line and (newline := window.find("\n")) >= 0:
+            first_line = False
+            hint = hint or window[:newline].rstrip().endswith("}")
+        if not hint and (delimited or size < threshold):
+            continue
+
+        pending = "".join(parts)
+        documents, end = _decode_all(decoder, pending, final=False)
+        yield from documents
+        delimited = hint and bool(documents)
+        pending = pending[end:].lstrip(_WHITESPACE)
+        parts, size = ([pending], len(pending)) if pending else ([], 0)
+        threshold, first_line = 2 * size, "\n" not in pending
+        if size > max_document_chars:
+            raise StreamError(f"A document exceeds {max_document_chars} characters or the stream is malformed.")
+
+    documents, _ = _decode_all(decoder, "".join(parts), final=True)
+    yield from documents
+
+
+def _decode_all(decoder: json.JSONDecoder, text: str, final: bool) -> tuple[list[Any], int]:
+    """Decodes the complete documents of the text, returns them and the end of the last one."""
+    documents = []
+    position = end = 0
+    while True:
+        while position < len(text) and text[position] in _WHITESPACE:
+            position += 1
+        if position == len(text):
+            return documents, len(text)
+        # the text after a document without any newline is most likely the beginning of the next one
+        if documents and not final and text.find("\n", position) < 0:
+            return documents, end
+        try:
+            document, position = decoder.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            if final:
+                raise StreamError(f"Malformed or truncated document: {e}") from None
+            return documents, end
+        documents.append(document)
+        end = position
+
+
+@dataclass
+class StreamResult:
+    # name of the CNV, or the position of the document in the stream if it has none
+    input: str
+    prediction: classification.Prediction | None
+    error: str | None = None
+
+
+def _document_name(document: Any, index: int) -> str:
+    try:
+        return str(document["cnv"]["name"])
+    except (TypeError, KeyError):
+        return f"document {index}"
+
+
+def classify_document(document: Any, index: int, projected: bool = True) -> StreamResult:
+    name = _document_name(document, index)
+    try:
+        annot = loader.project(document) if projected else loader.annotation_from_dict(document)
+        prediction = MarCNVClassifier(annot).classify()
+    except Exception as e:
+        trace.logger.debug("Classification of %s failed", name, exc_info=True)
+        return StreamResult(input=name, prediction=None, error=f"{type(e).__name__}: {e}")
+    return StreamResult(input=name, prediction=prediction)
+
+
+def _put(output: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Puts the item unless the consumer stops first, returns whether it was put."""
+    while not stop.is_set():
+        try:
+            output.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(items: Iterable[Any], output: "queue.Queue[Any]", stop: threading.Event) -> None:
+    try:
+        for item in items:
+            if not _put(output, item, stop):
+                return
+    except Exception as e:
+        _put(output, e, stop)
+        return
+    _put(output, _END, stop)
+
+
+def _consume(source: "queue.Queue[Any]") -> Iterator[Any]:
+    while (item := source.get()) is not _END:
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+def pipelined(items: Iterable[Any], queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[Any]:
+    """Yields the items produced in a background thread, at most `queue_size` ahead of the consumer.
+
+    An exception of the producer is raised in the consumer; the producer stops when the consumer does.
+    """
+    buffer: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    thread = threading.Thread(target=_produce, args=(items, buffer, stop), name="marcnv-reader", daemon=True)
+    thread.start()
+    try:
+        yield from _consume(buffer)
+    finally:
+        stop.set()
+
+
+def _write_results(results: "queue.Queue[Any]", writer: writers.JSONLinesWriter, errors: list[Exception]) -> None:
+    for result in _consume(results):
+        if errors:
+            # keep draining, so the classification does not block on a full queue
+            continue
+        try:
+            if result.prediction is None:
+                writer.stream.write(json.dumps({"input": result.input, "error": result.error}) + "\n")
+                writer.stream.flush()
+            else:
+                writer.write(result.input, result.prediction)
+        except Exception as e:
+            errors.append(e)
+
+
+def classify_stream(
+    binary: IO[bytes],
+    writer: writers.JSONLinesWriter,
+    projected: bool = True,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    on_result: Callable[[StreamResult], None] | None = None,
+) -> int:
+    """Classifies the annotation documents of a binary stream, writing the predictions in the input order.
+
+    Documents that fail to classify are written as `{"input": ..., "error": ...}`. Returns the number of documents.
+    Raises StreamError if the stream is malformed, after writing the predictions of the documents before it.
+    """
+    results: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+    errors: list[Exception] = []
+    writer_thread = threading.Thread(target=_write_results, args=(results, writer, errors), name="marcnv-writer")
+    writer_thread.start()
+    count = 0
+    try:
+        for index, document in enumerate(pipelined(iter_documents(read_text(binary)), queue_size)):
+            result = classify_document(document, index, projected)
+            del document
+            if on_result is not None:
+                on_result(result)
+            results.put(result)
+            count += 1
+            if errors:
+                break
+    finally:
+        results.put(_END)
+        writer_thread.join()
+    if errors:
+        raise errors[0]
+    return count
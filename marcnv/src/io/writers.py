@@ -0,0 +1,212 @@
+"""Output formats of predictions.
+
+- `json`: one indented JSON document per prediction (the original output),
+- `compact`: the same document without whitespace,
+- `jsonl`: one compact JSON object per line with the `input` it was classified from, written as results arrive,
+- `columnar`: a binary file with one column per field, for loading whole cohorts at once (see `read_columnar`).
+"""
+
+import json
+import struct
+import sys
+from array import array
+from dataclasses import asdict
+from typing import IO, Any, Self
+
+from marcnv.src.acmg import classification, profiling
+
+FORMATS = ("json", "compact", "jsonl", "columnar")
+SECTIONS = ("1", "2", "3", "4", "5")
+
+COLUMNAR_MAGIC = b"MARCNVC\x01"
+COLUMNAR_VERSION = 1
+SEVERITIES = tuple(classification.Severity)
+
+
+def section_to_dict(section: classification.SectionResult) -> dict[str, Any]:
+    return {
+        "section": section.section,
+        "option": section.option,
+        "reason": section.reason,
+        "score": section.score,
+        "evidence": section.evidence,
+    }
+
+
+def prediction_to_dict(
+    prediction: classification.Prediction,
+    timings: profiling.Timings | None = None,
+    dependencies: dict[str, list[str]] | None = None,
+) -> dict[str, Any]:
+    """Returns the prediction in the same form as `dataclasses.asdict`, without its deep copies."""
+    data = {
+        "score": prediction.score,
+        "criteria": [section_to_dict(section) for section in prediction.criteria],
+        "severity": prediction.severity.value,
+    }
+    if timings is not None:
+        data["timings"] = asdict(timings)
+    if dependencies is not None:
+        data["dependencies"] = dependencies
+    return data
+
+
+def dumps(
+    prediction: classification.Prediction,
+    timings: profiling.Timings | None = None,
+    compact: bool = False,
+    dependencies: dict[str, list[str]] | None = None,
+) -> str:
+    if compact:
+        return json.dumps(prediction_to_dict(prediction, timings, dependencies), separators=(",", ":"))
+    return json.dumps(prediction_to_dict(prediction, timings, dependencies), indent=2)
+
+
+class JSONLinesWriter:
+    """Writes one prediction per line and flushes it, so consumers can read the results while the run continues."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """Writes to the file at `path`, or to stdout."""
+        self.stream: IO[str] = open(path, "w") if path is not None else sys.stdout
+
+    def write(
+        self,
+        input_path: str,
+        prediction: classification.Prediction,
+        timings: profiling.Timings | None = None,
+        dependencies: dict[str, list[str]] | None = None,
+    ) -> None:
+        record = {"input": input_path, **prediction_to_dict(prediction, timings, dependencies)}
+        self.stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ColumnarWriter:
+    """Collects predictions column by column and stores them on close.
+
+    Layout: magic, header length (uint32), JSON header with the schema and the number of rows, then the columns in
+    the header order. Float columns are float64, `severity` is one uint8 index into the header `severities`, text
+    columns are uint32 offsets (rows + 1) followed by the UTF-8 data. Numbers are little-endian. Timings and
+    dependencies are not stored.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.floats: dict[str, array[float]] = {"score": array("d")}
+        self.texts: dict[str, list[str]] = {"input": []}
+        self.severity = array("B")
+        for section in SECTIONS:
+            self.floats[f"section{section}_score"] = array("d")
+            for field in ("option", "reason", "evidence"):
+                self.texts[f"section{section}_{field}"] = []
+
+    def write(
+        self,
+        input_path: str,
+        prediction: classification.Prediction,
+        timings: profiling.Timings | None = None,
+        dependencies: dict[str, list[str]] | None = None,
+    ) -> None:
+        sections = {section.section: section for section in prediction.criteria}
+        if sections.keys() != set(SECTIONS):
+            raise ValueError(f"Prediction of {input_path} does not have exactly the sections {', '.join(SECTIONS)}.")
+        self.texts["input"].append(input_path)
+        self.floats["score"].append(prediction.score)
+        self.severity.append(SEVERITIES.index(prediction.severity))
+        for name, section in sections.items():
+            self.floats[f"section{name}_score"].append(section.score)
+            self.texts[f"section{name}_option"].append(section.option)
+            self.texts[f"section{name}_reason"].append(section.reason)
+            self.texts[f"section{name}_evidence"].append(section.evidence)
+
+    def close(self) -> None:
+        columns: list[tuple[str, str, bytes]] = [("severity", "uint8", self.severity.tobytes())]
+        columns += [(name, "float64", _little_endian(values)) for name, values in self.floats.items()]
+        columns += [(name, "text", _encode_texts(texts)) for name, texts in self.texts.items()]
+
+        header = {
+            "version": COLUMNAR_VERSION,
+            "rows": len(self.severity),
+            "severities": [severity.value for severity in SEVERITIES],
+            "columns": [{"name": name, "type": kind, "bytes": len(data)} for name, kind, data in columns],
+        }
+        encoded = json.dumps(header, separators=(",", ":")).encode()
+        with open(self.path, "wb") as f:
+            f.write(COLUMNAR_MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for _, _, data in columns:
+                f.write(data)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _little_endian(values: "array[Any]") -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> "array[Any]":
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _encode_texts(texts: list[str]) -> bytes:
+    encoded = [text.encode() for text in texts]
+    offsets = array("I", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    return _little_endian(offsets) + b"".join(encoded)
+
+
+def _decode_texts(data: bytes, rows: int) -> list[str]:
+    offsets = _from_little_endian("I", data[: (rows + 1) * 4])
+    blob = data[(rows + 1) * 4 :]
+    return [blob[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+
+def read_columnar(path: str) -> dict[str, Any]:
+    """Reads a columnar file: float columns as `array('d')` (usable with `numpy.frombuffer`), texts as lists and
+    `severity` as a list of `Severity`."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(COLUMNAR_MAGIC):
+        raise ValueError(f"{path} is not a marcnv columnar file.")
+    (header_length,) = struct.unpack_from("<I", data, len(COLUMNAR_MAGIC))
+    position = len(COLUMNAR_MAGIC) + 4
+    header = json.loads(data[position : position + header_length])
+    if header["version"] != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported version {header['version']} of the columnar file {path}.")
+    position += header_length
+
+    columns: dict[str, Any] = {}
+    for column in header["columns"]:
+        chunk = data[position : position + column["bytes"]]
+        position += column["bytes"]
+        if column["type"] == "float64":
+            columns[column["name"]] = _from_little_endian("d", chunk)
+        elif column["type"] == "uint8":
+            severities = [classification.Severity(value) for value in header["severities"]]
+            columns[column["name"]] = [severities[code] for code in chunk]
+        else:
+            columns[column["name"]] = _decode_texts(chunk, header["rows"])
+    return columns
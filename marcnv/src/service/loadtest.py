@@ -0,0 +1,121 @@
+"""Load test for the classification service: `python -m marcnv.src.service.loadtest annotation.json.gz -n 200 -c 8`."""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass
+
+from marcnv.src.io import loader
+
+
+@dataclass
+class LoadTestReport:
+    requests: int
+    failures: int
+    elapsed: float
+    latencies: list[float]
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self) -> str:
+        mean = statistics.fmean(self.latencies) if self.latencies else 0.0
+        return (
+            f"{self.requests} requests ({self.failures} failed) in {self.elapsed:.2f}s: {self.throughput:.1f} req/s\n"
+            f"latency ms: mean {mean * 1e3:.1f}, p50 {self.percentile(50) * 1e3:.1f}, "
+            f"p90 {self.percentile(90) * 1e3:.1f}, p99 {self.percentile(99) * 1e3:.1f}, "
+            f"max {max(self.latencies, default=0.0) * 1e3:.1f}"
+        )
+
+
+async def _open(host: str, port: int, unix_socket: str | None) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if unix_socket is not None:
+        return await asyncio.open_unix_connection(unix_socket)
+    return await asyncio.open_connection(host, port)
+
+
+async def _post(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: bytes) -> tuple[int, bool]:
+    writer.write(
+        b"POST /classify HTTP/1.1\r\nHost: marcnv\r\nContent-Type: application/json\r\n"
+        + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+        + payload
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    keep_alive = True
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+        elif name.strip().lower() == "connection":
+            keep_alive = value.strip().lower() != "close"
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def run(
+    payload: bytes,
+    requests: int,
+    concurrency: int,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_socket: str | None = None,
+) -> LoadTestReport:
+    """Sends `requests` classifications over `concurrency` keep-alive connections and measures their latency."""
+    latencies: list[float] = []
+    failures = 0
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        nonlocal failures
+        connection = None
+        for _ in remaining:
+            try:
+                if connection is None:
+                    connection = await _open(host, port, unix_socket)
+                start = time.perf_counter()
+                status, keep_alive = await _post(*connection, payload)
+            except (OSError, asyncio.IncompleteReadError, IndexError):
+                failures += 1
+                keep_alive = False
+            else:
+                latencies.append(time.perf_counter() - start)
+                failures += status != 200
+            if not keep_alive and connection is not None:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return LoadTestReport(requests, failures, time.perf_counter() - start, latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test a running marcnv-serve instance.")
+    parser.add_argument("input", help="Annotation JSON (optionally gzipped) sent with every request")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="Number of requests")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Number of concurrent connections")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host")
+    parser.add_argument("--port", type=int, default=8000, help="Server port")
+    parser.add_argument("--socket", default=None, help="Server unix socket, overrides host and port")
+    args = parser.parse_args()
+
+    payload = json.dumps(loader.read_document(args.input), separators=(",", ":")).encode()
+    report = asyncio.run(run(payload, args.requests, args.concurrency, args.host, args.port, args.socket))
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from marcnv.src.acmg import classification, criterion, metrics, trace
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.io import loader, writers
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    503: "Service Unavailable",
+}
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    workers: int = os.cpu_count() or 1
+    # classifications submitted to the worker pool at once, further requests wait for a free slot
+    max_inflight: int = 2 * (os.cpu_count() or 1)
+    # requests waiting for a free slot, further requests are rejected with 503
+    max_pending: int = 1000
+    max_request_bytes: int = 256 * 2**20
+    # load only the annotation data read by the classifier, see marcnv.src.io.loader
+    projected: bool = True
+    shutdown_timeout: float = 30.0
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _init_worker() -> None:
+    criterion.get_acmg_criteria(duplication=True)
+    criterion.get_acmg_criteria(duplication=False)
+
+
+@dataclass(frozen=True)
+class PayloadResult:
+    # the prediction or error JSON
+    body: bytes
+    prediction: classification.Prediction | None
+    observation: metrics.Observation | None = None
+
+
+def classify_payload(payload: bytes, projected: bool = True) -> PayloadResult:
+    """Classifies one annotation document in JSON."""
+    started = time.perf_counter()
+    profiler = metrics.SectionTimer()
+    try:
+        document = json.loads(payload)
+        annot = loader.project(document) if projected else loader.annotation_from_dict(document)
+        del document
+        loaded = time.perf_counter()
+        prediction = MarCNVClassifier(annot, profiler=profiler).classify()
+    except Exception as e:
+        trace.logger.debug("Classification failed", exc_info=True)
+        return PayloadResult(json.dumps({"error": f"{type(e).__name__}: {e}"}).encode(), None)
+    observation = metrics.Observation(loaded - started, time.perf_counter() - loaded, metrics.section_seconds(profiler))
+    return PayloadResult(writers.dumps(prediction, compact=True).encode(), prediction, observation)
+
+
+class ClassificationServer:
+    """HTTP/1.1 server classifying annotation documents in a pool of worker processes.
+
+    Endpoints:
+    - `GET /health` - liveness and the number of requests in progress,
+    - `GET /metrics` - metrics of the classifications since the start in the Prometheus text format,
+    - `POST /classify` - one annotation JSON, responds with its prediction JSON,
+    - `POST /classify/batch` - annotation documents as NDJSON, streams back one prediction (or error) per line,
+      in the input order.
+
+    If a worker process dies (e.g. killed when out of memory), its requests are answered with 503 and the worker pool
+    is replaced, so later requests are classified again.
+    """
+
+    def __init__(self, config: ServerConfig = ServerConfig(), executor: Executor | None = None) -> None:
+        self.config = config
+        # a given executor is used as it is, only the own worker pool is replaced when broken
+        self._owns_executor = executor is None
+        self.executor = executor or self._new_executor()
+        self._executor_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(config.max_inflight)
+        self._pending = 0
+        self._connections: set[asyncio.Task[None]] = set()
+        self._server: asyncio.Server | None = None
+        self._stopping = asyncio.Event()
+        self.metrics = metrics.Registry()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # workers forked from the server would inherit its open connections and keep them from closing
+        context = multiprocessing.get_context("forkserver")
+        return ProcessPoolExecutor(max_workers=self.config.workers, mp_context=context, initializer=_init_worker)
+
+    async def _replace_executor(self, broken: Executor) -> None:
+        async with self._executor_lock:
+            # the requests failing on the same broken pool replace it once
+            if not self._owns_executor or self.executor is not broken:
+                return
+            trace.logger.warning("A worker process died, replacing the worker pool.")
+            self.executor = self._new_executor()
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000, unix_socket: str | None = None) -> None:
+        if unix_socket is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_socket)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+
+    @property
+    def sockets(self) -> list[Any]:
+        return list(self._server.sockets) if self._server is not None else []
+
+    async def serve_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+        await self._stopping.wait()
+        await self.shutdown()
+
+    async def shutdown(self) -> None:
+        """Stops accepting connections, lets the requests in progress finish and stops the worker pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._connections:
+            _, unfinished = await asyncio.wait(self._connections, timeout=self.config.shutdown_timeout)
+            for task in unfinished:
+                task.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _classify(self, payload: bytes) -> tuple[bool, bytes]:
+        if self._pending >= self.config.max_pending:
+            raise HTTPError(503, "Too many pending classifications, retry later.")
+        self._pending += 1
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                executor = self.executor
+                try:
+                    result = await loop.run_in_executor(executor, classify_payload, payload, self.config.projected)
+                except BrokenProcessPool:
+                    self.metrics.observe(None)
+                    await self._replace_executor(executor)
+                    raise HTTPError(503, "A worker process died during the classification, retry later.")
+                self.metrics.observe(result.prediction, result.observation)
+                return result.prediction is not None, result.body
+        finally:
+            self._pending -= 1
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections.add(task)
+        try:
+            keep_alive = True
+            while keep_alive and not self._stopping.is_set():
+                keep_alive = await self._handle_request(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close"
+
+        try:
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            if path == "/health":
+                if method != "GET":
+                    raise HTTPError(405, "Use GET.")
+                body = json.dumps({"status": "ok", "pending": self._pending}).encode()
+                await self._respond(writer, 200, body, keep_alive)
+                return keep_alive
+            if path == "/metrics":
+                if method != "GET":
+                    raise HTTPError(405, "Use GET.")
+                body = self.metrics.to_prometheus().encode()
+                await self._respond(writer, 200, body, keep_alive, metrics.PROMETHEUS_CONTENT_TYPE)
+                return keep_alive
+            if path not in ("/classify", "/classify/batch"):
+                raise HTTPError(404, f"Unknown path {path}.")
+            if method != "POST":
+                raise HTTPError(405, "Use POST.")
+            payload = await self._read_body(reader, headers)
+        except HTTPError as e:
+            await self._respond(writer, e.status, json.dumps({"error": str(e)}).encode(), keep_alive=False)
+            return False
+        except ValueError:
+            await self._respond(writer, 400, json.dumps({"error": "Malformed request."}).encode(), keep_alive=False)
+            return False
+
+        # the last response of a connection during shutdown tells the client to not reuse it
+        keep_alive = keep_alive and not self._stopping.is_set()
+        if path == "/classify":
+            try:
+                ok, body = await self._classify(payload)
+            except HTTPError as e:
+                await self._respond(writer, e.status, json.dumps({"error": str(e)}).encode(), keep_alive)
+                return keep_alive
+            await self._respond(writer, 200 if ok else 422, body, keep_alive)
+        else:
+            await self._stream_batch(writer, payload, keep_alive)
+        return keep_alive
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict[str, str]) -> bytes:
+        if "content-length" not in headers:
+            raise HTTPError(411, "Content-Length is required.")
+        length = int(headers["content-length"])
+        if length > self.config.max_request_bytes:
+            raise HTTPError(413, f"Request body exceeds {self.config.max_request_bytes} bytes.")
+        return await reader.readexactly(length)
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        keep_alive: bool,
+        content_type: str = "application/json",
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def _stream_batch(self, writer: asyncio.StreamWriter, payload: bytes, keep_alive: bool) -> None:
+        head = (
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode())
+
+        async def write_line(task: "asyncio.Task[tuple[bool, bytes]]") -> None:
+            try:
+                _, body = await task
+            except HTTPError as e:
+                body = json.dumps({"error": str(e)}).encode()
+            chunk = body + b"\n"
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            # waits while the client does not read, which holds back further submissions
+            await writer.drain()
+
+        # results are written in the input order, at most `max_inflight` documents of a batch are submitted ahead
+        window: collections.deque[asyncio.Task[tuple[bool, bytes]]] = collections.deque()
+        try:
+            for line in payload.splitlines():
+                if not line.strip():
+                    continue
+                if len(window) >= self.config.max_inflight:
+                    await write_line(window.popleft())
+                window.append(asyncio.create_task(self._classify(line)))
+            while window:
+                await write_line(window.popleft())
+        finally:
+            for task in window:
+                task.cancel()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(
+    config: ServerConfig = ServerConfig(), host: str = "127.0.0.1", port: int = 8000, unix_socket: str | None = None
+) -> None:
+    server = ClassificationServer(config)
+    await server.start(host=host, port=port, unix_socket=unix_socket)
+    print(f"Serving on {unix_socket or f'http://{host}:{port}'}", flush=True)
+    await server.serve_forever()
@@ -0,0 +1,80 @@
+import os
+import shutil
+
+from marcnv.src.acmg import classification
+from marcnv.src.batch import runner
+
+
+def test_collect_inputs(tmp_path):
+    for name in ["b.json.gz", "a.json", "notes.txt"]:
+        (tmp_path / name).write_text("")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# comment\na.json\n\nb.json.gz\n")
+
+    assert runner.collect_inputs(str(tmp_path)) == [str(tmp_path / "a.json"), str(tmp_path / "b.json.gz")]
+    assert runner.collect_inputs(str(tmp_path / "*.gz")) == [str(tmp_path / "b.json.gz")]
+    assert runner.collect_inputs(str(manifest)) == [str(tmp_path / "a.json"), str(tmp_path / "b.json.gz")]
+    assert runner.output_name("dir/sample.json.gz") == "sample.json"
+    assert runner.output_name_conflicts(["a/s1.json.gz", "b/s1.json", "a/s1.json.gz", "a/s2.json"]) == {
+        "s1.json": [os.path.abspath("a/s1.json.gz"), os.path.abspath("b/s1.json")]
+    }
+
+
+def test_classify_many_reports_failures(tmp_path):
+    good = tmp_path / "good.json.gz"
+    shutil.copy("tests/annotation_test.json.gz", good)
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+
+    results = list(runner.classify_many([str(bad), str(good)], workers=1))
+
+    assert [r.input for r in results] == [str(bad), str(good)]
+    assert results[0].prediction is None and results[0].error is not None
+    assert results[1].error is None
+    assert results[1].prediction is not None
+    assert results[1].prediction.score == 0.15
+    assert results[1].prediction.severity == classification.Severity.VOUS
+
+
+def test_classify_many_with_cache(tmp_path):
+    options = runner.ClassifyOptions(cache_path=str(tmp_path / "cache.sqlite"))
+
+    first = list(runner.classify_many(["tests/annotation_test.json.gz"], workers=1, options=options))
+    second = list(runner.classify_many(["tests/annotation_test.json.gz"], workers=1, options=options))
+
+    assert not first[0].cached
+    assert second[0].cached
+    assert second[0].prediction == first[0].prediction
+
+
+def test_classify_many_in_threads(tmp_path):
+    paths = ["tests/annotation_test.json.gz", str(tmp_path / "missing.json")] * 8
+    options = runner.ClassifyOptions(cache_path=str(tmp_path / "cache.sqlite"), metrics=True)
+
+    serial = list(runner.classify_many(paths, workers=1))
+    threaded = list(runner.classify_many(paths, workers=4, options=options, threads=True))
+
+    assert [r.input for r in threaded] == paths
+    assert [r.prediction for r in threaded] == [r.prediction for r in serial]
+    assert threaded[0].observation is not None
+
+
+_classify_file = runner.classify_file
+
+
+def _classify_or_die(input_path, options):
+    # the worker classifying the marked input dies, as when killed by the kernel when out of memory
+    if input_path == "crash.json.gz":
+        os._exit(1)
+    return _classify_file(input_path, options)
+
+
+def test_classify_many_survives_dead_worker(monkeypatch):
+    inputs = [*["tests/annotation_test.json.gz"] * 3, "crash.json.gz", *["tests/annotation_test.json.gz"] * 3]
+    monkeypatch.setattr(runner, "classify_file", _classify_or_die)
+
+    results = list(runner.classify_many(inputs, workers=2, chunksize=2))
+
+    assert [r.input for r in results] == inputs
+    assert [r.prediction is None for r in results] == [input_path == "crash.json.gz" for input_path in inputs]
+    assert "BrokenProcessPool" in results[3].error
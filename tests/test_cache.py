@@ -0,0 +1,27 @@
+from marcnv.src.acmg import classification
+from marcnv.src.batch import cache
+
+
+def _prediction(score: float) -> classification.Prediction:
+    section = classification.SectionResult(section="1", option="1A", reason="reason", score=score, evidence="1A.")
+    return classification.Prediction(score=score, criteria=[section])
+
+
+def test_cache_key_ignores_key_order():
+    assert cache.cache_key({"a": 1, "b": [1, 2]}) == cache.cache_key({"b": [1, 2], "a": 1})
+    assert cache.cache_key({"a": 1}) != cache.cache_key({"a": 2})
+
+
+def test_cache_hits_misses_and_eviction(tmp_path):
+    prediction_cache = cache.PredictionCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+
+    assert prediction_cache.get("a") is None
+    prediction_cache.put("a", _prediction(0.5))
+    prediction_cache.put("b", _prediction(0))
+    prediction_cache.put("c", _prediction(-1.0))
+    assert prediction_cache.get("a") == _prediction(0.5)
+
+    prediction_cache.evict()
+    assert len(prediction_cache) == 2
+    assert prediction_cache.get("b") is None
+    assert prediction_cache.stats == cache.CacheStats(hits=1, misses=2)
@@ -1,6 +1,7 @@
 import annotation
+import pytest
 
-from marcnv.src.acmg import classification
+from marcnv.src.acmg import acmg_classify, annotation_view, classification, profiling
 from marcnv.src.acmg.acmg_classify import MarCNVClassifier
 
 
@@ -52,3 +53,84 @@ def test_classify():
     )
 
     assert result.severity == classification.Severity.VOUS
+
+
+def test_classify_profiled():
+    annot = annotation.Annotation.load_from_json("tests/annotation_test.json.gz")
+    profiler = profiling.Profiler()
+
+    result = MarCNVClassifier(annot, profiler=profiler).classify()
+
+    assert result == MarCNVClassifier(annot).classify()
+    assert list(profiler.timings.sections) == ["1", "2", "3", "4", "5"]
+    assert all(timing.calls == 1 for timing in profiler.timings.sections.values())
+    assert "2A" in profiler.timings.rules
+    assert profiler.timings.queries["get_genes"] >= 1
+
+
+def test_section2_plan():
+    annot = annotation.Annotation.load_from_json("tests/annotation_test.json.gz")
+    view = annotation_view.AnnotationView(annot)
+
+    assert [rule.name for rule in acmg_classify.DELETION_PLAN.rules] == ["2A", "2C-2E", "2B", "2F", "2G", "2H"]
+    assert acmg_classify.DELETION_PLAN.evaluate(view)[0] == "2H"
+
+    # 2G only continues the evaluation, so the first stopping rule (2H) wins; without it 2G is the fallback
+    rules = tuple(rule for rule in acmg_classify.DELETION_PLAN.rules if rule.name != "2H")
+    plan = acmg_classify.Section2Plan(rules, skip_reason="skipped")
+    assert plan.evaluate(view)[0] == "2G"
+    assert "high_risk_genes" not in plan.predicates
+
+    with pytest.raises(ValueError):
+        acmg_classify.Section2Plan((acmg_classify.Rule("2X", ("unknown",), lambda facts: None),), skip_reason="")
+
+
+def test_screen():
+    annot = annotation.Annotation.load_from_json("tests/annotation_test.json.gz")
+    rendered = []
+
+    def render(text):
+        rendered.append(text)
+        return text
+
+    screening = MarCNVClassifier(annot).screen()
+    prediction = MarCNVClassifier(annot).classify()
+
+    assert screening.options == {section.section: section.option for section in prediction.criteria}
+    assert screening.score == prediction.score
+    assert screening.severity == prediction.severity
+    assert screening.prediction() == prediction
+
+    reason = acmg_classify.Reason(render, ("deferred",))
+    assert rendered == []
+    assert str(reason) == "deferred" and rendered == ["deferred"]
+
+
+def test_most_severe_transcript():
+    def transcript(identifier, length, five=False, three=False, cds=0):
+        return {
+            "identifier": identifier,
+            "length": length,
+            "flag_five_inside": five,
+            "flag_three_inside": three,
+            "flag_contained": False,
+            "five_prime_utr_overlaps": [],
+            "three_prime_utr_overlaps": [],
+            "cds_overlaps": [10] * cds,
+        }
+
+    transcripts = [
+        transcript("short-2C-1", 10, five=True, cds=2),
+        transcript("2D-1", 300, three=True),
+        transcript("long-2C-1", 200, five=True, cds=1),
+        transcript("2D-4", 250, three=True, cds=2),
+        transcript("outside", 400),
+    ]
+
+    assert acmg_classify.most_severe_transcript(transcripts) == ("2C-1", transcripts[2])
+    assert acmg_classify.evaluate_gene(transcripts[1:2] + transcripts[3:]) == (
+        "2D-4",
+        "Overlaps no end (3') regions.\nOverlaps 2 CDS regions with a total length of 20bp.",
+        "2D-4",
+    )
+    assert acmg_classify.most_severe_transcript([transcripts[4]]) == ("", None)
@@ -0,0 +1,53 @@
+import copy
+
+import annotation
+import pytest
+
+from marcnv.src.acmg import acmg_classify, annotation_view, cohort
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.io import loader
+
+pytest.importorskip("numpy")
+
+
+def test_classify_cohort_matches_classifier():
+    annots = [annotation.Annotation.load_from_json("tests/annotation_test.json.gz") for _ in range(3)]
+
+    result = cohort.classify_cohort(annots)
+
+    expected = MarCNVClassifier(annots[0]).classify()
+    assert result.predictions() == [expected] * 3
+    assert result.scores.tolist() == [expected.score] * 3
+    assert result.severities == [expected.severity] * 3
+    assert result.options["2"].tolist() == ["2H"] * 3
+
+
+def test_section2_columns_and_plan_agree():
+    document = loader.read_document("tests/annotation_test.json.gz")
+    documents = []
+    for cnv_type in ("loss", "gain"):
+        for kept in ("all", "genes", "none"):
+            variant = copy.deepcopy(document)
+            variant["cnv"]["cnv_type"] = cnv_type
+            for source in ("_benign_cnv_gs_outer", "_hi_gene", "_hi_region", "_genes"):
+                if kept == "none" or (kept == "genes" and source != "_genes"):
+                    variant[source] = []
+            documents.append(variant)
+    annots = [loader.annotation_from_dict(variant) for variant in documents]
+
+    result = cohort.classify_cohort(annots)
+
+    expected = [MarCNVClassifier(annot).classify() for annot in annots]
+    assert result.predictions() == expected
+    assert result.options["2"].tolist() == [prediction.criteria[1].option for prediction in expected]
+    assert "2Skip" in result.options["2"].tolist()
+    # only deletions overlapping HI genes are decided by the section 2 plan, the annotation has none
+    assert result.section2 == {}
+
+    for row, annot in enumerate(annots):
+        view = annotation_view.AnnotationView(annot)
+        facts = acmg_classify.Section2Facts(view)
+        for predicate in cohort.SECTION2_PREDICATES[view.cnv.is_duplication]:
+            assert result.columns.section2_counts[predicate][row] == len(getattr(facts, predicate))
+    assert result.columns.benign_spanning.tolist() == [0] * 6
+    assert result.columns.benign_identical.tolist() == [False] * 6
@@ -0,0 +1,29 @@
+import dataclasses
+
+import pytest
+
+from marcnv.src.acmg import core, criterion
+
+
+def test_snapshot_is_up_to_date():
+    with open(criterion.SNAPSHOT_FILEPATH) as f:
+        assert f.read() == criterion.render_snapshot(), "run `python -m marcnv.src.acmg.criterion` to regenerate"
+
+
+@pytest.mark.parametrize("duplication", [True, False])
+def test_registry_matches_tsv(duplication):
+    tsv = core.ACMG_GAIN_TSV_FILEPATH if duplication else core.ACMG_LOSS_TSV_FILEPATH
+    table = criterion.get_acmg_criteria(duplication)
+
+    assert dict(table) == criterion._load_acmg_file(tsv)
+    assert table is criterion.get_acmg_criteria(duplication)
+    with pytest.raises(TypeError):
+        table["1A"] = table["1B"]  # type: ignore[index]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        table["1A"].suggested_points = 1.0  # type: ignore[misc]
+
+
+def test_records_are_shared_between_gain_and_loss():
+    gain = criterion.get_acmg_criteria(duplication=True)
+    loss = criterion.get_acmg_criteria(duplication=False)
+    assert gain["5F"] is loss["5F"]
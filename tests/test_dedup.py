@@ -0,0 +1,41 @@
+import gzip
+import json
+
+from marcnv.src.batch import dedup, runner
+from marcnv.src.io import loader, reference
+from marcnv.src.io.reference import Region
+
+
+def test_cluster():
+    regions = [
+        Region("chr1", 1000, 2000, "loss"),
+        Region("chr1", 1010, 2000, "loss"),
+        Region("chr1", 1000, 2000, "gain"),
+        Region("chr1", 1000, 2000, "loss"),
+        Region("chr2", 1000, 2000, "loss"),
+    ]
+
+    assert [c.members for c in dedup.cluster(regions)] == [[0, 3], [1], [2], [4]]
+
+
+def test_classify_deduplicated(tmp_path):
+    document = loader.read_document("tests/annotation_test.json.gz")
+    cnv = document["cnv"]
+    paths = []
+    # the same CNV twice and with shifted breakpoints overlapping the same genes
+    for name, start in [("a", cnv["start"]), ("b", cnv["start"]), ("c", cnv["start"] + 1000)]:
+        path = str(tmp_path / f"{name}.json.gz")
+        with gzip.open(path, "wt") as f:
+            json.dump({**document, "cnv": {**cnv, "start": start}}, f)
+        paths.append(path)
+    assert reference.describe(paths[2]) == Region(cnv["chr"], cnv["start"] + 1000, cnv["end"], cnv["cnv_type"])
+
+    results, stats = dedup.classify_deduplicated([*paths, "missing.json.gz"], workers=1)
+    expected = list(runner.classify_many(paths, workers=1))
+
+    assert [r.input for r in results] == [*paths, "missing.json.gz"]
+    assert [r.representative for r in results] == [None, paths[0], None, None]
+    assert [r.prediction for r in results[:3]] == [r.prediction for r in expected]
+    assert results[3].error is not None
+    assert (stats.clusters, stats.classified, stats.fanned_out) == (3, 3, 1)
+    assert stats.ratio == 4 / 3
@@ -0,0 +1,37 @@
+import gzip
+import io
+
+import annotation
+
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.io import loader
+
+
+def test_projected_annotation_classifies_identically():
+    full = annotation.Annotation.load_from_json("tests/annotation_test.json.gz")
+    projected = loader.load_projected("tests/annotation_test.json.gz")
+
+    assert MarCNVClassifier(projected).classify() == MarCNVClassifier(full).classify()
+    assert projected.count_regulatory_types() == full.count_regulatory_types()
+    assert projected.get_common_variability_regions() == full.get_common_variability_regions()
+    assert all(len(getattr(projected, source)) == 0 for source in ["_gnomad", "_regulatory", "_benign_cnv"])
+
+
+def test_incremental_reader():
+    reader = loader._JSONReader(io.StringIO(' {"a": [1, {"b": [2.5]}, "c"], "d": 12345 ,"e": []}'), chunk_size=3)
+    members = []
+    for key in reader.keys():
+        members.append((key, list(reader.items()) if reader.peek() == "[" else reader.value()))
+
+    assert members == [("a", [1, {"b": [2.5]}, "c"]), ("d", 12345), ("e", [])]
+    assert reader.peek() == ""
+
+
+def test_projection_of_parsed_and_streamed_documents_agree():
+    document = loader.read_document("tests/annotation_test.json.gz")
+    with gzip.open("tests/annotation_test.json.gz", "rt") as f:
+        streamed = loader._read_projected(f, chunk_size=1000)
+
+    parsed = loader.project(document)
+    assert vars(streamed) == vars(parsed)
+    assert MarCNVClassifier(streamed).classify() == MarCNVClassifier(parsed).classify()
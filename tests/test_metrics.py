@@ -0,0 +1,40 @@
+from marcnv.src.acmg import metrics
+from marcnv.src.batch import runner
+
+ANNOTATION = "tests/annotation_test.json.gz"
+
+
+def test_histogram():
+    histogram = metrics.Histogram(buckets=(1, 2, 5))
+    for value in (0.5, 1.5, 1.5, 4, 7):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == 2
+    assert histogram.quantile(1) == 7
+    assert histogram.summary()["mean"] == 2.9
+
+
+def test_registry():
+    clock = iter([10.0])
+    registry = metrics.Registry(clock=lambda: next(clock, 12.0))
+    options = runner.ClassifyOptions(metrics=True)
+    for path in (ANNOTATION, "missing.json.gz", ANNOTATION):
+        result = runner.classify_file(path, options)
+        registry.observe(result.prediction, result.observation, cached=False)
+
+    summary = registry.summary()
+    assert summary["cnvs"] == {"classified": 2, "failed": 1}
+    assert summary["seconds"] == 2.0 and summary["cnvs_per_second"] == 1.0
+    assert summary["options"] == {"1": {"1A": 2}, "2": {"2H": 2}, "3": {"3A": 2}, "4": {"4Skip": 2}, "5": {"5F": 2}}
+    assert summary["severities"] == {"Uncertain": 2}
+    assert summary["cache"] == {"miss": 2, "hit_rate": 0.0}
+    assert summary["latency"]["count"] == summary["sections"]["2"]["count"] == 2
+    assert list(summary["peak_rss"].values())[0] > 0
+
+    text = registry.to_prometheus()
+    assert 'marcnv_cnvs_total{status="failed"} 1\n' in text
+    assert 'marcnv_options_total{section="2",option="2H"} 2\n' in text
+    assert 'marcnv_section_seconds_bucket{section="5",le="+Inf"} 2\n' in text
+    assert "marcnv_classification_seconds_count 2\n" in text
+    assert "# TYPE marcnv_load_seconds histogram\n" in text
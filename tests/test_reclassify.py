@@ -0,0 +1,76 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from marcnv.src.acmg import core, criterion
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.batch import reclassify, runner
+from marcnv.src.io import loader, writers
+
+
+def _stored_record(path):
+    options = runner.ClassifyOptions(dependencies=True)
+    (result,) = runner.classify_many([path], workers=1, options=options)
+    record = {"input": path, **writers.prediction_to_dict(result.prediction, dependencies=result.dependencies)}
+    return result, json.loads(json.dumps(record))
+
+
+def test_dependencies():
+    result, _ = _stored_record("tests/annotation_test.json.gz")
+
+    assert result.dependencies == {
+        "1": ["genes", "regulatory", "acmg_loss.tsv:1A"],
+        "2": ["benign_cnvs", "dosage_genes", "dosage_regions", "genes", "acmg_loss.tsv:2H"],
+        "3": ["genes", "acmg_loss.tsv:3A"],
+        "4": ["gnomad", "acmg_loss.tsv:4Skip"],
+        "5": ["acmg_loss.tsv:5F"],
+    }
+    with pytest.raises(ValueError):
+        runner.ClassifyOptions(dependencies=True, cache_path="cache.sqlite")
+
+
+def test_reclassify_record():
+    result, record = _stored_record("tests/annotation_test.json.gz")
+
+    unchanged = reclassify.reclassify_record(record, set())
+    assert unchanged.evaluated == unchanged.rescored == []
+    assert unchanged.prediction == result.prediction
+
+    updated = reclassify.reclassify_record(record, {"dosage_genes", "acmg_loss.tsv:5F", "acmg_gain.tsv"})
+    assert updated.evaluated == ["2"]
+    assert updated.rescored == ["5"]
+    assert updated.prediction == result.prediction
+    assert updated.dependencies == result.dependencies
+
+    # without the annotation, only the criteria rows can be applied
+    record["input"] = "missing.json.gz"
+    assert reclassify.reclassify_record(record, {"acmg_loss.tsv"}).rescored == ["1", "2", "3", "4", "5"]
+    (failed,) = reclassify.reclassify_many([record], {"genes"})
+    assert failed.prediction is None and failed.error is not None
+
+    with pytest.raises(ValueError):
+        list(reclassify.reclassify_many([record], {"clingen"}))
+
+
+def test_changed_criteria(tmp_path):
+    with open(core.ACMG_LOSS_TSV_FILEPATH) as f:
+        lines = f.read().splitlines(keepends=True)
+    fields = lines[1].split("\t")
+    fields[4] = "0.5"  # suggested points
+    previous = tmp_path / "acmg_loss.tsv"
+    previous.write_text(lines[0] + "\t".join(fields) + "".join(lines[2:]))
+
+    assert criterion.changed_criteria(str(previous), duplication=False) == [f"acmg_loss.tsv:{fields[2]}"]
+
+
+def test_dependencies_of_concurrent_classifications():
+    classifier = MarCNVClassifier(loader.load("tests/annotation_test.json.gz"), record_dependencies=True)
+    expected = classifier.decide()
+    expected_dependencies = dict(classifier.dependencies)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        decisions = list(executor.map(lambda _: classifier.decide(), range(16)))
+
+    assert [[d[:2] for d in decision] for decision in decisions] == [[d[:2] for d in expected]] * 16
+    assert classifier.dependencies == expected_dependencies
@@ -0,0 +1,94 @@
+import gzip
+import json
+import random
+
+import pytest
+
+from marcnv.src.batch import reclassify, runner
+from marcnv.src.io import loader, reference, writers
+
+REGION = "chr9:96721587-97507134:loss"
+
+
+@pytest.fixture(scope="module")
+def store_dir(tmp_path_factory):
+    document = loader.read_document("tests/annotation_test.json.gz")
+    tables = tmp_path_factory.mktemp("tables")
+    paths = {}
+    for source, key in reference.SOURCE_KEYS.items():
+        records = list(document[key])
+        # records outside the CNV are not part of its annotation
+        records += [{**record, "chromosome": "chr10"} for record in document[key][:2]]
+        records += [{**record, "start": 1, "end": 2} for record in document[key][:1]]
+        paths[source] = str(tables / f"{source}.jsonl.gz")
+        with gzip.open(paths[source], "wt") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+    store = tmp_path_factory.mktemp("store")
+    reference.build(str(store), paths)
+    return str(store)
+
+
+def test_region():
+    region = reference.Region.parse("9:100-200:gain")
+
+    assert region == reference.Region("chr9", 100, 200, "gain")
+    assert region.name == "chr9_100_200_gain"
+    assert reference.is_region(REGION) and not reference.is_region("tests/annotation_test.json.gz")
+    with pytest.raises(ValueError):
+        reference.Region.parse("chr9:200-100:loss")
+
+
+def test_document(store_dir):
+    expected = loader.read_document("tests/annotation_test.json.gz")
+
+    with reference.ReferenceStore(store_dir) as store:
+        document = store.document(reference.Region.parse(REGION))
+        assert store.document(reference.Region.parse("chrY:1-100:gain"))["_genes"] == []
+
+    for key in reference.SOURCE_KEYS.values():
+        assert document[key] == [{k: v for k, v in record.items() if k != "_id"} for record in expected[key]]
+    assert {key: value for key, value in document["cnv"].items() if key != "cytogenetic_position"} == {
+        key: value for key, value in expected["cnv"].items() if key != "cytogenetic_position"
+    }
+
+
+@pytest.mark.parametrize("projected", [False, True])
+def test_classify_region(store_dir, projected):
+    options = runner.ClassifyOptions(projected=projected, reference=store_dir)
+
+    result = runner.classify_file(REGION, options)
+
+    assert result.error is None
+    assert result.prediction == runner.classify_file("tests/annotation_test.json.gz").prediction
+    assert runner.output_name(REGION) == "chr9_96721587_97507134_loss.json"
+
+
+def test_reclassify_region(store_dir):
+    result = runner.classify_file(REGION, runner.ClassifyOptions(dependencies=True, reference=store_dir))
+    record = {"input": REGION, **writers.prediction_to_dict(result.prediction, dependencies=result.dependencies)}
+
+    (updated,) = reclassify.reclassify_many([record], {"dosage_genes"}, reference_path=store_dir)
+    (failed,) = reclassify.reclassify_many([record], {"dosage_genes"})
+
+    assert updated.evaluated == ["2"]
+    assert updated.prediction == result.prediction
+    assert failed.prediction is None and "reference store" in failed.error
+
+
+def test_overlapping(tmp_path):
+    rng = random.Random(0)
+    records = []
+    for i in range(500):
+        start = rng.randint(0, 10_000)
+        end = start + rng.choice([5, 50, 5000])
+        records.append({"chromosome": rng.choice(["chr1", "chr2"]), "start": start, "end": end, "id": i})
+    table = tmp_path / "regulatory.jsonl"
+    table.write_text("".join(json.dumps(record) + "\n" for record in records))
+    reference.build(str(tmp_path / "store"), {"regulatory": str(table)})
+
+    with reference.ReferenceStore(str(tmp_path / "store")) as store:
+        for _ in range(100):
+            chromosome, start = rng.choice(["chr1", "chr2", "chr3"]), rng.randint(0, 12_000)
+            end = start + rng.randint(1, 500)
+            expected = [r for r in records if r["chromosome"] == chromosome and r["start"] <= end and r["end"] >= start]
+            assert store.sources["regulatory"].overlapping(chromosome, start, end) == expected
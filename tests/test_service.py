@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+from marcnv.src.io import loader
+from marcnv.src.service import loadtest, server
+
+
+async def _post(port: int, path: str, body: bytes, length: int | None = None) -> tuple[int, bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    length = len(body) if length is None else length
+    writer.write(f"POST {path} HTTP/1.1\r\nContent-Length: {length}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), content
+
+
+def test_server_classifies_single_and_batch():
+    document = json.dumps(loader.read_document("tests/annotation_test.json.gz")).encode()
+
+    async def scenario() -> None:
+        config = server.ServerConfig(workers=2, max_inflight=2, max_request_bytes=len(document) * 3)
+        service = server.ClassificationServer(config, executor=ThreadPoolExecutor(2))
+        await service.start(port=0)
+        port = service.sockets[0].getsockname()[1]
+
+        status, body = await _post(port, "/classify", document)
+        assert status == 200
+        assert json.loads(body)["score"] == 0.15
+
+        status, body = await _post(port, "/classify/batch", document + b"\n{}\n" + document)
+        assert status == 200
+        chunks = body.split(b"\r\n")[1::2]
+        lines = [json.loads(chunk) for chunk in chunks if chunk]
+        assert [line.get("score") for line in lines] == [0.15, None, 0.15]
+        assert "error" in lines[1]
+
+        status, _ = await _post(port, "/classify", b"", length=len(document) * 4)
+        assert status == 413
+
+        report = await loadtest.run(document, requests=6, concurrency=3, port=port)
+        assert report.failures == 0 and len(report.latencies) == 6
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        assert b'marcnv_cnvs_total{status="classified"} 9\n' in response
+        assert b'marcnv_cnvs_total{status="failed"} 1\n' in response
+        await service.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_server_replaces_dead_workers():
+    document = json.dumps(loader.read_document("tests/annotation_test.json.gz")).encode()
+
+    async def scenario() -> None:
+        service = server.ClassificationServer(server.ServerConfig(workers=1, max_inflight=1))
+        await service.start(port=0)
+        port = service.sockets[0].getsockname()[1]
+        assert (await _post(port, "/classify", document))[0] == 200
+
+        broken = service.executor
+        for pid in list(broken._processes):  # type: ignore[attr-defined]
+            os.kill(pid, signal.SIGKILL)
+        status, body = await _post(port, "/classify", document)
+        assert status == 503 and "error" in json.loads(body)
+
+        assert service.executor is not broken
+        status, body = await _post(port, "/classify", document)
+        assert status == 200 and json.loads(body)["score"] == 0.15
+        await service.shutdown()
+
+    asyncio.run(scenario())
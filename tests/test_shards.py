@@ -0,0 +1,106 @@
+import concurrent.futures
+import json
+import os
+
+import pytest
+
+from marcnv.src.batch import runner, shards
+
+ANNOTATION = "tests/annotation_test.json.gz"
+
+
+def test_shard():
+    inputs = [str(i) for i in range(10)]
+    parts = [shards.shard(inputs, index, 3) for index in range(3)]
+
+    assert parts == [["0", "1", "2"], ["3", "4", "5"], ["6", "7", "8", "9"]]
+    assert shards.parse_shard("2/3") == (2, 3)
+    assert shards.shard_path("out/predictions.jsonl", 2, 3) == "out/predictions.shard-2-of-3.jsonl"
+    with pytest.raises(ValueError):
+        shards.parse_shard("3/3")
+
+
+def test_journaled_writer_resumes(tmp_path):
+    inputs = [ANNOTATION, "missing.json.gz", ANNOTATION, ANNOTATION]
+    results = list(runner.classify_many(inputs, workers=1))
+    output = str(tmp_path / "predictions.jsonl")
+
+    writer = shards.JournaledWriter(output, inputs, checkpoint_every=2)
+    for result in results[:3]:
+        writer.write(result)
+    # interrupted after the first checkpoint, the third prediction is written but not journaled
+    writer.output.flush()
+    writer.output.close()
+    writer.journal.close()
+
+    with shards.JournaledWriter(output, inputs) as writer:
+        assert writer.completed == 2
+        for result in results[writer.completed :]:
+            writer.write(result)
+
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["input"] for record in records] == [ANNOTATION] * 3
+    _, entries, _ = shards.read_journal(output + shards.JOURNAL_SUFFIX)
+    assert [entry.input for entry in entries] == inputs
+    assert entries[1].length == 0 and entries[1].error is not None
+
+    with pytest.raises(ValueError):
+        shards.JournaledWriter(output, inputs[:2])
+
+
+def test_merge(tmp_path):
+    inputs = [ANNOTATION, "missing.json.gz", ANNOTATION]
+    paths = [shards.shard_path(str(tmp_path / "predictions.jsonl"), index, 2) for index in range(2)]
+    for index, path in enumerate(paths):
+        part = shards.shard(inputs, index, 2)
+        with shards.JournaledWriter(path, part) as writer:
+            for result in runner.classify_many(part, workers=1):
+                writer.write(result)
+
+    merged = str(tmp_path / "merged.jsonl")
+    assert shards.merge(paths, merged) == 2
+    with open(merged) as f:
+        assert [json.loads(line)["input"] for line in f] == [ANNOTATION, ANNOTATION]
+
+    # the second shard started over and was interrupted
+    os.remove(paths[1] + shards.JOURNAL_SUFFIX)
+    with shards.JournaledWriter(paths[1], shards.shard(inputs, 1, 2)):
+        pass
+    with pytest.raises(ValueError):
+        shards.merge(paths, merged)
+
+
+def test_recycled_workers():
+    inputs = [ANNOTATION, "missing.json.gz", ANNOTATION]
+    expected = list(runner.classify_many(inputs, workers=1))
+
+    # every worker exceeds the limit, so each pool classifies at most its first batch
+    results = list(runner.classify_many(inputs, workers=2, max_worker_memory=1))
+
+    assert [(r.input, r.prediction, r.error) for r in results] == [(r.input, r.prediction, r.error) for r in expected]
+
+
+class _CountedPool(concurrent.futures.ProcessPoolExecutor):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).created += 1
+        super().__init__(*args, **kwargs)
+
+
+def _classify_heavy_first(input_path, options):
+    # only the worker classifying the first input exceeds the limit
+    return runner.classify_file(input_path, options), 100 if input_path == "heavy.json.gz" else 0
+
+
+def test_recycled_after_one_heavy_worker(monkeypatch):
+    inputs = ["heavy.json.gz", *[ANNOTATION] * 5]
+    monkeypatch.setattr(runner, "_classify_measured", _classify_heavy_first)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _CountedPool)
+
+    results = list(runner.classify_many(inputs, workers=2, max_worker_memory=10))
+
+    assert [r.input for r in results] == inputs
+    # the first pool drains the files submitted before the heavy result and is replaced for the rest
+    assert _CountedPool.created == 2
@@ -0,0 +1,74 @@
+"""Cold start of the marcnv-classify entry point.
+
+The import time of `marcnv.main` is measured relative to the import of the standard library modules it needs anyway
+(REFERENCE_MODULES), so the budget holds on slower and faster machines alike. To record a new baseline after an
+intended change, run from the repository root:
+    python tests/test_startup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+REFERENCE_MODULES = ("argparse", "dataclasses", "json", "logging")
+# imported only by the entry points using them, see marcnv/main.py
+DEFERRED_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "csv",
+    "importlib.metadata",
+    "marcnv.src.batch.dedup",
+    "marcnv.src.batch.sweep",
+    "marcnv.src.io.stream",
+    "marcnv.src.service.server",
+)
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    # bytecode is written, so that only the first run compiles the sources
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    return subprocess.run([sys.executable, *options, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def _import_microseconds(modules: tuple[str, ...]) -> int:
+    """Returns the cumulative import time of the modules in a fresh interpreter, reported by -X importtime."""
+    stderr = _run("; ".join(f"import {module}" for module in modules), "-X", "importtime").stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        _, microseconds, name = line.split("|")
+        if microseconds.strip().isdigit():
+            cumulative[name.strip()] = int(microseconds)
+    return sum(cumulative[module] for module in modules)
+
+
+def relative_import_time(repeat: int = 5) -> float:
+    _run("import marcnv.main")
+    main = min(_import_microseconds(("marcnv.main",)) for _ in range(repeat))
+    reference = min(_import_microseconds(REFERENCE_MODULES) for _ in range(repeat))
+    return main / reference
+
+
+def test_deferred_imports():
+    code = "import sys; before = set(sys.modules); import marcnv.main; print('\\n'.join(set(sys.modules) - before))"
+    imported = set(_run(f"import annotation, argparse; {code}").stdout.split())
+
+    assert "marcnv.src.acmg.acmg_classify" in imported
+    assert imported.isdisjoint(DEFERRED_MODULES)
+
+
+def test_import_time_budget():
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+
+    relative = relative_import_time()
+
+    budget = baseline["relative_import_time"] * (1 + baseline["threshold"])
+    assert relative <= budget, f"marcnv.main imports {relative:.2f}x the reference modules, over {budget:.2f}x"
+
+
+if __name__ == "__main__":
+    with open(BASELINE_PATH, "w") as f:
+        json.dump({"relative_import_time": round(relative_import_time(), 2), "threshold": 0.5}, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,116 @@
+import io
+import json
+import sqlite3
+
+import pytest
+
+from marcnv.src.acmg import classification
+from marcnv.src.batch import runner, store
+from marcnv.src.io import reference, writers
+
+ANNOTATION = "tests/annotation_test.json.gz"
+
+
+def _prediction(section2_option, section2_reason, score):
+    criteria = [
+        classification.SectionResult(section, option, reason, points, "")
+        for section, option, reason, points in [
+            ("1", "1A", "Contains genes.", 0.0),
+            ("2", section2_option, section2_reason, score),
+            ("3", "3A", "Overlaps 7 protein-coding genes.", 0.0),
+            ("4", "4Skip", "Manual decision needed.", 0.0),
+            ("5", "5F", "No family history is available.", 0.0),
+        ]
+    ]
+    return classification.Prediction(score=score, criteria=criteria)
+
+
+def test_cohort_store(tmp_path):
+    ts_region = _prediction("2A", "Completely contains at least one established TS region. Found 1 such regions", 1.0)
+    ts_gene = _prediction("2A", "Completely contains at least one established TS gene. Found 1 such genes", 1.0)
+    benign = _prediction("2F", "Completely contained within an established benign CNV region.", -1.0)
+    rows = [
+        ("s1", reference.Region.parse("chr1:100-200:gain"), ts_region),
+        ("s1", reference.Region.parse("chr1:500-900:gain"), ts_gene),
+        ("s2", reference.Region.parse("chr1:150-250:gain"), ts_region),
+        ("s2", reference.Region.parse("chr2:100-200:loss"), benign),
+    ]
+    path = str(tmp_path / "cohort.sqlite")
+    with store.CohortStore(path, batch_size=3) as cohort:
+        for sample, region, prediction in rows:
+            cohort.add(region.name, prediction, sample, region)
+        # replaces the prediction of the same sample, CNV and input
+        cohort.add(rows[1][1].name, ts_gene, "s1", rows[1][1])
+    assert cohort.replaced == 1
+
+    with store.CohortStore(path) as cohort:
+        assert len(cohort) == 4
+        matches = list(cohort.select(store.Query(options=("2A",), reasons=(("2", "ts REGION"),))))
+        assert [(m.sample, m.region) for m in matches] == [("s1", rows[0][1]), ("s2", rows[2][1])]
+        assert matches[0].prediction == ts_region
+        assert [m.sample for m in cohort.select(store.Query(region=("chr1", 210, 600)))] == ["s1", "s2"]
+        assert len(list(cohort.select(store.Query(samples=("s2",), min_score=0.5)))) == 1
+
+        assert cohort.count("severity") == {"Benign": 1, "Pathogenic": 3}
+        assert cohort.count("2", store.Query(cnv_type="gain")) == {"2A": 3}
+        assert cohort.score_distribution() == {
+            "Benign": {"count": 1, "min": -1.0, "mean": -1.0, "max": -1.0},
+            "Pathogenic": {"count": 3, "min": 1.0, "mean": 1.0, "max": 1.0},
+        }
+
+        output = io.StringIO()
+        writer = writers.JSONLinesWriter()
+        writer.stream = output
+        assert cohort.export(writer, store.Query(severities=(classification.Severity.BENIGN,))) == 1
+        assert json.loads(output.getvalue()) == {"input": rows[3][1].name, **writers.prediction_to_dict(benign)}
+
+        with pytest.raises(ValueError):
+            store.Query(options=("7A",))
+        with pytest.raises(ValueError):
+            cohort.count("evidence")
+
+
+def test_cohort_store_of_annotation(tmp_path):
+    prediction = runner.classify_file(ANNOTATION).prediction
+
+    with store.CohortStore(str(tmp_path / "cohort.sqlite")) as cohort:
+        cohort.add(ANNOTATION, prediction, "sample")
+        (stored,) = cohort.select(store.Query(region=store.parse_interval("9:97000000-98000000")))
+
+    assert stored.region == reference.Region("chr9", 96721587, 97507134, "loss")
+    assert stored.prediction == prediction
+
+
+def test_cohort_store_keeps_recurrent_cnvs(tmp_path):
+    region = reference.Region.parse("chr1:100-200:gain")
+    ts_region = _prediction("2A", "Completely contains at least one established TS region. Found 1 such regions", 1.0)
+    benign = _prediction("2F", "Completely contained within an established benign CNV region.", -1.0)
+    path = str(tmp_path / "cohort.sqlite")
+
+    with store.CohortStore(path) as cohort:
+        cohort.add("sample1/cnv.json.gz", ts_region, region=region)
+        cohort.add("sample2/cnv.json.gz", benign, region=region)
+    assert cohort.replaced == 0
+
+    with store.CohortStore(path) as cohort:
+        assert [(s.input, s.region) for s in cohort.select()] == [
+            ("sample1/cnv.json.gz", region),
+            ("sample2/cnv.json.gz", region),
+        ]
+        assert cohort.count("severity") == {"Benign": 1, "Pathogenic": 1}
+        cohort.add("sample2/cnv.json.gz", ts_region, region=region)
+        cohort.flush()
+        assert cohort.replaced == 1
+        assert cohort.count("severity") == {"Pathogenic": 2}
+
+
+def test_cohort_store_of_other_version(tmp_path):
+    path = str(tmp_path / "cohort.sqlite")
+    with store.CohortStore(path):
+        pass
+    with sqlite3.connect(path) as connection:
+        connection.execute("PRAGMA user_version = 0")
+    connection.close()
+
+    with pytest.raises(ValueError):
+        store.CohortStore(path)
@@ -0,0 +1,76 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from marcnv.src.batch import runner
+from marcnv.src.io import loader, stream, writers
+
+ANNOTATION = "tests/annotation_test.json.gz"
+
+DOCUMENTS = [{"a": 1, "b": {"c": [1, 2]}}, {"a": "}\n{"}, [], {"d": {}}]
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "".join(json.dumps(document) + "\n" for document in DOCUMENTS),
+        "".join(json.dumps(document, indent=2) for document in DOCUMENTS),
+        "".join(json.dumps(document) for document in DOCUMENTS) + "\n\n",
+    ],
+)
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_iter_documents(text, size):
+    assert list(stream.iter_documents(_chunks(text, size))) == DOCUMENTS
+
+
+def test_iter_documents_malformed():
+    with pytest.raises(stream.StreamError):
+        list(stream.iter_documents(['{"a": 1}\n{"a": ']))
+    with pytest.raises(stream.StreamError):
+        list(stream.iter_documents(['{"a": 1', "1" * 100], max_document_chars=50))
+
+
+def test_read_text():
+    text = '{"a": 1}\n{"b": "é"}\n'
+    members = b"".join(gzip.compress(line.encode() + b"\n") for line in text.splitlines())
+
+    assert "".join(stream.read_text(io.BytesIO(text.encode()), chunk_size=1)) == text
+    assert "".join(stream.read_text(io.BytesIO(members))) == text
+
+
+def test_pipelined():
+    def failing():
+        yield 1
+        raise ValueError("broken")
+
+    assert list(stream.pipelined(range(100), queue_size=2)) == list(range(100))
+    with pytest.raises(ValueError):
+        list(stream.pipelined(failing()))
+
+
+def test_classify_stream():
+    document = loader.read_document(ANNOTATION)
+    data = gzip.compress(b"".join(json.dumps(d).encode() + b"\n" for d in [document, {"cnv": {}}, document]))
+    output = io.StringIO()
+    writer = writers.JSONLinesWriter()
+    writer.stream = output
+
+    assert stream.classify_stream(io.BytesIO(data), writer) == 3
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    expected = runner.classify_file(ANNOTATION).prediction
+    assert [record["input"] for record in records] == [document["cnv"]["name"], "document 1", document["cnv"]["name"]]
+    assert "error" in records[1]
+    assert records[0] == records[2] == {"input": records[0]["input"], **writers.prediction_to_dict(expected)}
+
+    output.seek(0)
+    output.truncate()
+    with pytest.raises(stream.StreamError):
+        stream.classify_stream(io.BytesIO(json.dumps(document).encode() + b"\n{"), writer)
+    assert len(output.getvalue().splitlines()) == 1
@@ -0,0 +1,50 @@
+import io
+
+import annotation
+import pytest
+
+from marcnv.src.acmg import core
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.batch import sweep
+
+
+def test_grid():
+    configurations = sweep.grid(hi_ts_scores=[[3], [2, 3]], deletion_genes_thresholds=[(25, 35), (5, 10), (3, 6)])
+
+    assert len(configurations) == 6
+    assert configurations[1] == core.Parameters(hi_ts_scores=(3,), deletion_genes_thresholds=(5, 10))
+    assert configurations[1].min_frequency_benign == core.MIN_FREQUENCY_BENIGN
+    with pytest.raises(ValueError):
+        sweep.grid(deletion_genes_thresholds=[(35, 25)])
+
+
+def test_sweep_matches_classifier():
+    annot = annotation.Annotation.load_from_json("tests/annotation_test.json.gz")
+    configurations = sweep.grid(
+        hi_ts_scores=[(3,), (0, 1, 2, 3)],
+        min_frequency_benign=[0.005, 0.5],
+        deletion_genes_thresholds=[(25, 35), (5, 10), (3, 6)],
+    )
+
+    screenings = sweep.sweep_annotation(annot, configurations)
+
+    for parameters, screening in zip(configurations, screenings, strict=True):
+        expected = MarCNVClassifier(annot, parameters=parameters).screen()
+        assert (screening.options, screening.score) == (expected.options, expected.score)
+    # 7 protein coding genes
+    assert [screening.options["3"] for screening in screenings[:3]] == ["3A", "3B", "3C"]
+
+
+def test_sweep_table():
+    configurations = sweep.grid(deletion_genes_thresholds=[(25, 35), (5, 10)])
+    stream = io.StringIO()
+    writer = sweep.TableWriter(stream, configurations)
+
+    for result in sweep.sweep_many(["tests/annotation_test.json.gz", "missing.json"], configurations, workers=1):
+        writer.write(result)
+
+    header, *rows = [line.split("\t") for line in stream.getvalue().splitlines()]
+    assert header == list(sweep.TABLE_COLUMNS)
+    assert [row[header.index("configuration")] for row in rows] == ["0", "1"]
+    assert [row[header.index("deletion_genes_thresholds")] for row in rows] == ["25,35", "5,10"]
+    assert [row[header.index("section3")] for row in rows] == ["3A", "3B"]
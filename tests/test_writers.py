@@ -0,0 +1,41 @@
+import json
+from dataclasses import asdict
+
+import annotation
+
+from marcnv.src.acmg.acmg_classify import MarCNVClassifier
+from marcnv.src.io import writers
+
+
+def _prediction():
+    return MarCNVClassifier(annotation.Annotation.load_from_json("tests/annotation_test.json.gz")).classify()
+
+
+def test_prediction_to_dict_matches_asdict():
+    prediction = _prediction()
+
+    assert writers.prediction_to_dict(prediction) == asdict(prediction)
+    assert writers.dumps(prediction) == json.dumps(asdict(prediction), indent=2)
+
+
+def test_jsonl_and_columnar_round_trip(tmp_path):
+    prediction = _prediction()
+
+    with writers.JSONLinesWriter(str(tmp_path / "predictions.jsonl")) as writer:
+        writer.write("a.json", prediction)
+        writer.write("b.json", prediction)
+    lines = (tmp_path / "predictions.jsonl").read_text().splitlines()
+    assert [json.loads(line)["input"] for line in lines] == ["a.json", "b.json"]
+    assert json.loads(lines[0])["criteria"] == asdict(prediction)["criteria"]
+
+    with writers.ColumnarWriter(str(tmp_path / "predictions.columnar")) as writer:
+        writer.write("a.json", prediction)
+        writer.write("b.json", prediction)
+    columns = writers.read_columnar(str(tmp_path / "predictions.columnar"))
+    assert columns["input"] == ["a.json", "b.json"]
+    assert list(columns["score"]) == [prediction.score] * 2
+    assert columns["severity"] == [prediction.severity] * 2
+    for section in prediction.criteria:
+        assert columns[f"section{section.section}_option"] == [section.option] * 2
+        assert columns[f"section{section.section}_reason"] == [section.reason] * 2
+        assert list(columns[f"section{section.section}_score"]) == [section.score] * 2